@@ -1,75 +1,139 @@
 """Haptique IR/RF hub integration for Home Assistant."""
 import logging
 import asyncio
-import os
-import shutil
-from datetime import timedelta
+import hashlib
+import json
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import datetime, timedelta
+from functools import partial
 from typing import Any
 
 import aiohttp
 import async_timeout
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_TOKEN, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import DOMAIN
+from .const import (
+    BOOST_DURATION,
+    BOOST_INTERVAL,
+    CONF_CATALOG_INTERVAL,
+    CONF_KEEP_WARM,
+    CONF_STATUS_INTERVAL,
+    DEFAULT_CATALOG_INTERVAL,
+    DEFAULT_REPEAT_INTERVAL,
+    DEFAULT_REPEAT_MAX_COUNT,
+    DEFAULT_STATUS_INTERVAL,
+    DEFAULT_RF_REPEAT,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    HUB_CONNECTION_LIMIT,
+    HUB_KEEPALIVE_TIMEOUT,
+    KEEP_WARM_INTERVAL,
+    LEARN_TIMEOUT,
+    MAX_BACKOFF_INTERVAL,
+    MAX_PROFILE_SECONDS,
+    PRIORITY_NORMAL,
+    PRIORITY_USER,
+    READ_FRESHNESS,
+    REFRESH_HISTORY_SIZE,
+    SIGNAL_QUEUE_UPDATED,
+    SNAPSHOT_SAVE_DELAY,
+    STATE_CHANGING_ENDPOINTS,
+    TIMEOUT_MUTATION,
+    TIMEOUT_POLL,
+    TIMEOUT_SEND,
+)
+from .backup import (
+    async_read_backup,
+    async_restore_library,
+    async_write_backup,
+    backup_path,
+    library_records,
+)
+from .breaker import HaptiqueCircuitBreaker
+from .catalog import (
+    IR_FRAME_KEYS,
+    IR_SAVE_FRAMES,
+    HaptiqueCommandCatalog,
+    best_ir_frame,
+)
+from .codec import IrCodecError, decode_ir, encode_compact, to_pronto
+from .protocols import decode_protocol, encode_protocol
+from .metrics import HaptiqueRequestMetrics
+from .monitor import HaptiqueCaptureMonitor
+from .polling import async_get_poll_scheduler
+from .profiler import async_profile
+from .proxy import async_setup_proxy
+from .repeat import HaptiqueRepeatSession
+from .scheduler import HaptiqueCommandScheduler, queue_wait
+from .sequence import SEQUENCE_STEPS_SCHEMA, HaptiqueMacroStore
+from .similarity import async_get_similarity_index
+from .static import async_setup_static
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.BUTTON, Platform.SENSOR, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-async def async_register_static_files(hass: HomeAssistant):
-    """
-    Copy files from:
-        custom_components/haptique_ir_rf_hub/www/
-    Into:
-        /config/www/community/haptique_ir_rf_hub/
-    And register static path:
-        http://<ha>/haptique_ir_rf_hub/<file>
-    """
-
-    # Correct integration path
-    integration_path = hass.config.path("custom_components", DOMAIN)
-
-    # Correct source www directory INSIDE integration
-    src_www = os.path.join(integration_path, "www")
+# Optional hub selection accepted by every service
+TARGET_SCHEMA = {
+    **cv.TARGET_SERVICE_FIELDS,
+    vol.Optional("entry_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("broadcast", default=False): cv.boolean,
+}
 
-    if not os.path.isdir(src_www):
-        _LOGGER.error("No www folder found inside integration! (%s)", src_www)
-        return
+SECTIONS = ("status", "rf_status", "rf_saved", "ir_saved")
+CATALOG_SECTIONS = ("rf_saved", "ir_saved")
 
-    # Destination inside HA www folder (HACS standard)
-    dest = hass.config.path(f"www/community/{DOMAIN}")
-    os.makedirs(dest, exist_ok=True)
 
-    # Copy each file
-    for filename in os.listdir(src_www):
-        src_file = os.path.join(src_www, filename)
-        dest_file = os.path.join(dest, filename)
+def _fingerprint(value: Any) -> str:
+    """Return a content hash of a JSON payload section."""
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode()).hexdigest()
 
-        if os.path.isfile(src_file):
-            shutil.copy(src_file, dest_file)
-            _LOGGER.info("Copied %s → %s", src_file, dest_file)
-
-    # Register static URL path
-    from homeassistant.components.http import StaticPathConfig
-
-    await hass.http.async_register_static_paths([
-        StaticPathConfig(
-            f"/{DOMAIN}",
-            dest,
-            False   # cache_headers
-        )
-    ])
 
-
-    _LOGGER.info("Static files served at: /%s/", DOMAIN)
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up integration-wide resources."""
+    async_setup_websocket_api(hass)
+    await async_setup_services(hass)
+    await async_setup_static(hass)
+    async_setup_proxy(hass)
+    return True
 
 
+@callback
+def _async_create_hub_session() -> aiohttp.ClientSession:
+    """Return a session with a small keep-alive pool for one hub.
 
+    The firmware only serves a couple of sockets at once, so extra requests
+    wait for a pooled connection instead of opening new ones. DNS results
+    (including slow mDNS ``.local`` lookups) are cached.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HUB_CONNECTION_LIMIT,
+        limit_per_host=HUB_CONNECTION_LIMIT,
+        keepalive_timeout=HUB_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -78,52 +142,246 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     token = entry.data.get(CONF_TOKEN, "")
     
   
-    session = async_get_clientsession(hass)
-    api = HaptiqueGatewayAPI(host, token, session)
+    session = _async_create_hub_session()
+    catalog = HaptiqueCommandCatalog(hass, entry.entry_id)
+    await catalog.async_load()
+    api = HaptiqueGatewayAPI(host, token, session, catalog)
     
-    try:
-        await api.get_status()
-    except Exception as err:
-        _LOGGER.error("Failed to connect to  Haptique IR/RF hub: %s", err)
-        return False
-    
-   
-    coordinator = HaptiqueDataUpdateCoordinator(hass, api)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = HaptiqueDataUpdateCoordinator(
+        hass,
+        api,
+        status_interval=entry.options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL),
+        catalog_interval=entry.options.get(CONF_CATALOG_INTERVAL, DEFAULT_CATALOG_INTERVAL),
+        entry_id=entry.entry_id,
+    )
+
+    # Start from the last good data if there is any and refresh it once the
+    # platforms are set up; only a hub never seen before blocks setup.
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady:
+            await session.close()
+            raise
+    entry.async_on_unload(coordinator.poll_scheduler.async_register(coordinator))
+
+    @callback
+    def async_catalog_miss() -> None:
+        """Re-fetch the saved lists in case the command was learned elsewhere."""
+        coordinator.async_invalidate_catalogs()
+        hass.async_create_task(coordinator.async_request_refresh())
+
+    catalog.on_miss = async_catalog_miss
+
+    similarity = async_get_similarity_index(hass)
+    catalog.on_change = partial(similarity.async_mark_dirty, entry.entry_id)
+    entry.async_on_unload(similarity.async_track(entry.entry_id, catalog))
+
+    @callback
+    def async_breaker_changed(available: bool) -> None:
+        """Mirror the circuit breaker on entity availability."""
+        if available:
+            hass.async_create_task(coordinator.async_request_refresh())
+        else:
+            api.stop_repeat(reason="unavailable")
+            coordinator.async_set_update_error(UpdateFailed(f"{host} is unreachable"))
+
+    api.breaker.on_change = async_breaker_changed
+    api.scheduler.on_change = partial(
+        async_dispatcher_send, hass, SIGNAL_QUEUE_UPDATED.format(entry.entry_id)
+    )
+
+    if entry.options.get(CONF_KEEP_WARM, False):
+
+        async def async_keep_warm(now) -> None:
+            """Ping an idle hub so the next press skips connection setup."""
+            if time.monotonic() - api.last_activity < KEEP_WARM_INTERVAL:
+                return
+            try:
+                await api.get_status()
+            except UpdateFailed as err:
+                _LOGGER.debug("Keep-warm ping to %s failed: %s", host, err)
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, async_keep_warm, timedelta(seconds=KEEP_WARM_INTERVAL)
+            )
+        )
     
+    macros = HaptiqueMacroStore(hass, entry.entry_id)
+    await macros.async_load()
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
+        "entry": entry,
         "api": api,
         "coordinator": coordinator,
+        "macros": macros,
+        "rf_monitor": HaptiqueCaptureMonitor(hass, api, "rf"),
+        "ir_monitor": HaptiqueCaptureMonitor(hass, api, "ir"),
     }
     
    
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    
-  
-    await async_setup_services(hass, api)
-
 
+    if restored:
+        hass.async_create_background_task(
+            coordinator.async_refresh(), f"{DOMAIN} refresh {host}"
+        )
 
-    await async_register_static_files(hass)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data["rf_monitor"].async_stop()
+        data["ir_monitor"].async_stop()
+        data["api"].stop_repeat(reason="unloaded")
+        await data["api"].scheduler.async_shutdown()
+        await data["api"].session.close()
+        await data["coordinator"].async_flush_snapshot()
+        await data["api"].catalog.async_flush()
     
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored snapshot, command catalog and sequences of a removed hub."""
+    for name in ("snapshot", "catalog", "macros"):
+        await Store(hass, 1, f"{DOMAIN}.{entry.entry_id}.{name}").async_remove()
+
+
+
+@callback
+def _async_resolve_hubs(
+    hass: HomeAssistant, call: ServiceCall, command: tuple[str, str] | None = None
+) -> list[dict[str, Any]]:
+    """Return the hubs a service call targets.
+
+    Hubs are picked by ``entry_id`` or by the usual ``device_id`` /
+    ``entity_id`` / ``area_id`` target (single values or lists), or all of
+    them with ``broadcast``. Without a target the only hub is used; with
+    several hubs, a saved ``command`` (kind, name) selects the one hub that
+    has it.
+    """
+    hubs = hass.data.get(DOMAIN, {})
+    if not hubs:
+        raise HomeAssistantError("No Haptique IR/RF hub is loaded")
+    if call.data.get("broadcast"):
+        return list(hubs.values())
+
+    entry_ids = list(cv.ensure_list(call.data.get("entry_id")))
+    if any(call.data.get(key) for key in ("device_id", "entity_id", "area_id")):
+        selected = async_extract_referenced_entity_ids(hass, call)
+        if selected.missing_devices:
+            raise HomeAssistantError(
+                f"Unknown device '{', '.join(sorted(selected.missing_devices))}'"
+            )
+        device_registry = dr.async_get(hass)
+        for device_id in selected.referenced_devices:
+            if device := device_registry.async_get(device_id):
+                entry_ids.extend(device.config_entries)
+        entity_registry = er.async_get(hass)
+        for entity_id in selected.referenced | selected.indirectly_referenced:
+            entity = entity_registry.async_get(entity_id)
+            if entity is not None and entity.config_entry_id:
+                entry_ids.append(entity.config_entry_id)
+            elif entity_id in selected.referenced:
+                raise HomeAssistantError(f"Unknown entity '{entity_id}'")
+        if not entry_ids:
+            raise HomeAssistantError("The target does not include a Haptique IR/RF hub")
+
+    if entry_ids:
+        targets = [hubs[entry_id] for entry_id in dict.fromkeys(entry_ids) if entry_id in hubs]
+        if not targets:
+            raise HomeAssistantError("None of the targeted hubs is loaded")
+        return targets
+
+    if len(hubs) == 1:
+        return list(hubs.values())
+    if command is not None:
+        kind, name = command
+        matches = [
+            hub
+            for hub in hubs.values()
+            if hub["api"].catalog is not None
+            and hub["api"].catalog.find(kind, name) is not None
+        ]
+        if len(matches) == 1:
+            return matches
+    raise HomeAssistantError(
+        "Several hubs are set up; target one with device_id or entry_id, or set broadcast"
+    )
 
-async def async_setup_services(hass: HomeAssistant, api) -> None:
+
+async def _async_call_hubs(
+    hubs: list[dict[str, Any]], action: Callable[[dict[str, Any]], Awaitable[Any]]
+) -> dict[str, Any]:
+    """Run ``action`` on all hubs at once and collect per-hub results.
+
+    A single target keeps the old behaviour of raising on failure. With
+    several targets every hub reports success, latency and error separately.
+    """
+    if len(hubs) == 1:
+        hub = hubs[0]
+        started = time.monotonic()
+        result = await action(hub)
+        return {
+            "results": {
+                hub["entry"].entry_id: {
+                    "hub": hub["entry"].title,
+                    "success": True,
+                    "latency_ms": round((time.monotonic() - started) * 1000, 1),
+                    "result": result,
+                }
+            }
+        }
+
+    async def run(hub: dict[str, Any]) -> dict[str, Any]:
+        started = time.monotonic()
+        report: dict[str, Any] = {"hub": hub["entry"].title}
+        try:
+            report["result"] = await action(hub)
+            report["success"] = True
+        except Exception as err:  # pylint: disable=broad-except
+            report["success"] = False
+            report["error"] = str(err)
+            _LOGGER.warning("Service call to %s failed: %s", hub["entry"].title, err)
+        report["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+        return report
+
+    reports = await asyncio.gather(*(run(hub) for hub in hubs))
+    return {
+        "results": {hub["entry"].entry_id: report for hub, report in zip(hubs, reports)}
+    }
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for Haptique IR/RF hub."""
+
+    async def refresh_catalogs(hub):
+        """Re-fetch the saved-command lists after a learn or delete."""
+        coordinator = hub["coordinator"]
+        coordinator.async_invalidate_catalogs()
+        coordinator.async_boost()
+        await coordinator.async_request_refresh()
+
+    def call_priority(call) -> int:
+        """Run sends started by a person ahead of automation traffic."""
+        return PRIORITY_USER if call.context.user_id else PRIORITY_NORMAL
     
     async def send_rf_code(call):
         """Send RF code service."""
@@ -131,102 +389,842 @@ async def async_setup_services(hass: HomeAssistant, api) -> None:
         bits = call.data.get("bits", 24)
         protocol = call.data.get("protocol", 1)
         repeat = call.data.get("repeat", 8)
+        priority = call_priority(call)
         
-        await api.send_rf_code(code, bits, protocol, repeat)
+        return await _async_call_hubs(
+            _async_resolve_hubs(hass, call),
+            lambda hub: hub["api"].send_rf_code(code, bits, protocol, repeat, priority),
+        )
     
     async def send_rf_saved(call):
         """Send saved RF command service."""
         name = call.data.get("name")
-        await api.send_rf_saved(name)
+        priority = call_priority(call)
+        return await _async_call_hubs(
+            _async_resolve_hubs(hass, call, ("rf", name)),
+            lambda hub: hub["api"].send_rf_saved(name, priority),
+        )
     
     async def send_ir_code(call):
         """Send IR code service."""
-        freq = call.data.get("frequency", 38000)
         duty = call.data.get("duty", 33)
-        raw_data = call.data.get("raw_data", [])
+        try:
+            code_freq, raw_data = decode_ir(call.data.get("raw_data", []))
+        except IrCodecError as err:
+            raise HomeAssistantError(str(err)) from err
+        freq = call.data.get("frequency", code_freq or 38000)
+        priority = call_priority(call)
         
-        await api.send_ir_code(freq, duty, raw_data)
+        return await _async_call_hubs(
+            _async_resolve_hubs(hass, call),
+            lambda hub: hub["api"].send_ir_code(freq, duty, raw_data, priority),
+        )
     
     async def send_ir_saved(call):
         """Send saved IR command service."""
         name = call.data.get("name")
-        await api.send_ir_saved(name)
+        priority = call_priority(call)
+        return await _async_call_hubs(
+            _async_resolve_hubs(hass, call, ("ir", name)),
+            lambda hub: hub["api"].send_ir_saved(name, priority),
+        )
     
     async def save_rf_last(call):
         """Save last received RF command."""
         name = call.data.get("name")
-        await api.save_rf_command(name)
+
+        async def save(hub):
+            await hub["api"].save_rf_command(name)
+            await refresh_catalogs(hub)
+
+        await _async_call_hubs(_async_resolve_hubs(hass, call), save)
     
     async def save_ir_last(call):
         name = call.data.get("name")
         frame = call.data.get("frame", "B")  # default frame B
-        await api.save_ir_command(name, frame)
+
+        async def save(hub):
+            await hub["api"].save_ir_command(name, frame)
+            await refresh_catalogs(hub)
+
+        await _async_call_hubs(_async_resolve_hubs(hass, call), save)
 
     
     async def delete_rf_command(call):
         """Delete saved RF command."""
         name = call.data.get("name")
-        await api.delete_rf_command(name)
+
+        async def delete(hub):
+            await hub["api"].delete_rf_command(name)
+            await refresh_catalogs(hub)
+
+        await _async_call_hubs(_async_resolve_hubs(hass, call, ("rf", name)), delete)
     
     async def delete_ir_command(call):
         """Delete saved IR command."""
         name = call.data.get("name")
-        await api.delete_ir_command(name)
+
+        async def delete(hub):
+            await hub["api"].delete_ir_command(name)
+            await refresh_catalogs(hub)
+
+        await _async_call_hubs(_async_resolve_hubs(hass, call, ("ir", name)), delete)
     
+    def learn_hub(call: ServiceCall) -> dict[str, Any]:
+        """Return the single hub a learn call targets."""
+        hubs = _async_resolve_hubs(hass, call)
+        if len(hubs) != 1:
+            raise HomeAssistantError("Learning targets exactly one hub")
+        return hubs[0]
+
+    async def learn(call: ServiceCall, hub: dict[str, Any], learn_one) -> dict[str, Any]:
+        """Learn each name in turn, waiting for a new signal for every one.
+
+        Stops at the first name without a signal; that raises if nothing was
+        learned, else it is reported as ``timed_out``.
+        """
+        learned: list[dict[str, Any]] = []
+        response: dict[str, Any] = {"learned": learned}
+        try:
+            for name in call.data["name"]:
+                learned.append(await learn_one(name))
+        except HomeAssistantError as err:
+            if not learned:
+                raise
+            response["timed_out"] = call.data["name"][len(learned)]
+            _LOGGER.info("Learning stopped after %d command(s): %s", len(learned), err)
+        finally:
+            if learned:
+                await refresh_catalogs(hub)
+        return response
+
+    async def learn_ir(call: ServiceCall):
+        """Wait for new IR signals and save them under the given names."""
+        hub = learn_hub(call)
+
+        async def learn_one(name: str) -> dict[str, Any]:
+            capture = await hub["ir_monitor"].async_next_capture(call.data["timeout"])
+            frame = call.data.get("frame") or best_ir_frame(capture)
+            timings = capture.get(IR_FRAME_KEYS.get((frame or "").upper(), "")) or []
+            if not timings:
+                raise HomeAssistantError(f"The IR capture for '{name}' has no frame {frame}")
+            await hub["api"].save_ir_command(name, frame, capture)
+            freq = int(capture.get("freq_khz", 38) * 1000)
+            protocol = decode_protocol(timings)
+            return {
+                "name": name,
+                "frame": frame,
+                "frequency": freq,
+                "count": len(timings),
+                "protocol": str(protocol) if protocol else None,
+                "code": encode_compact(timings, freq),
+            }
+
+        return await learn(call, hub, learn_one)
+
+    async def learn_rf(call: ServiceCall):
+        """Wait for new RF codes and save them under the given names."""
+        hub = learn_hub(call)
+
+        async def learn_one(name: str) -> dict[str, Any]:
+            capture = await hub["rf_monitor"].async_next_capture(call.data["timeout"])
+            await hub["api"].save_rf_command(name)
+            return {
+                "name": name,
+                "code": capture.get("code"),
+                "bits": capture.get("bits"),
+                "protocol": capture.get("protocol"),
+            }
+
+        return await learn(call, hub, learn_one)
+
+    async def start_repeat(call: ServiceCall):
+        """Start repeating a saved command at a fixed cadence."""
+        kind, name = call.data["type"], call.data["name"]
+        interval = call.data["interval_ms"] / 1000
+        max_count = call.data["max_count"]
+        priority = call_priority(call)
+        return await _async_call_hubs(
+            _async_resolve_hubs(hass, call, (kind, name)),
+            lambda hub: hub["api"].start_repeat(kind, name, interval, max_count, priority),
+        )
+
+    async def stop_repeat(call: ServiceCall):
+        """Stop repeating commands and report how often they were sent."""
+        kind, name = call.data.get("type"), call.data.get("name")
+        hubs = (
+            _async_resolve_hubs(hass, call, (kind, name))
+            if kind and name
+            else _async_resolve_hubs(hass, call)
+        )
+
+        async def stop(hub):
+            return {"stopped": hub["api"].stop_repeat(kind, name)}
+
+        return await _async_call_hubs(hubs, stop)
+
+    async def profile(call: ServiceCall):
+        """Profile the integration's coroutines for a few seconds."""
+        return await async_profile(hass, call.data["seconds"], call.data["limit"])
+
+    async def export_ir_command(call: ServiceCall):
+        """Return a cached IR command as a protocol code, compact, Pronto or raw."""
+        name = call.data["name"]
+        hubs = _async_resolve_hubs(hass, call, ("ir", name))
+        if len(hubs) != 1:
+            raise HomeAssistantError("export_ir_command targets exactly one hub")
+
+        api = hubs[0]["api"]
+        command = api.catalog.find("ir", name) if api.catalog else None
+        if command is None or command.timings is None:
+            raise HomeAssistantError(
+                f"No timings cached for IR command '{name}'; save it with save_ir_last first"
+            )
+
+        timings = command.timings.tolist()
+        freq = command.freq
+        fmt = call.data["format"]
+        if command.protocol is not None and fmt != "raw":
+            # Export the regenerated timings rather than the noisy capture
+            freq, timings = encode_protocol(command.protocol)
+        if fmt == "protocol":
+            code = str(command.protocol) if command.protocol else timings
+        elif fmt == "pronto":
+            code = to_pronto(timings, freq)
+        elif fmt == "raw":
+            code = timings
+        else:
+            code = encode_compact(timings, freq)
+        return {
+            "name": name,
+            "frequency": freq,
+            "duty": command.duty,
+            "protocol": str(command.protocol) if command.protocol else None,
+            "code": code,
+        }
+
+    async def find_duplicate_commands(call: ServiceCall):
+        """Report clusters of near-identical saved commands on all hubs."""
+        hubs = hass.data.get(DOMAIN, {})
+        index = async_get_similarity_index(hass)
+        clusters = index.clusters()
+        response: dict[str, Any] = {
+            "analyzed": index.size,
+            "skipped": index.skipped,
+            "clusters": [
+                {
+                    "kind": cluster["kind"],
+                    "distance": cluster["distance"],
+                    "commands": [
+                        {
+                            "entry_id": entry_id,
+                            "hub": hubs[entry_id]["entry"].title,
+                            "name": name,
+                        }
+                        for entry_id, name in cluster["commands"]
+                        if entry_id in hubs
+                    ],
+                }
+                for cluster in clusters
+            ],
+        }
+        if not call.data["merge"]:
+            return response
+
+        # Merging only deletes copies on the same hub, keeping the command
+        # a saved sequence uses (else the first name) and any other in use.
+        merged = []
+        for cluster in clusters:
+            by_hub: dict[str, list[str]] = {}
+            for entry_id, name in cluster["commands"]:
+                by_hub.setdefault(entry_id, []).append(name)
+            for entry_id, names in by_hub.items():
+                if len(names) < 2 or entry_id not in hubs:
+                    continue
+                hub = hubs[entry_id]
+                in_use = {
+                    step["name"]
+                    for steps in hub["macros"].macros.values()
+                    for step in steps
+                    if step["type"] == cluster["kind"]
+                }
+                keep = min(names, key=lambda name: (name not in in_use, name))
+                for name in names:
+                    if name == keep or name in in_use:
+                        continue
+                    if cluster["kind"] == "ir":
+                        await hub["api"].delete_ir_command(name)
+                    else:
+                        await hub["api"].delete_rf_command(name)
+                    merged.append(
+                        {"entry_id": entry_id, "kind": cluster["kind"], "name": name, "kept": keep}
+                    )
+        for entry_id in {item["entry_id"] for item in merged}:
+            await refresh_catalogs(hubs[entry_id])
+        response["merged"] = merged
+        return response
+
+    async def backup_library(call: ServiceCall):
+        """Write a hub's IR/RF commands and sequences to a backup file."""
+        hubs = _async_resolve_hubs(hass, call)
+        if len(hubs) != 1:
+            raise HomeAssistantError("backup_library targets exactly one hub")
+        hub = hubs[0]
+        filename = call.data.get("filename") or (
+            f"{hub['api'].host.replace(':', '_')}_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+        )
+        path = backup_path(hass, filename)
+        counts = await async_write_backup(hass, path, hub)
+        _LOGGER.info("Backed up %s to %s: %s", hub["entry"].title, path, counts)
+        return {"path": path, **counts}
+
+    def restore_response(hubs, reports):
+        """Return restore reports in the per-hub service response format."""
+        return {
+            "results": {
+                hub["entry"].entry_id: {
+                    "hub": hub["entry"].title,
+                    "success": True,
+                    "result": reports[hub["entry"].entry_id],
+                }
+                for hub in hubs
+            }
+        }
+
+    async def restore_library(call: ServiceCall):
+        """Restore a backup file into the local catalog of one or more hubs."""
+        path = backup_path(hass, call.data["filename"])
+        hubs = _async_resolve_hubs(hass, call)
+        reports = await async_restore_library(
+            hass, hubs, async_read_backup(hass, path), call.data["overwrite"]
+        )
+        return restore_response(hubs, reports)
+
+    async def clone_library(call: ServiceCall):
+        """Copy one hub's commands and sequences into other hubs' local catalogs."""
+        source = hass.data.get(DOMAIN, {}).get(call.data["source_entry_id"])
+        if source is None:
+            raise HomeAssistantError("The source hub is not loaded")
+        hubs = [hub for hub in _async_resolve_hubs(hass, call) if hub is not source]
+        if not hubs:
+            raise HomeAssistantError("Target at least one hub other than the source")
+
+        async def records():
+            yield list(library_records(source))
+
+        reports = await async_restore_library(
+            hass, hubs, records(), call.data["overwrite"]
+        )
+        return restore_response(hubs, reports)
+
+    async def send_sequence(call: ServiceCall):
+        """Run an inline or saved command sequence."""
+        steps = call.data.get("steps")
+        macro = call.data.get("macro")
+        priority = call_priority(call)
+
+        async def run(hub):
+            sequence = steps
+            if macro:
+                if macro not in hub["macros"].macros:
+                    raise HomeAssistantError(f"Unknown sequence '{macro}'")
+                sequence = hub["macros"].macros[macro]
+            if not sequence:
+                raise HomeAssistantError("Provide either steps or a saved macro name")
+            return await hub["api"].send_sequence(sequence, priority)
+
+        return await _async_call_hubs(_async_resolve_hubs(hass, call), run)
+
+    async def save_sequence(call: ServiceCall):
+        """Store a named sequence, exposed as a button entity."""
+        await _async_call_hubs(
+            _async_resolve_hubs(hass, call),
+            lambda hub: hub["macros"].async_save_macro(call.data["name"], call.data["steps"]),
+        )
+
+    async def delete_sequence(call: ServiceCall):
+        """Delete a named sequence."""
+        name = call.data["name"]
+
+        async def delete(hub):
+            if not await hub["macros"].async_delete_macro(name):
+                raise HomeAssistantError(f"Unknown sequence '{name}'")
+
+        await _async_call_hubs(_async_resolve_hubs(hass, call), delete)
+
     # Register all services
-    hass.services.async_register(DOMAIN, "send_rf_code", send_rf_code)
-    hass.services.async_register(DOMAIN, "send_rf_saved", send_rf_saved)
-    hass.services.async_register(DOMAIN, "send_ir_code", send_ir_code)
-    hass.services.async_register(DOMAIN, "send_ir_saved", send_ir_saved)
+    hass.services.async_register(
+        DOMAIN, "send_rf_code", send_rf_code, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, "send_rf_saved", send_rf_saved, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, "send_ir_code", send_ir_code, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, "send_ir_saved", send_ir_saved, supports_response=SupportsResponse.OPTIONAL
+    )
     hass.services.async_register(DOMAIN, "save_rf_last", save_rf_last)
     hass.services.async_register(DOMAIN, "save_ir_last", save_ir_last)
     hass.services.async_register(DOMAIN, "delete_rf_command", delete_rf_command)
     hass.services.async_register(DOMAIN, "delete_ir_command", delete_ir_command)
+    learn_schema = {
+        **TARGET_SCHEMA,
+        vol.Required("name"): vol.All(cv.ensure_list, [cv.string], vol.Length(min=1)),
+        vol.Optional("timeout", default=LEARN_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=300)
+        ),
+    }
+    hass.services.async_register(
+        DOMAIN,
+        "learn_ir",
+        learn_ir,
+        schema=vol.Schema(
+            {
+                **learn_schema,
+                vol.Optional("frame"): vol.All(
+                    vol.Upper, vol.In(list(IR_FRAME_KEYS))
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "learn_rf",
+        learn_rf,
+        schema=vol.Schema(learn_schema),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "start_repeat",
+        start_repeat,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Required("type"): vol.In(["ir", "rf"]),
+                vol.Required("name"): cv.string,
+                vol.Optional("interval_ms", default=DEFAULT_REPEAT_INTERVAL): vol.All(
+                    vol.Coerce(int), vol.Range(min=20, max=5000)
+                ),
+                vol.Optional("max_count", default=DEFAULT_REPEAT_MAX_COUNT): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "stop_repeat",
+        stop_repeat,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Optional("type"): vol.In(["ir", "rf"]),
+                vol.Optional("name"): cv.string,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        profile,
+        schema=vol.Schema(
+            {
+                vol.Optional("seconds", default=10): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.1, max=MAX_PROFILE_SECONDS)
+                ),
+                vol.Optional("limit", default=25): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=500)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "export_ir_command",
+        export_ir_command,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Required("name"): cv.string,
+                vol.Optional("format", default="compact"): vol.In(
+                    ["protocol", "compact", "pronto", "raw"]
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "find_duplicate_commands",
+        find_duplicate_commands,
+        schema=vol.Schema({vol.Optional("merge", default=False): cv.boolean}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "backup_library",
+        backup_library,
+        schema=vol.Schema({**TARGET_SCHEMA, vol.Optional("filename"): cv.string}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "restore_library",
+        restore_library,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Required("filename"): cv.string,
+                vol.Optional("overwrite", default=False): cv.boolean,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "clone_library",
+        clone_library,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Required("source_entry_id"): cv.string,
+                vol.Optional("overwrite", default=False): cv.boolean,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "send_sequence",
+        send_sequence,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Optional("steps"): SEQUENCE_STEPS_SCHEMA,
+                vol.Optional("macro"): cv.string,
+            }
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "save_sequence",
+        save_sequence,
+        schema=vol.Schema(
+            {
+                **TARGET_SCHEMA,
+                vol.Required("name"): cv.string,
+                vol.Required("steps"): SEQUENCE_STEPS_SCHEMA,
+            }
+        ),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "delete_sequence",
+        delete_sequence,
+        schema=vol.Schema({**TARGET_SCHEMA, vol.Required("name"): cv.string}),
+    )
 
 
 
 class HaptiqueDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Haptique IR/RF hub data."""
+    """Class to manage fetching Haptique IR/RF hub data.
+
+    Status is polled every ``update_interval``. The saved IR/RF lists only
+    change when a command is learned or deleted, so they are fetched on the
+    slower ``catalog_interval`` or right after being invalidated.
+
+    The poll interval adapts: it backs off exponentially (with jitter) while
+    the hub is unreachable, drops to ``BOOST_INTERVAL`` for a while after a
+    mutation or received RF code, and otherwise lands on this hub's phase of
+    the shared poll scheduler so multiple hubs do not poll in lockstep.
+
+    Each section of ``data`` is fingerprinted. Entities pass the sections they
+    read as their listener context and are only notified when one of those
+    sections changes (or when availability or staleness flips).
+    """
 
-    def __init__(self, hass: HomeAssistant, api) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api,
+        status_interval: int = DEFAULT_STATUS_INTERVAL,
+        catalog_interval: int = DEFAULT_CATALOG_INTERVAL,
+        entry_id: str | None = None,
+    ) -> None:
         """Initialize."""
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=30),
+            update_interval=timedelta(seconds=status_interval),
         )
         self.api = api
+        self.base_interval = status_interval
+        self.catalog_interval = catalog_interval
+        self.poll_scheduler = async_get_poll_scheduler(hass)
+        self._failures = 0
+        self._boost_until = 0.0
+        self._catalogs_fetched_at: float | None = None
+        self._stale: set[str] = set()
+        # Last good data, restored at startup before the hub is reached
+        self._snapshot_store = (
+            Store(hass, 1, f"{DOMAIN}.{entry_id}.snapshot") if entry_id else None
+        )
+        self._snapshot_pending = False
+        self._fingerprints: dict[str, str] = {}
+        self._changed_sections: set[str] | None = None
+        self._notified_success = True
+        self._notified_stale: frozenset[str] = frozenset()
+        # Recent refreshes with per-section request times, for diagnostics
+        self.refresh_history: deque[dict[str, Any]] = deque(maxlen=REFRESH_HISTORY_SIZE)
+
+    @callback
+    def async_invalidate_catalogs(self) -> None:
+        """Make the next refresh re-fetch the saved-command lists."""
+        self._catalogs_fetched_at = None
+
+    async def async_restore_snapshot(self) -> bool:
+        """Load the last good data from storage, marked stale.
+
+        Returns False if there is none. Until the next successful refresh
+        every section reports ``is_stale``.
+        """
+        if self._snapshot_store is None:
+            return False
+        snapshot = await self._snapshot_store.async_load()
+        if not snapshot or any(section not in snapshot["data"] for section in SECTIONS):
+            return False
+
+        self.data = snapshot["data"]
+        self._diff_sections(self.data, SECTIONS)
+        self._stale.update(SECTIONS)
+        # Entities added from here on start out stale
+        self._notified_stale = frozenset(self._stale)
+        if self.api.catalog is not None:
+            self.api.catalog.async_sync(self.data["ir_saved"], self.data["rf_saved"])
+        _LOGGER.debug("Restored %s from the snapshot", self.api.host)
+        return True
+
+    @callback
+    def _async_schedule_snapshot(self) -> None:
+        """Persist the current data after a delay."""
+        if self._snapshot_store is not None:
+            self._snapshot_pending = True
+            self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_flush_snapshot(self) -> None:
+        """Write a pending snapshot now, so none is left once the entry unloads."""
+        if self._snapshot_pending:
+            await self._snapshot_store.async_save(self._snapshot_data())
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the snapshot in storage format."""
+        self._snapshot_pending = False
+        return {"data": self.data}
+
+    @callback
+    def async_invalidate(self, section: str) -> None:
+        """Mark one section of ``data`` as out of date until it is re-fetched."""
+        self._stale.add(section)
+
+    def is_stale(self, section: str) -> bool:
+        """Return True if ``section`` was invalidated since it was fetched."""
+        return section in self._stale
+
+    @callback
+    def async_set_section(self, section: str, value: Any) -> None:
+        """Replace one section with freshly fetched data and notify listeners."""
+        self._stale.discard(section)
+        data = {**self.data, section: value}
+        if section in CATALOG_SECTIONS and self.api.catalog is not None:
+            self.api.catalog.async_sync(data["ir_saved"], data["rf_saved"])
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_boost(self) -> None:
+        """Poll faster for a while, e.g. after a command was learned."""
+        self._boost_until = time.monotonic() + BOOST_DURATION
+
+    def _schedule_next(self, success: bool) -> None:
+        """Pick the interval until the next poll."""
+        if not success:
+            self._failures += 1
+            delay = min(self.base_interval * 2 ** self._failures, MAX_BACKOFF_INTERVAL)
+            delay *= random.uniform(0.8, 1.2)
+        else:
+            self._failures = 0
+            if time.monotonic() < self._boost_until:
+                delay = min(BOOST_INTERVAL, self.base_interval)
+            else:
+                delay = self.poll_scheduler.next_delay(self, self.base_interval)
+        self.update_interval = timedelta(seconds=delay)
+
+    def _catalogs_due(self) -> tuple[str, ...]:
+        """Return the saved-command lists that should be fetched."""
+        if (
+            self._catalogs_fetched_at is None
+            or not self.data
+            or time.monotonic() - self._catalogs_fetched_at >= self.catalog_interval
+        ):
+            return CATALOG_SECTIONS
+        return tuple(section for section in CATALOG_SECTIONS if section in self._stale)
+
+    def _diff_sections(self, data: dict[str, Any], sections) -> set[str]:
+        """Update fingerprints for ``sections`` and return those that changed."""
+        changed = set()
+        for section in sections:
+            fingerprint = _fingerprint(data.get(section))
+            if self._fingerprints.get(section) != fingerprint:
+                self._fingerprints[section] = fingerprint
+                changed.add(section)
+        return changed
+
+    @callback
+    def async_set_updated_data(self, data: dict[str, Any]) -> None:
+        """Manually update data, notifying only listeners of changed sections."""
+        self._changed_sections = self._diff_sections(data, SECTIONS)
+        if self._changed_sections:
+            self._async_schedule_snapshot()
+        super().async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners whose context overlaps the changed sections.
+
+        Everyone is notified when availability or staleness changes; both
+        are rare and every entity shows them.
+        """
+        changed = self._changed_sections
+        self._changed_sections = None
+        stale = frozenset(self._stale)
+
+        if (
+            changed is None
+            or self.last_update_success != self._notified_success
+            or stale != self._notified_stale
+        ):
+            self._notified_success = self.last_update_success
+            self._notified_stale = stale
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    async def _async_timed(
+        self, section: str, request: Awaitable[Any], timings: dict[str, float]
+    ) -> Any:
+        """Await one section's request, noting how long it took."""
+        started = time.monotonic()
+        try:
+            return await request
+        finally:
+            timings[section] = round((time.monotonic() - started) * 1000, 1)
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API."""
+        started = time.monotonic()
+        # Let queued transmits go first; poll anyway if the queue stays busy.
         try:
-            async with async_timeout.timeout(10):
-                status = await self.api.get_status()
-                rf_status = await self.api.get_rf_status()
-                rf_saved = await self.api.get_rf_saved()
-                ir_saved = await self.api.get_ir_saved()
-                
-                return {
-                    "status": status,
-                    "rf_status": rf_status,
-                    "rf_saved": rf_saved,
-                    "ir_saved": ir_saved,
-                }
+            async with async_timeout.timeout(5):
+                await self.api.scheduler.async_wait_idle()
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Polling %s while transmit queue is busy", self.api.host)
+
+        catalogs = self._catalogs_due()
+        fetchers = {
+            "status": self.api.get_status,
+            "rf_status": self.api.get_rf_status,
+            "rf_saved": self.api.get_rf_saved,
+            "ir_saved": self.api.get_ir_saved,
+        }
+        timings: dict[str, float] = {}
+        report: dict[str, Any] = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "idle_wait_ms": round((time.monotonic() - started) * 1000, 1),
+            "sections": timings,
+        }
+        self.refresh_history.append(report)
+        requests = [
+            self._async_timed(section, fetchers[section](), timings)
+            for section in ("status", "rf_status", *catalogs)
+        ]
+
+        try:
+            async with self.poll_scheduler.semaphore:
+                async with async_timeout.timeout(10):
+                    results = await asyncio.gather(*requests)
         except Exception as err:
+            report["error"] = str(err)
+            report["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            self._schedule_next(success=False)
             raise UpdateFailed(f"Error communicating with device: {err}")
+        report["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+
+        data = {"status": results[0], "rf_status": results[1]}
+        for section in CATALOG_SECTIONS:
+            data[section] = (self.data or {}).get(section, [])
+        data.update(zip(catalogs, results[2:]))
+        if catalogs == CATALOG_SECTIONS:
+            self._catalogs_fetched_at = time.monotonic()
+        self._stale.difference_update(("status", "rf_status", *catalogs))
+
+        self._changed_sections = self._diff_sections(
+            data, ("status", "rf_status", *catalogs)
+        )
+        if self._changed_sections:
+            self._async_schedule_snapshot()
+        catalog = self.api.catalog
+        if catalog is not None and (
+            not catalog.synced or {"ir_saved", "rf_saved"} & self._changed_sections
+        ):
+            catalog.async_sync(data["ir_saved"], data["rf_saved"])
+
+        previous_rx = (self.data or {}).get("rf_status", {}).get("rx_count")
+        if previous_rx is not None and data["rf_status"].get("rx_count") != previous_rx:
+            self.async_boost()
+        self._schedule_next(success=True)
+        return data
 
 
 
 class HaptiqueGatewayAPI:
     """API client for Haptique IR/RF hub."""
 
-    def __init__(self, host: str, token: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        session: aiohttp.ClientSession,
+        catalog: HaptiqueCommandCatalog | None = None,
+    ):
         """Initialize the API client."""
         self.host = host
         self.token = token
         self.session = session
+        self.catalog = catalog
         self.base_url = f"http://{host}"
+        self.scheduler = HaptiqueCommandScheduler()
+        self.metrics = HaptiqueRequestMetrics()
+        self.breaker = HaptiqueCircuitBreaker()
+        # Monotonic time the last request finished
+        self.last_activity = 0.0
+        # Single-flight reads: endpoint -> in-flight task / (finished at, result)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._recent: dict[str, tuple[float, Any]] = {}
+        # Bumped by every mutation so reads started before it are not reused
+        self._generation = 0
+        # Hold-to-repeat sessions by (kind, name)
+        self._repeats: dict[tuple[str, str], HaptiqueRepeatSession] = {}
         
     def _get_headers(self) -> dict:
         """Get request headers with authentication."""
@@ -235,22 +1233,166 @@ class HaptiqueGatewayAPI:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
     
-    async def _request(self, method: str, endpoint: str, **kwargs) -> dict:
-        """Make API request with authentication."""
+    async def _request(
+        self, method: str, endpoint: str, timeout: float | None = None, **kwargs
+    ) -> dict:
+        """Make API request, coalescing identical reads.
+
+        Concurrent GETs of the same endpoint share one request, and a result
+        is reused for ``READ_FRESHNESS`` seconds. Callers must not modify the
+        returned data. A request to one of ``STATE_CHANGING_ENDPOINTS``
+        starts a new generation of reads; sends leave cached reads alone.
+        """
+        if endpoint in STATE_CHANGING_ENDPOINTS:
+            self._generation += 1
+            self._recent.clear()
+            self._inflight.clear()
+        if method != "GET" or kwargs:
+            return await self._fetch(method, endpoint, timeout, **kwargs)
+
+        recent = self._recent.get(endpoint)
+        if recent is not None and time.monotonic() - recent[0] < READ_FRESHNESS:
+            return recent[1]
+
+        task = self._inflight.get(endpoint)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._fetch(method, endpoint, timeout)
+            )
+            self._inflight[endpoint] = task
+            generation = self._generation
+            task.add_done_callback(
+                lambda done: self._read_done(endpoint, generation, done)
+            )
+        # A cancelled caller must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _read_done(self, endpoint: str, generation: int, task: asyncio.Task) -> None:
+        """Remember a finished read for the freshness window."""
+        if self._inflight.get(endpoint) is task:
+            del self._inflight[endpoint]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation == self._generation:
+            self._recent[endpoint] = (time.monotonic(), task.result())
+
+    async def _fetch(
+        self, method: str, endpoint: str, timeout: float | None = None, **kwargs
+    ) -> dict:
+        """Make API request with authentication.
+
+        ``timeout`` defaults to the poll budget for reads and the mutation
+        budget otherwise. Fails fast while the circuit breaker is open.
+        """
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers()
+        if timeout is None:
+            timeout = TIMEOUT_POLL if method == "GET" else TIMEOUT_MUTATION
+        self.breaker.before_request()
+        wait = queue_wait.get()
+        started = time.monotonic()
         
         try:
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(timeout):
                 async with self.session.request(
                     method, url, headers=headers, **kwargs
                 ) as resp:
                     resp.raise_for_status()
-                    return await resp.json()
+                    # json() parses the body read here, it is not fetched twice
+                    size = len(await resp.read())
+                    result = await resp.json()
         except asyncio.TimeoutError as err:
+            self.metrics.record(
+                endpoint, time.monotonic() - started, "timeout", method, queue_wait=wait
+            )
+            self.breaker.record_failure()
             raise UpdateFailed(f"Timeout connecting to {url}") from err
+        except aiohttp.ClientResponseError as err:
+            # The hub answered, so it is reachable
+            self.metrics.record(
+                endpoint, time.monotonic() - started, "error", method, err.status, None, wait
+            )
+            self.breaker.record_success()
+            raise UpdateFailed(f"Error connecting to {url}: {err}") from err
         except aiohttp.ClientError as err:
+            self.metrics.record(
+                endpoint, time.monotonic() - started, "error", method, queue_wait=wait
+            )
+            self.breaker.record_failure()
             raise UpdateFailed(f"Error connecting to {url}: {err}") from err
+        except ValueError as err:
+            # The hub answered, but not with JSON
+            self.metrics.record(
+                endpoint, time.monotonic() - started, "error", method, queue_wait=wait
+            )
+            self.breaker.record_success()
+            raise UpdateFailed(f"Invalid response from {url}: {err}") from err
+        except asyncio.CancelledError:
+            self.breaker.abort_probe()
+            raise
+        finally:
+            self.last_activity = time.monotonic()
+
+        self.metrics.record(
+            endpoint, self.last_activity - started, "ok", method, resp.status, size, wait
+        )
+        self.breaker.record_success()
+        return result
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict | None = None,
+        params: Mapping[str, str] | None = None,
+    ) -> Any:
+        """Make a request to any hub endpoint, as the web UI would.
+
+        Reads without a query are coalesced like the integration's own.
+        """
+        kwargs: dict[str, Any] = {}
+        if payload is not None:
+            kwargs["json"] = payload
+        if params:
+            kwargs["params"] = params
+        return await self._request(method, endpoint, **kwargs)
+
+    async def transmit(self, endpoint: str, payload: dict, priority: int) -> dict:
+        """Send a transmit request through the hub's serialized queue."""
+        self.breaker.check()
+        return await self.scheduler.async_submit(
+            lambda: self._request("POST", endpoint, TIMEOUT_SEND, json=payload), priority
+        )
+
+    def _saved_request(self, kind: str, name: str) -> tuple[str, dict]:
+        """Return the endpoint and payload that send a saved command.
+
+        With a synced catalog, unknown names are rejected without touching
+        the network and commands with cached codes are sent directly instead
+        of making the firmware look them up in flash.
+        """
+        if self.catalog is None or not self.catalog.synced:
+            return f"/api/{kind}/send/name", {"name": name}
+
+        command = self.catalog.lookup(kind, name)
+        if command is None:
+            raise HomeAssistantError(f"Unknown saved {kind.upper()} command '{name}'")
+
+        if kind == "ir" and command.timings is not None:
+            return "/api/ir/send", {
+                "freq": command.freq,
+                "duty": command.duty,
+                "raw": command.timings.tolist(),
+            }
+        if kind == "rf" and command.pulse_len is None:
+            # /api/rf/send has no pulse length field, so only default-timed codes
+            return "/api/rf/send", {
+                "code": command.code,
+                "bits": command.bits,
+                "protocol": command.protocol,
+                "repeat": DEFAULT_RF_REPEAT,
+            }
+        return f"/api/{kind}/send/name", {"name": name}
     
     async def get_status(self) -> dict:
         """Get device status."""
@@ -269,59 +1411,224 @@ class HaptiqueGatewayAPI:
         """Get saved IR commands."""
         result = await self._request("GET", "/api/ir/saved")
         return result.get("commands", [])
+
+    async def get_rf_last(self) -> dict:
+        """Get the last received RF code."""
+        return await self._request("GET", "/api/rf/last")
+
+    async def get_ir_last(self) -> dict:
+        """Get the last captured IR signal."""
+        return await self._request("GET", "/api/ir/last")
     
-    async def send_rf_code(self, code: int, bits: int, protocol: int, repeat: int) -> dict:
+    async def send_rf_code(
+        self,
+        code: int,
+        bits: int,
+        protocol: int,
+        repeat: int,
+        priority: int = PRIORITY_NORMAL,
+    ) -> dict:
         """Send RF code."""
-        return await self._request(
-            "POST",
+        return await self.transmit(
             "/api/rf/send",
-            json={
+            {
                 "code": code,
                 "bits": bits,
                 "protocol": protocol,
                 "repeat": repeat
-            }
+            },
+            priority,
         )
     
-    async def send_rf_saved(self, name: str) -> dict:
+    async def send_rf_saved(self, name: str, priority: int = PRIORITY_NORMAL) -> dict:
         """Send saved RF command."""
-        return await self._request("POST", "/api/rf/send/name", json={"name": name})
+        return await self.transmit(*self._saved_request("rf", name), priority)
     
-    async def send_ir_code(self, freq: int, duty: int, raw_data: list) -> dict:
+    async def send_ir_code(
+        self, freq: int, duty: int, raw_data: list, priority: int = PRIORITY_NORMAL
+    ) -> dict:
         """Send IR code."""
-        return await self._request(
-            "POST",
+        return await self.transmit(
             "/api/ir/send",
-            json={
+            {
                 "freq": freq,
                 "duty": duty,
                 "raw": raw_data
-            }
+            },
+            priority,
         )
     
-    async def send_ir_saved(self, name: str) -> dict:
+    async def send_ir_saved(self, name: str, priority: int = PRIORITY_NORMAL) -> dict:
         """Send saved IR command."""
-        return await self._request("POST", "/api/ir/send/name", json={"name": name})
+        return await self.transmit(*self._saved_request("ir", name), priority)
     
+    async def send_sequence(
+        self, steps: list[dict], priority: int = PRIORITY_NORMAL
+    ) -> dict[str, Any]:
+        """Send saved IR/RF commands in order.
+
+        Each step is ``{"type": "ir"|"rf", "name": ..., "repeat": n,
+        "delay_ms": ms}``; ``delay_ms`` is the pause after the step. Steps
+        without a pause between them run back to back as one transmit job;
+        pauses are waited out with the queue released, so other sends are
+        not held up by a long macro. Stops at the first failing step and
+        returns per-step timings.
+        """
+        requests = [self._saved_request(step["type"], step["name"]) for step in steps]
+        self.breaker.check()
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        timings: list[dict[str, Any]] = []
+        batch_start = 0
+        for index, step in enumerate(steps):
+            last = index == len(steps) - 1
+            if not last and not step.get("delay_ms"):
+                continue
+            batch = range(batch_start, index + 1)
+            batch_start = index + 1
+            completed = await self.scheduler.async_submit(
+                partial(self._run_steps, steps, requests, batch, started, timings),
+                priority,
+            )
+            if not completed:
+                break
+            if not last:
+                await asyncio.sleep(step["delay_ms"] / 1000)
+        else:
+            completed = True
+
+        return {
+            "completed": completed,
+            "duration_ms": round((loop.time() - started) * 1000, 1),
+            "steps": timings,
+        }
+
+    async def _run_steps(
+        self,
+        steps: list[dict],
+        requests: list[tuple[str, dict]],
+        batch: range,
+        started: float,
+        timings: list[dict[str, Any]],
+    ) -> bool:
+        """Send a run of sequence steps back to back over the pooled connection."""
+        loop = asyncio.get_running_loop()
+        for index in batch:
+            step = steps[index]
+            endpoint, payload = requests[index]
+            step_start = loop.time()
+            timing = {
+                "index": index,
+                "type": step["type"],
+                "name": step["name"],
+                "offset_ms": round((step_start - started) * 1000, 1),
+            }
+            timings.append(timing)
+            try:
+                for _ in range(step.get("repeat", 1)):
+                    await self._request("POST", endpoint, TIMEOUT_SEND, json=payload)
+            except UpdateFailed as err:
+                timing["error"] = str(err)
+                timing["duration_ms"] = round((loop.time() - step_start) * 1000, 1)
+                _LOGGER.warning("Sequence stopped at step %d: %s", index, err)
+                return False
+            timing["duration_ms"] = round((loop.time() - step_start) * 1000, 1)
+        return True
+
+    async def start_repeat(
+        self,
+        kind: str,
+        name: str,
+        interval: float,
+        max_count: int,
+        priority: int = PRIORITY_NORMAL,
+    ) -> dict[str, Any]:
+        """Send a saved command now and then every ``interval`` seconds.
+
+        The request is resolved and encoded once; each repetition only
+        queues it on the transmit scheduler, so other sends can go out in
+        between. Starting a command that is already repeating restarts it.
+        """
+        endpoint, payload = self._saved_request(kind, name)
+        self.breaker.check()
+        self.stop_repeat(kind, name, "restarted")
+
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        send = partial(
+            self.scheduler.async_submit,
+            partial(self._request, "POST", endpoint, TIMEOUT_SEND, data=body),
+            priority,
+        )
+        session = HaptiqueRepeatSession(kind, name, send, interval, max_count)
+        session.on_done = self._repeat_done
+        self._repeats[(kind, name)] = session
+        await session.async_start()
+        return session.as_dict()
+
+    @property
+    def repeating(self) -> list[dict[str, Any]]:
+        """Return the state of the running repeat sessions."""
+        return [session.as_dict() for session in self._repeats.values()]
+
+    def stop_repeat(
+        self, kind: str | None = None, name: str | None = None, reason: str = "stopped"
+    ) -> list[dict[str, Any]]:
+        """Stop the matching repeat sessions (all without filters) and report them."""
+        return [
+            session.async_cancel(reason)
+            for (session_kind, session_name), session in list(self._repeats.items())
+            if kind in (None, session_kind) and name in (None, session_name)
+        ]
+
+    def _repeat_done(self, session: HaptiqueRepeatSession) -> None:
+        """Forget a session once it has ended."""
+        if self._repeats.get((session.kind, session.name)) is session:
+            del self._repeats[(session.kind, session.name)]
+
     async def save_rf_command(self, name: str) -> dict:
         """Save last received RF command."""
         return await self._request("POST", "/api/rf/save", json={"name": name})
     
-    async def save_ir_command(self, name: str, frame: str) -> dict:
-        return await self._request(
+    async def save_ir_command(
+        self, name: str, frame: str, capture: dict | None = None
+    ) -> dict:
+        """Save last received IR command, caching its timings locally.
+
+        ``capture`` is the ``/api/ir/last`` data being saved, if already read.
+        """
+        if capture is None and self.catalog is not None:
+            try:
+                capture = await self.get_ir_last()
+            except UpdateFailed as err:
+                _LOGGER.debug("Could not read IR capture for '%s': %s", name, err)
+
+        result = await self._request(
             "POST",
             "/api/ir/save",
             json={
                 "name": name,
-                "frame": frame
+                "frame": IR_SAVE_FRAMES.get(frame.upper(), frame)
             }
         )
 
+        timings = (capture or {}).get(IR_FRAME_KEYS.get(frame.upper(), ""))
+        if timings and self.catalog is not None:
+            freq = int(capture.get("freq_khz", 38) * 1000)
+            self.catalog.async_record_ir(name, freq, 33, timings)
+        return result
+
     
     async def delete_rf_command(self, name: str) -> dict:
         """Delete saved RF command."""
-        return await self._request("DELETE", "/api/rf/delete", json={"name": name})
+        result = await self._request("DELETE", "/api/rf/delete", json={"name": name})
+        if self.catalog is not None:
+            self.catalog.async_remove("rf", name)
+        return result
     
     async def delete_ir_command(self, name: str) -> dict:
         """Delete saved IR command."""
-        return await self._request("DELETE", "/api/ir/delete", json={"name": name})
+        result = await self._request("DELETE", "/api/ir/delete", json={"name": name})
+        if self.catalog is not None:
+            self.catalog.async_remove("ir", name)
+        return result
@@ -0,0 +1,268 @@
+"""Backup, restore and cloning of Haptique IR/RF hub command libraries.
+
+A backup is a JSON Lines file: a header line followed by one line per IR
+command, RF command and saved sequence. IR timings are stored as protocol
+codes where recognized and compact ``ir1:`` codes otherwise; IR commands
+learned outside Home Assistant have no cached timings and are listed
+without a code.
+
+Files are written and read in chunks in the executor, so a library of any
+size never has to be held as one JSON document. The hub firmware can only
+save the signal it last captured, so restores go to the integration's local
+catalog of each hub, from where the commands are sent as raw codes.
+"""
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from datetime import datetime
+import json
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .catalog import IrCommand, RfCommand, ir_command
+from .codec import IrCodecError, decode_ir, encode_compact
+from .const import BACKUP_CHUNK_SIZE, DOMAIN, EVENT_LIBRARY_PROGRESS, RESTORE_CONCURRENCY
+
+BACKUP_FORMAT = "haptique-library"
+BACKUP_VERSION = 1
+
+
+def library_records(hub: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield the backup records of a hub's commands and sequences."""
+    catalog = hub["api"].catalog
+    for name, command in {**catalog.local_ir, **catalog.ir}.items():
+        if command.protocol is not None:
+            code = str(command.protocol)
+        elif command.timings is not None:
+            code = encode_compact(command.timings, command.freq)
+        else:
+            code = None
+        yield {
+            "kind": "ir",
+            "name": name,
+            "freq": command.freq,
+            "duty": command.duty,
+            "code": code,
+        }
+    for name, command in {**catalog.local_rf, **catalog.rf}.items():
+        yield {
+            "kind": "rf",
+            "name": name,
+            "code": command.code,
+            "bits": command.bits,
+            "protocol": command.protocol,
+            "pulse_len": command.pulse_len,
+        }
+    for name, steps in hub["macros"].macros.items():
+        yield {"kind": "sequence", "name": name, "steps": steps}
+
+
+async def async_write_backup(
+    hass: HomeAssistant, path: str, hub: dict[str, Any]
+) -> dict[str, int]:
+    """Write a hub's library to ``path`` and return the record counts."""
+    counts = {"ir": 0, "rf": 0, "sequence": 0, "missing_timings": 0}
+    header = {
+        "format": BACKUP_FORMAT,
+        "version": BACKUP_VERSION,
+        "host": hub["api"].host,
+        "title": hub["entry"].title,
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+    temp_path = f"{path}.tmp"
+    handle = await hass.async_add_executor_job(_open_for_write, temp_path)
+    try:
+        chunk = [json.dumps(header)]
+        size = len(chunk[0])
+        for record in library_records(hub):
+            counts[record["kind"]] += 1
+            if record["kind"] == "ir" and record["code"] is None:
+                counts["missing_timings"] += 1
+            line = json.dumps(record, separators=(",", ":"))
+            chunk.append(line)
+            size += len(line)
+            if size >= BACKUP_CHUNK_SIZE:
+                await hass.async_add_executor_job(_write_lines, handle, chunk)
+                chunk, size = [], 0
+        await hass.async_add_executor_job(_write_lines, handle, chunk)
+    finally:
+        await hass.async_add_executor_job(handle.close)
+    await hass.async_add_executor_job(os.replace, temp_path, path)
+    return counts
+
+
+async def async_read_backup(
+    hass: HomeAssistant, path: str
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield the records of a backup file in chunks, checking its header first."""
+    try:
+        handle = await hass.async_add_executor_job(_open_for_read, path)
+    except OSError as err:
+        raise HomeAssistantError(f"Cannot open backup {path}: {err}") from err
+    try:
+        header = None
+        while lines := await hass.async_add_executor_job(
+            handle.readlines, BACKUP_CHUNK_SIZE
+        ):
+            records = []
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as err:
+                    raise HomeAssistantError(f"Corrupt backup {path}: {err}") from err
+                if header is None:
+                    header = record
+                    if header.get("format") != BACKUP_FORMAT:
+                        raise HomeAssistantError(f"{path} is not a Haptique library backup")
+                    if header.get("version", 0) > BACKUP_VERSION:
+                        raise HomeAssistantError(f"{path} needs a newer integration")
+                    continue
+                records.append(record)
+            yield records
+    finally:
+        await hass.async_add_executor_job(handle.close)
+
+
+async def async_restore_library(
+    hass: HomeAssistant,
+    hubs: list[dict[str, Any]],
+    chunks: AsyncIterable[list[dict[str, Any]]],
+    overwrite: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """Restore chunks of library records to hubs and return a report per hub.
+
+    Each chunk is decoded once and applied to every hub, at most
+    ``RESTORE_CONCURRENCY`` hubs at a time, before the next chunk is read.
+    """
+    restorers = [HaptiqueLibraryRestorer(hass, hub, overwrite) for hub in hubs]
+    semaphore = asyncio.Semaphore(RESTORE_CONCURRENCY)
+
+    async def apply(restorer: HaptiqueLibraryRestorer, commands: list) -> None:
+        async with semaphore:
+            await restorer.async_apply(commands)
+
+    async for records in chunks:
+        commands = [_prepare(record) for record in records]
+        await asyncio.gather(*(apply(restorer, commands) for restorer in restorers))
+    for restorer in restorers:
+        restorer.async_fire_progress(finished=True)
+    return {restorer.entry_id: restorer.report for restorer in restorers}
+
+
+def _prepare(record: dict[str, Any]) -> tuple[dict[str, Any], Any]:
+    """Pair a record with its command, or with the reason it cannot be restored."""
+    kind = record.get("kind")
+    if kind == "ir":
+        if record.get("code") is None:
+            return record, None
+        try:
+            freq, timings = decode_ir(record["code"])
+        except IrCodecError as err:
+            return record, err
+        return record, ir_command(
+            record["name"], freq or record.get("freq", 38000), record.get("duty", 33), timings
+        )
+    if kind == "rf":
+        if record.get("pulse_len") is not None:
+            # /api/rf/send has no pulse length field
+            return record, HomeAssistantError("custom pulse lengths cannot be sent as codes")
+        return record, RfCommand(
+            record["name"], record["code"], record["bits"], record["protocol"], None
+        )
+    return record, record.get("steps")
+
+
+class HaptiqueLibraryRestorer:
+    """Add library records to one hub's local catalog and sequences.
+
+    Commands the hub or its local catalog already has are skipped unless
+    ``overwrite`` is set (the hub's own commands are never replaced), so
+    running a restore again after a failure resumes where it stopped.
+    Progress is fired as ``haptique_ir_rf_hub_library_progress`` events.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: dict[str, Any], overwrite: bool) -> None:
+        """Initialize the restorer."""
+        self._hass = hass
+        self._hub = hub
+        self._overwrite = overwrite
+        self.entry_id: str = hub["entry"].entry_id
+        self.report: dict[str, Any] = {
+            "restored": 0,
+            "skipped": 0,
+            "missing_timings": 0,
+            "failed": [],
+        }
+
+    async def async_apply(self, commands: list[tuple[dict[str, Any], Any]]) -> None:
+        """Restore one chunk of prepared records."""
+        catalog = self._hub["api"].catalog
+        macros: dict[str, list[dict[str, Any]]] = {}
+        for record, command in commands:
+            kind, name = record.get("kind"), record.get("name")
+            if kind == "ir" and command is None:
+                self.report["missing_timings"] += 1
+            elif isinstance(command, Exception):
+                self.report["failed"].append({"kind": kind, "name": name, "error": str(command)})
+            elif kind == "sequence" and command:
+                if name in self._hub["macros"].macros and not self._overwrite:
+                    self.report["skipped"] += 1
+                else:
+                    macros[name] = command
+            elif isinstance(command, (IrCommand, RfCommand)):
+                on_hub = name in (catalog.ir if kind == "ir" else catalog.rf)
+                if on_hub or (catalog.find(kind, name) is not None and not self._overwrite):
+                    self.report["skipped"] += 1
+                else:
+                    catalog.async_add_local(kind, command)
+                    self.report["restored"] += 1
+        if macros:
+            await self._hub["macros"].async_save_macros(macros)
+            self.report["restored"] += len(macros)
+        self.async_fire_progress()
+
+    def async_fire_progress(self, finished: bool = False) -> None:
+        """Fire a progress event."""
+        self._hass.bus.async_fire(
+            EVENT_LIBRARY_PROGRESS,
+            {
+                "entry_id": self.entry_id,
+                "restored": self.report["restored"],
+                "skipped": self.report["skipped"],
+                "failed": len(self.report["failed"]),
+                "finished": finished,
+            },
+        )
+
+
+def _open_for_write(path: str):
+    """Open a backup file for writing, creating its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, "w", encoding="utf-8")
+
+
+def _open_for_read(path: str):
+    """Open a backup file for reading."""
+    return open(path, encoding="utf-8")
+
+
+def _write_lines(handle, lines: list[str]) -> None:
+    """Write lines to an open backup file."""
+    if lines:
+        handle.write("\n".join(lines) + "\n")
+
+
+def backup_path(hass: HomeAssistant, filename: str) -> str:
+    """Resolve a backup file name; bare names live in the backup folder."""
+    if os.path.basename(filename) == filename:
+        return hass.config.path(DOMAIN, "backups", filename)
+    if not os.path.isabs(filename) or not hass.config.is_allowed_path(filename):
+        raise HomeAssistantError(
+            f"{filename} must be a bare file name or an absolute path in "
+            "allowlist_external_dirs"
+        )
+    return filename
@@ -0,0 +1,102 @@
+"""Circuit breaker for Haptique IR/RF hub requests."""
+from collections.abc import Callable
+import logging
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import BREAKER_COOLDOWN, BREAKER_THRESHOLD
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class HaptiqueCircuitBreaker:
+    """Fail fast while a hub is unreachable.
+
+    After ``threshold`` consecutive connection failures the breaker opens and
+    requests fail immediately for ``cooldown`` seconds. The first request
+    after the cooldown is let through as a probe (half-open): success closes
+    the breaker, failure opens it for another cooldown. Other requests keep
+    failing fast while the probe is in flight.
+    """
+
+    def __init__(
+        self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN
+    ) -> None:
+        """Initialize the breaker."""
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        # Called with True/False when the hub becomes available/unavailable
+        self.on_change: Callable[[bool], None] | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True while requests are let through normally."""
+        return self.state == STATE_CLOSED
+
+    def check(self) -> None:
+        """Raise UpdateFailed if a request would be rejected right now."""
+        if self.state == STATE_CLOSED:
+            return
+        remaining = self._opened_at + self.cooldown - time.monotonic()
+        if self.state == STATE_OPEN and remaining > 0:
+            raise UpdateFailed(f"Hub unreachable, retrying in {remaining:.0f} s")
+        if self._probing:
+            raise UpdateFailed("Hub unreachable, reconnect attempt in progress")
+
+    def before_request(self) -> None:
+        """Admit a request or raise UpdateFailed; may start a half-open probe."""
+        self.check()
+        if self.state != STATE_CLOSED:
+            self.state = STATE_HALF_OPEN
+            self._probing = True
+
+    def record_success(self) -> None:
+        """Record that the hub answered."""
+        self.failures = 0
+        self._probing = False
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Hub reachable again, closing circuit")
+            self.state = STATE_CLOSED
+            self._notify(True)
+
+    def record_failure(self) -> None:
+        """Record a connection failure or timeout."""
+        self.failures += 1
+        self._probing = False
+        if self.state == STATE_HALF_OPEN or (
+            self.state == STATE_CLOSED and self.failures >= self.threshold
+        ):
+            was_closed = self.state == STATE_CLOSED
+            self.state = STATE_OPEN
+            self._opened_at = time.monotonic()
+            if was_closed:
+                _LOGGER.warning(
+                    "Hub unreachable after %d failures, failing fast for %d s",
+                    self.failures,
+                    self.cooldown,
+                )
+                self._notify(False)
+
+    def abort_probe(self) -> None:
+        """End a half-open probe that was cancelled before the hub answered.
+
+        Nothing is learned about the hub, so no failure is counted; the
+        breaker re-opens and the next request after the cooldown probes again.
+        """
+        if self.state == STATE_HALF_OPEN:
+            self._probing = False
+            self.state = STATE_OPEN
+
+    def _notify(self, available: bool) -> None:
+        """Report an availability change."""
+        if self.on_change is not None:
+            self.on_change(available)
@@ -3,15 +3,24 @@ import logging
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER, MODEL
+from .const import DOMAIN, MANUFACTURER, MODEL, PRIORITY_USER, SIGNAL_MACROS_UPDATED
+from .entity import HaptiqueEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Buttons render nothing from coordinator data; they only follow availability
+# and staleness, which the coordinator reports to every listener.
+BUTTON_CONTEXT = frozenset()
+
+# Coordinator sections that define which command buttons exist
+CATALOG_CONTEXT = frozenset({"rf_saved", "ir_saved"})
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -22,32 +31,78 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
     api = data["api"]
-    
-    entities = []
-    
-    # Create button entities for saved RF commands
-    rf_saved = coordinator.data.get("rf_saved", [])
-    for command in rf_saved:
-        entities.append(
-            HaptiqueRFButton(coordinator, api, entry, command["name"])
-        )
-    
-    # Create button entities for saved IR commands
-    ir_saved = coordinator.data.get("ir_saved", [])
-    for command in ir_saved:
-        entities.append(
-            HaptiqueIRButton(coordinator, api, entry, command["name"])
+    macros = data["macros"]
+
+    # Saved-command buttons keyed by (kind, name), sequence buttons by name
+    command_buttons: dict[tuple[str, str], ButtonEntity] = {}
+    sequence_buttons: dict[str, ButtonEntity] = {}
+
+    @callback
+    def async_reconcile_commands() -> None:
+        """Add buttons for newly saved commands and remove deleted ones."""
+        wanted = {("rf", command["name"]) for command in coordinator.data.get("rf_saved", [])}
+        wanted.update(("ir", command["name"]) for command in coordinator.data.get("ir_saved", []))
+
+        new = []
+        for kind, name in wanted - command_buttons.keys():
+            button_class = HaptiqueRFButton if kind == "rf" else HaptiqueIRButton
+            command_buttons[(kind, name)] = button_class(coordinator, api, entry, name)
+            new.append(command_buttons[(kind, name)])
+        if new:
+            async_add_entities(new)
+
+        removed = command_buttons.keys() - wanted
+        _async_remove_buttons(hass, [command_buttons.pop(key) for key in removed])
+
+    @callback
+    def async_reconcile_sequences() -> None:
+        """Add buttons for new sequences and remove deleted ones."""
+        new = []
+        for name in macros.macros.keys() - sequence_buttons.keys():
+            sequence_buttons[name] = HaptiqueSequenceButton(
+                coordinator, api, entry, macros, name
+            )
+            new.append(sequence_buttons[name])
+        if new:
+            async_add_entities(new)
+
+        removed = sequence_buttons.keys() - macros.macros.keys()
+        _async_remove_buttons(hass, [sequence_buttons.pop(name) for name in removed])
+
+    async_reconcile_commands()
+    async_reconcile_sequences()
+
+    # Only runs when a saved-command list actually changed (or availability flipped)
+    entry.async_on_unload(
+        coordinator.async_add_listener(async_reconcile_commands, CATALOG_CONTEXT)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_MACROS_UPDATED.format(entry.entry_id), async_reconcile_sequences
         )
-    
-    async_add_entities(entities)
+    )
+
 
+@callback
+def _async_remove_buttons(hass: HomeAssistant, buttons: list[ButtonEntity]) -> None:
+    """Remove buttons and their entity registry entries."""
+    registry = er.async_get(hass)
+    for button in buttons:
+        if button.entity_id and registry.async_get(button.entity_id):
+            registry.async_remove(button.entity_id)
+        else:
+            hass.async_create_task(button.async_remove())
 
-class HaptiqueRFButton(CoordinatorEntity, ButtonEntity):
+
+class HaptiqueRFButton(HaptiqueEntity, ButtonEntity):
     """Representation of a Haptique RF command button."""
 
+    # Stale until the hub confirms the command is still saved
+    _sections = frozenset({"rf_saved"})
+
     def __init__(self, coordinator, api, entry, command_name):
         """Initialize the button."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=BUTTON_CONTEXT)
         self._api = api
         self._command_name = command_name
         self._attr_name = f"RF {command_name}"
@@ -64,18 +119,20 @@ class HaptiqueRFButton(CoordinatorEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         try:
-            await self._api.send_rf_saved(self._command_name)
+            await self._api.send_rf_saved(self._command_name, PRIORITY_USER)
             _LOGGER.info("RF command '%s' sent successfully", self._command_name)
         except Exception as err:
             _LOGGER.error("Failed to send RF command '%s': %s", self._command_name, err)
 
 
-class HaptiqueIRButton(CoordinatorEntity, ButtonEntity):
+class HaptiqueIRButton(HaptiqueEntity, ButtonEntity):
     """Representation of a Haptique IR command button."""
 
+    _sections = frozenset({"ir_saved"})
+
     def __init__(self, coordinator, api, entry, command_name):
         """Initialize the button."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=BUTTON_CONTEXT)
         self._api = api
         self._command_name = command_name
         self._attr_name = f"IR {command_name}"
@@ -92,7 +149,46 @@ class HaptiqueIRButton(CoordinatorEntity, ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         try:
-            await self._api.send_ir_saved(self._command_name)
+            await self._api.send_ir_saved(self._command_name, PRIORITY_USER)
             _LOGGER.info("IR command '%s' sent successfully", self._command_name)
         except Exception as err:
             _LOGGER.error("Failed to send IR command '%s': %s", self._command_name, err)
+
+
+class HaptiqueSequenceButton(HaptiqueEntity, ButtonEntity):
+    """Representation of a saved Haptique command sequence."""
+
+    _sections = CATALOG_CONTEXT
+
+    def __init__(self, coordinator, api, entry, macros, macro_name):
+        """Initialize the button."""
+        super().__init__(coordinator, context=BUTTON_CONTEXT)
+        self._api = api
+        self._macros = macros
+        self._macro_name = macro_name
+        self._attr_name = f"Sequence {macro_name}"
+        self._attr_unique_id = f"{entry.entry_id}_sequence_{macro_name}"
+        self._attr_icon = "mdi:playlist-play"
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer=MANUFACTURER,
+            model=MODEL,
+            sw_version=coordinator.data.get("status", {}).get("version", "Unknown"),
+        )
+
+    async def async_press(self) -> None:
+        """Handle the button press."""
+        steps = self._macros.macros.get(self._macro_name)
+        if not steps:
+            _LOGGER.error("Sequence '%s' no longer exists", self._macro_name)
+            return
+
+        try:
+            result = await self._api.send_sequence(steps, PRIORITY_USER)
+            _LOGGER.info(
+                "Sequence '%s' finished in %.0f ms", self._macro_name, result["duration_ms"]
+            )
+        except Exception as err:
+            _LOGGER.error("Failed to run sequence '%s': %s", self._macro_name, err)
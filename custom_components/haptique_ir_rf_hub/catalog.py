@@ -0,0 +1,274 @@
+"""Local saved-command catalog for Haptique IR/RF hub."""
+import logging
+import sys
+from array import array
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .codec import decode_compact, encode_compact
+from .const import DOMAIN
+from .protocols import IrProtocolCode, decode_protocol, parse_protocol
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# /api/ir/last keys for each frame accepted by /api/ir/save
+IR_FRAME_KEYS = {"A": "a", "B": "b", "COMBINED": "combined"}
+
+# The ``frame`` value /api/ir/save expects for each frame, as hub.html sends it
+IR_SAVE_FRAMES = {"A": "A", "B": "B", "COMBINED": "combined"}
+
+
+def best_ir_frame(capture: dict[str, Any]) -> str | None:
+    """Return the frame of an ``/api/ir/last`` capture most worth saving.
+
+    A frame that decodes to a known protocol wins (B first, the firmware's
+    usual pick), then the longer of A and B, then the combined frame.
+    """
+    frames = {frame: capture.get(key) or [] for frame, key in IR_FRAME_KEYS.items()}
+    for frame in ("B", "A", "COMBINED"):
+        if frames[frame] and decode_protocol(frames[frame]) is not None:
+            return frame
+    if frames["A"] or frames["B"]:
+        return max(("B", "A"), key=lambda frame: len(frames[frame]))
+    return "COMBINED" if frames["COMBINED"] else None
+
+
+class IrCommand:
+    """A learned IR command.
+
+    ``protocol`` is set when the captured timings match a known protocol.
+    """
+
+    __slots__ = ("name", "freq", "duty", "timings", "protocol")
+
+    def __init__(
+        self,
+        name: str,
+        freq: int,
+        duty: int,
+        timings: array | None = None,
+        protocol: IrProtocolCode | None = None,
+    ):
+        """Initialize the command."""
+        self.name = name
+        self.freq = freq
+        self.duty = duty
+        self.timings = timings
+        self.protocol = protocol
+
+
+def ir_command(name: str, freq: int, duty: int, timings: list[int]) -> IrCommand:
+    """Return an IR command for captured timings, decoding their protocol."""
+    name = sys.intern(name)
+    return IrCommand(name, freq, duty, array("I", timings), decode_protocol(timings))
+
+
+class RfCommand:
+    """A learned RF command."""
+
+    __slots__ = ("name", "code", "bits", "protocol", "pulse_len")
+
+    def __init__(self, name: str, code: int, bits: int, protocol: int, pulse_len: int | None):
+        """Initialize the command."""
+        self.name = name
+        self.code = code
+        self.bits = bits
+        self.protocol = protocol
+        self.pulse_len = pulse_len
+
+
+class HaptiqueCommandCatalog:
+    """Saved IR/RF commands of one hub, kept in sync with the device lists.
+
+    RF commands are fully described by ``/api/rf/saved``. The IR list only
+    has metadata, so IR timings are taken from ``/api/ir/last`` when a
+    command is saved through the integration; IR commands learned elsewhere
+    have no timings and are still sent by name.
+
+    Commands restored from a backup that the hub itself does not have are
+    kept apart in ``local_ir`` / ``local_rf``. Device commands win over
+    local ones of the same name; local ones are always sent as raw codes.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the catalog."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.catalog")
+        self.ir: dict[str, IrCommand] = {}
+        self.rf: dict[str, RfCommand] = {}
+        self.local_ir: dict[str, IrCommand] = {}
+        self.local_rf: dict[str, RfCommand] = {}
+        # True once the device lists have been applied at least once
+        self.synced = False
+        self._save_pending = False
+        # Called when a lookup misses, so the owner can re-fetch the lists
+        self.on_miss: Callable[[], None] | None = None
+        # Called after the commands changed
+        self.on_change: Callable[[], None] | None = None
+
+    async def async_load(self) -> None:
+        """Load the catalog from storage."""
+        data = await self._store.async_load() or {}
+        self.ir = _load_ir(data.get("ir", {}))
+        self.rf = _load_rf(data.get("rf", {}))
+        local = data.get("local", {})
+        self.local_ir = _load_ir(local.get("ir", {}))
+        self.local_rf = _load_rf(local.get("rf", {}))
+
+    @callback
+    def async_sync(self, ir_saved: list[dict], rf_saved: list[dict]) -> None:
+        """Apply the device's saved-command lists."""
+        ir = {}
+        for item in ir_saved:
+            name = sys.intern(item["name"])
+            command = IrCommand(name, item.get("freq_hz", 38000), item.get("duty", 33))
+            cached = self.ir.get(name)
+            if cached is not None and cached.timings is not None:
+                # Keep the captured timings only while they still match the device
+                if item.get("count") in (None, len(cached.timings)):
+                    command.timings = cached.timings
+                    command.protocol = cached.protocol
+            ir[name] = command
+
+        rf = {}
+        for item in rf_saved:
+            name = sys.intern(item["name"])
+            rf[name] = RfCommand(
+                name,
+                item["code"],
+                item.get("bits", 24),
+                item.get("protocol", 1),
+                item.get("pulseLen"),
+            )
+
+        self.ir, self.rf = ir, rf
+        self.synced = True
+        self._async_schedule_save()
+
+    @callback
+    def async_record_ir(self, name: str, freq: int, duty: int, timings: list[int]) -> None:
+        """Store the timings of an IR command just saved on the device."""
+        command = ir_command(name, freq, duty, timings)
+        self.ir[command.name] = command
+        self._async_schedule_save()
+
+    @callback
+    def async_add_local(self, kind: str, command: IrCommand | RfCommand) -> None:
+        """Add or replace a restored command the hub does not have."""
+        (self.local_ir if kind == "ir" else self.local_rf)[command.name] = command
+        self._async_schedule_save()
+
+    @callback
+    def async_remove(self, kind: str, name: str) -> None:
+        """Forget a deleted command."""
+        removed = False
+        for commands in (
+            (self.ir, self.local_ir) if kind == "ir" else (self.rf, self.local_rf)
+        ):
+            removed |= commands.pop(name, None) is not None
+        if removed:
+            self._async_schedule_save()
+
+    def find(self, kind: str, name: str) -> IrCommand | RfCommand | None:
+        """Return a device or local command by name, or None."""
+        if kind == "ir":
+            command = self.ir.get(name)
+            return command if command is not None else self.local_ir.get(name)
+        command = self.rf.get(name)
+        return command if command is not None else self.local_rf.get(name)
+
+    def lookup(self, kind: str, name: str) -> IrCommand | RfCommand | None:
+        """Return a command by name, or None if the hub does not have it."""
+        command = self.find(kind, name)
+        if command is None and self.on_miss is not None:
+            self.on_miss()
+        return command
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Persist the catalog after a short delay and report the change."""
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        if self.on_change is not None:
+            self.on_change()
+
+    async def async_flush(self) -> None:
+        """Write a pending save now, so none is left once the entry unloads."""
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the catalog in storage format."""
+        self._save_pending = False
+        return {
+            "ir": _dump_ir(self.ir),
+            "rf": _dump_rf(self.rf),
+            "local": {"ir": _dump_ir(self.local_ir), "rf": _dump_rf(self.local_rf)},
+        }
+
+
+def _load_ir(data: dict[str, Any]) -> dict[str, IrCommand]:
+    """Return IR commands from storage format."""
+    commands = {}
+    for name, item in data.items():
+        timings = decode_compact(item["code"])[1] if item.get("code") else None
+        if item.get("protocol"):
+            protocol = parse_protocol(item["protocol"])
+        else:
+            # Catalogs saved before protocol decoding
+            protocol = decode_protocol(timings) if timings else None
+        commands[sys.intern(name)] = IrCommand(
+            sys.intern(name),
+            item["freq"],
+            item["duty"],
+            array("I", timings) if timings else None,
+            protocol,
+        )
+    return commands
+
+
+def _load_rf(data: dict[str, Any]) -> dict[str, RfCommand]:
+    """Return RF commands from storage format."""
+    return {
+        sys.intern(name): RfCommand(
+            sys.intern(name),
+            item["code"],
+            item["bits"],
+            item["protocol"],
+            item.get("pulse_len"),
+        )
+        for name, item in data.items()
+    }
+
+
+def _dump_ir(commands: dict[str, IrCommand]) -> dict[str, Any]:
+    """Return IR commands in storage format."""
+    return {
+        name: {
+            "freq": command.freq,
+            "duty": command.duty,
+            "code": (
+                encode_compact(command.timings, command.freq) if command.timings else None
+            ),
+            "protocol": str(command.protocol) if command.protocol else None,
+        }
+        for name, command in commands.items()
+    }
+
+
+def _dump_rf(commands: dict[str, RfCommand]) -> dict[str, Any]:
+    """Return RF commands in storage format."""
+    return {
+        name: {
+            "code": command.code,
+            "bits": command.bits,
+            "protocol": command.protocol,
+            "pulse_len": command.pulse_len,
+        }
+        for name, command in commands.items()
+    }
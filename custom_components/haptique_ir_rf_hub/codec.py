@@ -0,0 +1,167 @@
+"""Compact encodings for IR timing arrays.
+
+Two text forms are supported besides plain integer lists:
+
+* ``ir1:<freq>:<data>`` - timings quantized to carrier cycles, varint
+  packed with run-length compression of repeated mark/space pairs and
+  base64url encoded. Quantization error is at most half a carrier period
+  (about 13 us at 38 kHz), well inside receiver tolerances.
+* Pronto hex (``0000 006D 0022 0000 ...``) for exchange with other tools.
+
+Protocol codes such as ``nec:0x04:0x08`` (see ``protocols``) are accepted
+as input too and regenerated as clean timings.
+"""
+import base64
+
+from .protocols import encode_protocol, is_protocol_code, parse_protocol
+
+COMPACT_PREFIX = "ir1:"
+
+# Pronto carrier word: period in units of 0.241246 us
+_PRONTO_UNIT = 0.241246
+
+# Varint value that introduces a pair run (cycle counts are always >= 1)
+_RUN = 0
+
+
+class IrCodecError(ValueError):
+    """Raised when an IR code cannot be decoded."""
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    """Append ``value`` as an unsigned LEB128 varint."""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Read an unsigned LEB128 varint at ``pos``, returning (value, next_pos)."""
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise IrCodecError("Truncated compact IR code")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_compact(timings: list[int], freq: int) -> str:
+    """Encode microsecond ``timings`` at carrier ``freq`` (Hz) as a compact string."""
+    cycles = [max(1, round(t * freq / 1_000_000)) for t in timings]
+    out = bytearray()
+    _write_varint(out, len(cycles))
+
+    index = 0
+    while index < len(cycles):
+        pair = cycles[index : index + 2]
+        run = 0
+        while (
+            len(pair) == 2
+            and index + 2 * (run + 1) + 1 < len(cycles)
+            and cycles[index + 2 * (run + 1)] == pair[0]
+            and cycles[index + 2 * (run + 1) + 1] == pair[1]
+        ):
+            run += 1
+        for value in pair:
+            _write_varint(out, value)
+        if run:
+            _write_varint(out, _RUN)
+            _write_varint(out, run)
+        index += 2 * (run + 1)
+
+    data = base64.urlsafe_b64encode(bytes(out)).rstrip(b"=").decode()
+    return f"{COMPACT_PREFIX}{freq}:{data}"
+
+
+def decode_compact(code: str) -> tuple[int, list[int]]:
+    """Decode a compact string into (freq, microsecond timings)."""
+    try:
+        freq_text, data_text = code[len(COMPACT_PREFIX) :].split(":", 1)
+        freq = int(freq_text)
+        data = base64.urlsafe_b64decode(data_text + "=" * (-len(data_text) % 4))
+    except ValueError as err:
+        raise IrCodecError(f"Invalid compact IR code: {err}") from err
+    if freq <= 0:
+        raise IrCodecError("Invalid compact IR code: bad frequency")
+
+    count, pos = _read_varint(data, 0)
+    cycles: list[int] = []
+    while pos < len(data):
+        value, pos = _read_varint(data, pos)
+        if value == _RUN:
+            run, pos = _read_varint(data, pos)
+            if len(cycles) < 2:
+                raise IrCodecError("Invalid compact IR code: run without pair")
+            cycles.extend(cycles[-2:] * run)
+        else:
+            cycles.append(value)
+    if len(cycles) != count:
+        raise IrCodecError(f"Compact IR code holds {len(cycles)} timings, expected {count}")
+
+    period = 1_000_000 / freq
+    return freq, [round(c * period) for c in cycles]
+
+
+def to_pronto(timings: list[int], freq: int) -> str:
+    """Encode microsecond ``timings`` as a Pronto hex learned code."""
+    carrier = round(1_000_000 / (freq * _PRONTO_UNIT))
+    cycles = [max(1, round(t * freq / 1_000_000)) for t in timings]
+    if len(cycles) % 2:
+        # Pronto needs whole mark/space pairs; pad with a short trailing gap
+        cycles.append(max(cycles[-1], 1))
+    words = [0, carrier, len(cycles) // 2, 0, *cycles]
+    return " ".join(f"{word:04X}" for word in words)
+
+
+def from_pronto(code: str) -> tuple[int, list[int]]:
+    """Decode a Pronto hex learned code into (freq, microsecond timings).
+
+    The once sequence is followed by one pass of the repeat sequence.
+    """
+    try:
+        words = [int(word, 16) for word in code.split()]
+    except ValueError as err:
+        raise IrCodecError(f"Invalid Pronto code: {err}") from err
+    if len(words) < 4 or words[0] != 0 or words[1] == 0:
+        raise IrCodecError("Only learned Pronto codes (0000 ...) are supported")
+
+    once, repeat = words[2], words[3]
+    body = words[4:]
+    if len(body) != 2 * (once + repeat):
+        raise IrCodecError("Pronto code length does not match its header")
+
+    freq = round(1_000_000 / (words[1] * _PRONTO_UNIT))
+    period = words[1] * _PRONTO_UNIT
+    return freq, [round(c * period) for c in body]
+
+
+def decode_ir(value) -> tuple[int | None, list[int]]:
+    """Decode any supported IR timing form into (freq or None, timings).
+
+    Accepts a list of integers, a comma separated string, a compact
+    ``ir1:`` string, a Pronto hex string or a protocol code.
+    """
+    if isinstance(value, (list, tuple)):
+        return None, [int(t) for t in value]
+    if not isinstance(value, str):
+        raise IrCodecError(f"Unsupported IR code type: {type(value).__name__}")
+
+    text = value.strip()
+    if text.startswith(COMPACT_PREFIX):
+        return decode_compact(text)
+    if text.startswith("0000 "):
+        return from_pronto(text)
+    if is_protocol_code(text):
+        try:
+            return encode_protocol(parse_protocol(text))
+        except ValueError as err:
+            raise IrCodecError(str(err)) from err
+    try:
+        return None, [int(t) for t in text.replace(",", " ").split()]
+    except ValueError as err:
+        raise IrCodecError(f"Invalid IR timings: {err}") from err
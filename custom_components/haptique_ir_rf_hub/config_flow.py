@@ -6,19 +6,32 @@ import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components import network
+from homeassistant.components.zeroconf import ZeroconfServiceInfo
 from homeassistant.const import CONF_HOST, CONF_TOKEN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN
+from .const import (
+    CONF_CATALOG_INTERVAL,
+    CONF_KEEP_WARM,
+    CONF_STATUS_INTERVAL,
+    DEFAULT_CATALOG_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+    DOMAIN,
+)
+from .discovery import DiscoveredHub, async_probe, async_scan, subnet_hosts
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_SCAN = "scan"
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_HOST): str,
+        vol.Optional(CONF_HOST, default=""): str,
         vol.Optional(CONF_TOKEN, default=""): str,
+        vol.Optional(CONF_SCAN, default=False): bool,
     }
 )
 
@@ -61,30 +74,158 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._token = ""
+        self._discovered: DiscoveredHub | None = None
+        self._pick_schema: vol.Schema | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
-        errors: dict[str, str] = {}
-        
+        """Handle the initial step; without a host the network is scanned."""
         if user_input is not None:
-            try:
-                info = await validate_input(self.hass, user_input)
-            except Exception as err:
-                _LOGGER.error("Validation failed: %s", err)
-                errors["base"] = "cannot_connect"
-            else:
-                # Create unique ID from host
-                await self.async_set_unique_id(user_input[CONF_HOST])
-                self._abort_if_unique_id_configured()
-                
-                return self.async_create_entry(
-                    title=info["title"],
-                    data=user_input,
-                )
+            if user_input.get(CONF_SCAN) or not user_input.get(CONF_HOST):
+                self._token = user_input.get(CONF_TOKEN, "")
+                return await self.async_step_pick()
+            return await self._async_create_or_error(user_input, "user", STEP_USER_DATA_SCHEMA)
 
         return self.async_show_form(
             step_id="user",
             data_schema=STEP_USER_DATA_SCHEMA,
-            errors=errors,
         )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan the local networks and let the user pick a hub."""
+        if user_input is not None:
+            return await self._async_create_or_error(user_input, "pick", self._pick_schema)
+
+        configured = {entry.data[CONF_HOST] for entry in self._async_current_entries()}
+        hubs = [
+            hub
+            for hub in await async_scan(
+                async_get_clientsession(self.hass), await self._async_scan_hosts(), self._token
+            )
+            if hub.host not in configured
+        ]
+        if not hubs:
+            return self.async_show_form(
+                step_id="user",
+                data_schema=STEP_USER_DATA_SCHEMA,
+                errors={"base": "no_devices_found"},
+            )
+
+        self._pick_schema = vol.Schema(
+            {
+                vol.Required(CONF_HOST): vol.In({hub.host: hub.label for hub in hubs}),
+                vol.Optional(CONF_TOKEN, default=self._token): str,
+            }
+        )
+        return self.async_show_form(step_id="pick", data_schema=self._pick_schema)
+
+    async def async_step_zeroconf(
+        self, discovery_info: ZeroconfServiceInfo
+    ) -> FlowResult:
+        """Handle a hub announced over mDNS."""
+        host = discovery_info.host
+        if discovery_info.port and discovery_info.port != 80:
+            host = f"{host}:{discovery_info.port}"
+
+        await self.async_set_unique_id(host)
+        self._abort_if_unique_id_configured()
+
+        hub = await async_probe(async_get_clientsession(self.hass), host)
+        if hub is None:
+            return self.async_abort(reason="not_haptique_device")
+
+        self._discovered = hub
+        self.context["title_placeholders"] = {"name": hub.hostname or host}
+        return await self.async_step_zeroconf_confirm()
+
+    async def async_step_zeroconf_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for the token of a discovered hub."""
+        schema = vol.Schema({vol.Optional(CONF_TOKEN, default=""): str})
+        if user_input is not None:
+            return await self._async_create_or_error(
+                {CONF_HOST: self._discovered.host, **user_input}, "zeroconf_confirm", schema
+            )
+
+        return self.async_show_form(
+            step_id="zeroconf_confirm",
+            data_schema=schema,
+            description_placeholders={"name": self._discovered.label},
+        )
+
+    async def _async_create_or_error(
+        self, user_input: dict[str, Any], step_id: str, schema: vol.Schema
+    ) -> FlowResult:
+        """Validate a host and token, then create the entry or show the error."""
+        data = {CONF_HOST: user_input[CONF_HOST], CONF_TOKEN: user_input.get(CONF_TOKEN, "")}
+        try:
+            info = await validate_input(self.hass, data)
+        except Exception as err:
+            _LOGGER.error("Validation failed: %s", err)
+            return self.async_show_form(
+                step_id=step_id, data_schema=schema, errors={"base": "cannot_connect"}
+            )
+
+        # Create unique ID from host
+        await self.async_set_unique_id(data[CONF_HOST])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=info["title"], data=data)
+
+    async def _async_scan_hosts(self) -> list[str]:
+        """Return the addresses of the /24 around each of Home Assistant's IPv4 addresses."""
+        hosts: list[str] = []
+        for adapter in await network.async_get_adapters(self.hass):
+            if not adapter["enabled"]:
+                continue
+            for address in adapter["ipv4"]:
+                hosts += subnet_hosts(address["address"], address["network_prefix"])
+        return list(dict.fromkeys(hosts))
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle polling options for Haptique IR/RF hub."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling intervals."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_STATUS_INTERVAL,
+                    default=options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+                vol.Optional(
+                    CONF_CATALOG_INTERVAL,
+                    default=options.get(CONF_CATALOG_INTERVAL, DEFAULT_CATALOG_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Optional(
+                    CONF_KEEP_WARM, default=options.get(CONF_KEEP_WARM, False)
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=schema)
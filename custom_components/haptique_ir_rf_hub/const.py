@@ -9,3 +9,96 @@ DEFAULT_PORT = 80
 # Device info
 MANUFACTURER = "KINCONY"
 MODEL = "KC868-AG"
+
+# Default repeat count for RF sends
+DEFAULT_RF_REPEAT = 8
+
+# Options
+CONF_STATUS_INTERVAL = "status_interval"
+CONF_CATALOG_INTERVAL = "catalog_interval"
+CONF_KEEP_WARM = "keep_warm"
+
+# Polling (seconds)
+DEFAULT_STATUS_INTERVAL = 30
+DEFAULT_CATALOG_INTERVAL = 600
+
+# Delay before the last good coordinator data is written to storage (seconds)
+SNAPSHOT_SAVE_DELAY = 60
+
+# Adaptive polling (seconds)
+BOOST_INTERVAL = 5
+BOOST_DURATION = 60
+MAX_BACKOFF_INTERVAL = 600
+MAX_CONCURRENT_POLLS = 4
+DATA_POLL_SCHEDULER = f"{DOMAIN}_poll_scheduler"
+
+# Duplicate command analysis: maximum normalized timing distance
+SIMILARITY_THRESHOLD = 0.08
+DATA_SIMILARITY_INDEX = f"{DOMAIN}_similarity_index"
+
+# Seconds learn_ir / learn_rf wait for a new signal by default
+LEARN_TIMEOUT = 15
+
+# Hold-to-repeat: default cadence (ms) and safety stop (sends)
+DEFAULT_REPEAT_INTERVAL = 100
+DEFAULT_REPEAT_MAX_COUNT = 50
+
+# Library backup/restore: file chunk size (bytes) and hubs restored at once
+BACKUP_CHUNK_SIZE = 64 * 1024
+RESTORE_CONCURRENCY = 4
+EVENT_LIBRARY_PROGRESS = f"{DOMAIN}_library_progress"
+
+# Subnet discovery
+SCAN_CONCURRENCY = 128
+SCAN_TIMEOUT = 1.0
+
+# Hub connections (the firmware serves few sockets at once)
+HUB_CONNECTION_LIMIT = 2
+HUB_KEEPALIVE_TIMEOUT = 60
+DNS_CACHE_TTL = 300
+KEEP_WARM_INTERVAL = 10
+
+# Coordinator refreshes kept for diagnostics
+REFRESH_HISTORY_SIZE = 10
+
+# Profiling service: longest capture (seconds)
+MAX_PROFILE_SECONDS = 60
+DATA_PROFILE_LOCK = f"{DOMAIN}_profile_lock"
+
+# Identical reads within this many seconds share one request
+READ_FRESHNESS = 0.2
+# Requests that change what the hub reports; they discard cached reads
+STATE_CHANGING_ENDPOINTS = frozenset(
+    {
+        "/api/ir/save",
+        "/api/ir/delete",
+        "/api/rf/save",
+        "/api/rf/delete",
+        "/api/hostname",
+        "/api/wifi/save",
+        "/api/wifi/forget",
+        "/api/ap/disable",
+    }
+)
+
+# Request timeouts (seconds)
+TIMEOUT_SEND = 4
+TIMEOUT_POLL = 5
+TIMEOUT_MUTATION = 10
+
+# Circuit breaker
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30
+
+# Transmit scheduling (lower value runs first)
+PRIORITY_USER = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BACKGROUND = 2
+DEFAULT_QUEUE_DEPTH = 16
+
+# Dispatcher signals (formatted with the config entry id)
+SIGNAL_MACROS_UPDATED = f"{DOMAIN}_macros_updated_{{}}"
+SIGNAL_QUEUE_UPDATED = f"{DOMAIN}_queue_updated_{{}}"
+
+# Minimum seconds between transmit queue sensor updates
+QUEUE_SENSOR_THROTTLE = 1.0
@@ -0,0 +1,55 @@
+"""Diagnostics support for Haptique IR/RF hub."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_TOKEN, "unique_id", "mac", "sta_ssid", "ssid"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {"entry": async_redact_data(entry.as_dict(), TO_REDACT)}
+    hub = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if hub is None:
+        return diagnostics
+
+    api = hub["api"]
+    coordinator = hub["coordinator"]
+    data = coordinator.data or {}
+    diagnostics.update(
+        {
+            "coordinator": {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": coordinator.update_interval.total_seconds(),
+                "stale_sections": sorted(
+                    section for section in data if coordinator.is_stale(section)
+                ),
+                "refreshes": list(coordinator.refresh_history),
+            },
+            "status": async_redact_data(data.get("status", {}), TO_REDACT),
+            "rf_status": data.get("rf_status", {}),
+            "saved": {
+                "ir": len(data.get("ir_saved", [])),
+                "rf": len(data.get("rf_saved", [])),
+                "sequences": len(hub["macros"].macros),
+                "catalog_synced": api.catalog.synced if api.catalog else None,
+            },
+            "breaker": {"state": api.breaker.state, "failures": api.breaker.failures},
+            "scheduler": {
+                "depth": api.scheduler.depth,
+                "last_wait_ms": round(api.scheduler.last_wait * 1000, 1),
+                "avg_wait_ms": round(api.scheduler.avg_wait * 1000, 1),
+            },
+            "repeating": api.repeating,
+            "metrics": api.metrics.summary(),
+            "requests": api.metrics.trace_entries(),
+        }
+    )
+    return diagnostics
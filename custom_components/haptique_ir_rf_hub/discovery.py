@@ -0,0 +1,117 @@
+"""LAN discovery of Haptique IR/RF hubs."""
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+import logging
+
+import aiohttp
+
+from .const import SCAN_CONCURRENCY, SCAN_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+# /api/status keys that identify the hub firmware
+_STATUS_KEYS = ("fw_ver", "sta_ip", "rf_tx", "wifi_status")
+
+
+class DiscoveredHub:
+    """A hub that answered a discovery probe."""
+
+    __slots__ = ("host", "hostname", "mac", "version", "auth_required")
+
+    def __init__(
+        self,
+        host: str,
+        hostname: str | None = None,
+        mac: str | None = None,
+        version: str | None = None,
+        auth_required: bool = False,
+    ) -> None:
+        """Initialize the hub."""
+        self.host = host
+        self.hostname = hostname
+        self.mac = mac
+        self.version = version
+        self.auth_required = auth_required
+
+    @property
+    def key(self) -> str:
+        """Return the identity used to merge answers from the same device."""
+        return (self.mac or "").lower() or self.hostname or self.host
+
+    @property
+    def label(self) -> str:
+        """Return a description for the pick list."""
+        label = f"{self.hostname} ({self.host})" if self.hostname else self.host
+        return f"{label} - token required" if self.auth_required else label
+
+
+async def async_probe(
+    session: aiohttp.ClientSession,
+    host: str,
+    token: str = "",
+    timeout: float = SCAN_TIMEOUT,
+) -> DiscoveredHub | None:
+    """Return the hub at ``host``, or None if it is not a Haptique hub."""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    try:
+        async with session.get(
+            f"http://{host}/api/status",
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            if resp.status == 401:
+                # Only trust a 401 that comes as the firmware's JSON error
+                body = await resp.json(content_type=None)
+                if isinstance(body, dict) and "error" in body:
+                    return DiscoveredHub(host, auth_required=True)
+                return None
+            if resp.status != 200:
+                return None
+            status = await resp.json(content_type=None)
+    except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+        return None
+
+    if not isinstance(status, dict) or not any(key in status for key in _STATUS_KEYS):
+        return None
+    return DiscoveredHub(
+        host,
+        hostname=status.get("hostname") or status.get("instance"),
+        mac=status.get("mac"),
+        version=status.get("fw_ver") or status.get("version"),
+    )
+
+
+async def async_scan(
+    session: aiohttp.ClientSession,
+    hosts: Iterable[str],
+    token: str = "",
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_TIMEOUT,
+) -> list[DiscoveredHub]:
+    """Probe ``hosts`` with at most ``concurrency`` requests in flight.
+
+    Devices answering on several addresses are reported once, preferring an
+    answer that carries device details.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> DiscoveredHub | None:
+        async with semaphore:
+            return await async_probe(session, host, token, timeout)
+
+    found: dict[str, DiscoveredHub] = {}
+    for hub in await asyncio.gather(*(probe(host) for host in hosts)):
+        if hub is None:
+            continue
+        known = found.get(hub.key)
+        if known is None or (known.auth_required and not hub.auth_required):
+            found[hub.key] = hub
+    _LOGGER.debug("Discovery found %d hub(s)", len(found))
+    return sorted(found.values(), key=lambda hub: hub.label)
+
+
+def subnet_hosts(address: str, prefix: int) -> list[str]:
+    """Return the hosts of the /24 (or smaller) network around ``address``."""
+    network = ipaddress.ip_network(f"{address}/{max(prefix, 24)}", strict=False)
+    return [str(host) for host in network.hosts() if str(host) != address]
@@ -0,0 +1,26 @@
+"""Base entity for Haptique IR/RF hub."""
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class HaptiqueEntity(CoordinatorEntity):
+    """Coordinator entity that flags data the hub has not confirmed yet.
+
+    Data restored from the startup snapshot, or invalidated by a write, is
+    stale until it is fetched again; entities report this as a ``stale``
+    attribute.
+    """
+
+    # Coordinator data sections the entity's state comes from
+    _sections: frozenset[str] | None = frozenset()
+
+    @property
+    def stale(self) -> bool:
+        """Return True while any of the entity's sections is stale."""
+        return any(self.coordinator.is_stale(section) for section in self._sections or ())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether the state is stale."""
+        return {"stale": self.stale}
@@ -0,0 +1,117 @@
+"""Request metrics for Haptique IR/RF hub."""
+from collections import deque
+from datetime import datetime
+import time
+from typing import Any
+
+# Latency samples kept per endpoint (and overall) for percentiles
+WINDOW = 200
+
+# Requests kept in the trace for diagnostics
+TRACE_SIZE = 100
+
+
+def _percentiles(samples) -> dict[str, float | None]:
+    """Return p50/p95/p99 of ``samples`` in milliseconds."""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        name: round(ordered[min(last, int(q * len(ordered)))] * 1000, 1)
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+    }
+
+
+class EndpointStats:
+    """Counters and recent latencies for one endpoint."""
+
+    __slots__ = ("requests", "errors", "timeouts", "last_rtt", "latencies")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.last_rtt: float | None = None
+        self.latencies: deque[float] = deque(maxlen=WINDOW)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats with latencies in milliseconds."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "last_ms": round(self.last_rtt * 1000, 1) if self.last_rtt is not None else None,
+            **_percentiles(self.latencies),
+        }
+
+
+class HaptiqueRequestMetrics:
+    """Per-endpoint request counts, failures and latency percentiles.
+
+    Percentiles cover the last ``WINDOW`` requests so they follow tuning
+    changes; counters are totals since setup. Only successful requests
+    contribute latency samples.
+
+    The last ``TRACE_SIZE`` requests are also kept as raw tuples in a ring
+    buffer; they are only formatted when diagnostics are downloaded.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.total = EndpointStats()
+        self.trace: deque[tuple] = deque(maxlen=TRACE_SIZE)
+
+    def record(
+        self,
+        endpoint: str,
+        elapsed: float,
+        outcome: str = "ok",
+        method: str = "GET",
+        status: int | None = None,
+        size: int | None = None,
+        queue_wait: float | None = None,
+    ) -> None:
+        """Record one request; ``outcome`` is ``ok``, ``error`` or ``timeout``."""
+        self.trace.append(
+            (time.time(), method, endpoint, outcome, status, size, elapsed, queue_wait)
+        )
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        for target in (stats, self.total):
+            target.requests += 1
+            if outcome == "ok":
+                target.last_rtt = elapsed
+                target.latencies.append(elapsed)
+            elif outcome == "timeout":
+                target.timeouts += 1
+            else:
+                target.errors += 1
+
+    def trace_entries(self) -> list[dict[str, Any]]:
+        """Return the traced requests, oldest first, with times in milliseconds."""
+        return [
+            {
+                "time": datetime.fromtimestamp(at).isoformat(timespec="milliseconds"),
+                "method": method,
+                "endpoint": endpoint,
+                "outcome": outcome,
+                "status": status,
+                "bytes": size,
+                "latency_ms": round(elapsed * 1000, 1),
+                "queue_wait_ms": round(wait * 1000, 1) if wait is not None else None,
+            }
+            for at, method, endpoint, outcome, status, size, elapsed, wait in self.trace
+        ]
+
+    def summary(self) -> dict[str, Any]:
+        """Return overall and per-endpoint stats."""
+        return {
+            **self.total.as_dict(),
+            "endpoints": {
+                endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()
+            },
+        }
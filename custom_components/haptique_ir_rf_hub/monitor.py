@@ -0,0 +1,134 @@
+"""Shared IR/RF receive monitors for Haptique IR/RF hub."""
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import async_timeout
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+_LOGGER = logging.getLogger(__name__)
+
+# Poll intervals (seconds)
+ACTIVE_INTERVAL = 0.25
+IDLE_INTERVAL = 0.5
+QUIET_INTERVAL = 1.0
+MAX_ERROR_INTERVAL = 5.0
+
+# How long to keep polling fast after a new code, and when to slow down
+ACTIVE_WINDOW = 10
+QUIET_AFTER = 60
+
+
+class HaptiqueCaptureMonitor:
+    """Poll ``/api/rf/last`` or ``/api/ir/last`` once per hub and fan results out.
+
+    Polling only runs while at least one subscriber is attached. It speeds
+    up right after a capture arrives, slows down when nothing has been
+    received for a while and backs off while the hub is unreachable.
+    """
+
+    def __init__(self, hass: HomeAssistant, api, kind: str = "rf") -> None:
+        """Initialize the monitor for ``kind`` ("rf" or "ir") captures."""
+        self._hass = hass
+        self._api = api
+        self._kind = kind
+        self._fetch = api.get_rf_last if kind == "rf" else api.get_ir_last
+        self._subscribers: set[Callable[[dict[str, Any]], None]] = set()
+        self._task: asyncio.Task | None = None
+        self.last: dict[str, Any] | None = None
+
+    @callback
+    def async_subscribe(self, update: Callable[[dict[str, Any]], None]) -> CALLBACK_TYPE:
+        """Receive every new RF capture until the returned callback is called."""
+        self._subscribers.add(update)
+        if self.last is not None:
+            update(self.last)
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"haptique_{self._kind}_monitor_{self._api.host}"
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            self._subscribers.discard(update)
+            if not self._subscribers:
+                self.async_stop()
+
+        return unsubscribe
+
+    async def async_next_capture(self, timeout: float) -> dict[str, Any]:
+        """Return the first capture that differs from the hub's current one.
+
+        Raises HomeAssistantError if nothing new arrives within ``timeout``
+        seconds.
+        """
+        baseline = await self._fetch()
+        # New subscribers are first called with the last capture; publish the
+        # baseline so an older one is not taken for a new signal
+        self._async_publish(baseline)
+        future: asyncio.Future[dict[str, Any]] = self._hass.loop.create_future()
+
+        @callback
+        def update(capture: dict[str, Any]) -> None:
+            if capture != baseline and not future.done():
+                future.set_result(capture)
+
+        unsubscribe = self.async_subscribe(update)
+        try:
+            async with async_timeout.timeout(timeout):
+                return await future
+        except asyncio.TimeoutError as err:
+            raise HomeAssistantError(
+                f"No new {self._kind.upper()} signal within {timeout:.0f} s"
+            ) from err
+        finally:
+            unsubscribe()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @callback
+    def _async_publish(self, data: dict[str, Any]) -> bool:
+        """Pass a changed capture to the subscribers; return True if it changed."""
+        if data == self.last:
+            return False
+        self.last = data
+        for update in list(self._subscribers):
+            update(data)
+        return True
+
+    async def _async_run(self) -> None:
+        """Poll while anyone is listening."""
+        last_change = time.monotonic()
+        interval = IDLE_INTERVAL
+        while self._subscribers:
+            try:
+                data = await self._fetch()
+            except UpdateFailed as err:
+                interval = min(max(interval, IDLE_INTERVAL) * 2, MAX_ERROR_INTERVAL)
+                _LOGGER.debug(
+                    "%s monitor for %s failed: %s", self._kind.upper(), self._api.host, err
+                )
+            else:
+                now = time.monotonic()
+                if self._async_publish(data):
+                    last_change = now
+                idle = now - last_change
+                if idle < ACTIVE_WINDOW:
+                    interval = ACTIVE_INTERVAL
+                elif idle < QUIET_AFTER:
+                    interval = IDLE_INTERVAL
+                else:
+                    interval = QUIET_INTERVAL
+            await asyncio.sleep(interval)
+        self._task = None
@@ -0,0 +1,55 @@
+"""Poll scheduling shared by all Haptique IR/RF hubs."""
+import asyncio
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_POLL_SCHEDULER, MAX_CONCURRENT_POLLS
+
+
+class HaptiquePollScheduler:
+    """Spread hub polls evenly over the poll interval and cap concurrency.
+
+    Every coordinator gets a phase (its index divided by the number of
+    hubs). Healthy coordinators schedule their next poll so it lands on that
+    phase, so a dozen hubs polled every 30 s fire 2.5 s apart instead of
+    together. ``semaphore`` bounds how many hubs are polled at once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        self._members: list[object] = []
+
+    @callback
+    def async_register(self, coordinator: object) -> CALLBACK_TYPE:
+        """Add a coordinator, returning a callback that removes it."""
+        self._members.append(coordinator)
+
+        @callback
+        def unregister() -> None:
+            if coordinator in self._members:
+                self._members.remove(coordinator)
+
+        return unregister
+
+    def next_delay(self, coordinator: object, interval: float) -> float:
+        """Return the delay that puts the next poll on the coordinator's phase.
+
+        The result stays within half an interval of ``interval``.
+        """
+        if coordinator not in self._members or len(self._members) < 2:
+            return interval
+        phase = self._members.index(coordinator) / len(self._members) * interval
+        delay = (phase - time.monotonic()) % interval
+        if delay < interval / 2:
+            delay += interval
+        return delay
+
+
+@callback
+def async_get_poll_scheduler(hass: HomeAssistant) -> HaptiquePollScheduler:
+    """Return the poll scheduler shared by all config entries."""
+    if DATA_POLL_SCHEDULER not in hass.data:
+        hass.data[DATA_POLL_SCHEDULER] = HaptiquePollScheduler()
+    return hass.data[DATA_POLL_SCHEDULER]
@@ -0,0 +1,74 @@
+"""Time-boxed profiling of the Haptique IR/RF hub integration."""
+import asyncio
+import cProfile
+import os
+import pstats
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DATA_PROFILE_LOCK
+
+_PACKAGE_DIR = os.path.dirname(__file__) + os.sep
+
+
+async def async_profile(hass: HomeAssistant, seconds: float, limit: int) -> dict[str, Any]:
+    """Profile the event loop for ``seconds`` and report this integration's share.
+
+    cProfile counts every resumption of a coroutine as a call, and its time
+    excludes the time spent awaiting. Functions outside the integration are
+    left out, as are other threads. Tasks running integration code when the
+    profile ends are listed with where they are waiting.
+    """
+    lock: asyncio.Lock = hass.data.setdefault(DATA_PROFILE_LOCK, asyncio.Lock())
+    if lock.locked():
+        raise HomeAssistantError("A profile is already being captured")
+
+    async with lock:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+
+    functions = [
+        {
+            "function": f"{os.path.relpath(filename, _PACKAGE_DIR)}:{line} {name}",
+            "calls": calls,
+            "own_ms": round(own * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in pstats.Stats(
+            profiler
+        ).stats.items()
+        if filename.startswith(_PACKAGE_DIR)
+    ]
+    functions.sort(key=lambda item: item["cumulative_ms"], reverse=True)
+
+    tasks = []
+    for task in asyncio.all_tasks():
+        location = _task_location(task)
+        if location is not None:
+            tasks.append({"task": task.get_name(), "awaiting_in": location})
+
+    return {"seconds": seconds, "functions": functions[:limit], "tasks": tasks}
+
+
+def _task_location(task: asyncio.Task) -> str | None:
+    """Return the innermost integration frame a task is suspended in, if any."""
+    location = None
+    coro = task.get_coro()
+    while coro is not None and hasattr(coro, "cr_frame"):
+        frame = coro.cr_frame
+        if frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+            location = (
+                f"{os.path.relpath(frame.f_code.co_filename, _PACKAGE_DIR)}:"
+                f"{frame.f_lineno} {frame.f_code.co_qualname}"
+            )
+        coro = coro.cr_await
+    return location
@@ -0,0 +1,326 @@
+"""Recognition and regeneration of common IR protocols.
+
+Raw captures of NEC, Samsung, Sony SIRC, RC5 and RC6 remotes are decoded
+to ``protocol:address:command`` codes such as ``nec:0x04:0x08``, and codes
+are turned back into clean timings for sending. Only the first frame of a
+capture is decoded; repeats and trailing gaps are ignored.
+
+Each decoder classifies every timing of the frame as a whole multiple of
+the protocol's base unit in one pass and then only compares small
+integers, so a capture that matches nothing is rejected after a few
+operations and a library of hundreds of commands decodes in milliseconds.
+"""
+
+# name: (carrier Hz, max address, max command)
+PROTOCOLS = {
+    "nec": (38000, 0xFFFF, 0xFF),
+    "samsung": (38000, 0xFFFF, 0xFF),
+    "sony12": (40000, 0x1F, 0x7F),
+    "sony15": (40000, 0xFF, 0x7F),
+    "sony20": (40000, 0x1FFF, 0x7F),
+    "rc5": (36000, 0x1F, 0x7F),
+    "rc6": (36000, 0xFF, 0xFF),
+}
+
+# A space longer than this ends a frame
+FRAME_GAP = 8000
+
+# Allowed deviation of a timing, as a fraction of the base unit
+UNIT_TOLERANCE = 0.4
+# Allowed deviation of a header timing, as a fraction of its length
+HEADER_TOLERANCE = 0.25
+
+_NEC_UNIT = 560
+_SONY_UNIT = 600
+_SONY_FRAME = 45000
+_RC5_UNIT = 889
+_RC6_UNIT = 444
+
+
+class IrProtocolCode:
+    """A command in a known IR protocol."""
+
+    __slots__ = ("protocol", "address", "command")
+
+    def __init__(self, protocol: str, address: int, command: int) -> None:
+        """Initialize the code."""
+        self.protocol = protocol
+        self.address = address
+        self.command = command
+
+    def __eq__(self, other: object) -> bool:
+        """Return True for the same protocol, address and command."""
+        return isinstance(other, IrProtocolCode) and str(self) == str(other)
+
+    def __hash__(self) -> int:
+        """Return a hash matching equality."""
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        """Return a debug representation."""
+        return f"IrProtocolCode({str(self)!r})"
+
+    def __str__(self) -> str:
+        """Return the ``protocol:address:command`` text form."""
+        width = 4 if self.address > 0xFF else 2
+        return f"{self.protocol}:0x{self.address:0{width}X}:0x{self.command:02X}"
+
+
+def parse_protocol(text: str) -> IrProtocolCode:
+    """Parse a ``protocol:address:command`` code; raise ValueError if invalid."""
+    try:
+        protocol, address_text, command_text = text.strip().lower().split(":")
+        address, command = int(address_text, 0), int(command_text, 0)
+    except ValueError as err:
+        raise ValueError(f"Invalid IR protocol code '{text}': {err}") from err
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unknown IR protocol '{protocol}'")
+    _, max_address, max_command = PROTOCOLS[protocol]
+    if not 0 <= address <= max_address or not 0 <= command <= max_command:
+        raise ValueError(
+            f"{protocol} takes addresses up to 0x{max_address:X} "
+            f"and commands up to 0x{max_command:X}"
+        )
+    return IrProtocolCode(protocol, address, command)
+
+
+def is_protocol_code(text: str) -> bool:
+    """Return True if ``text`` looks like a ``protocol:address:command`` code."""
+    return text.split(":", 1)[0].strip().lower() in PROTOCOLS
+
+
+def decode_protocol(timings) -> IrProtocolCode | None:
+    """Return the protocol code of a raw capture, or None if none matches."""
+    frame = first_frame(timings)
+    if len(frame) < 3:
+        return None
+    for decoder in _DECODERS:
+        if (code := decoder(frame)) is not None:
+            return code
+    return None
+
+
+def encode_protocol(code: IrProtocolCode) -> tuple[int, list[int]]:
+    """Return (carrier Hz, clean microsecond timings) for a protocol code."""
+    freq = PROTOCOLS[code.protocol][0]
+    if code.protocol in ("nec", "samsung"):
+        return freq, _encode_nec(code)
+    if code.protocol.startswith("sony"):
+        return freq, _encode_sony(code)
+    if code.protocol == "rc5":
+        return freq, _encode_rc5(code)
+    return freq, _encode_rc6(code)
+
+
+def first_frame(timings) -> list[int]:
+    """Return the timings up to the first inter-frame gap."""
+    for index in range(1, len(timings), 2):
+        if timings[index] > FRAME_GAP:
+            return list(timings[:index])
+    return list(timings)
+
+
+def _units(timings, unit: int) -> list[int] | None:
+    """Return each timing as a multiple of ``unit``, or None if one is off."""
+    units = [round(t / unit) for t in timings]
+    limit = UNIT_TOLERANCE * unit
+    for t, n in zip(timings, units):
+        if n < 1 or abs(t - n * unit) > limit:
+            return None
+    return units
+
+
+def _near(value: int, expected: int) -> bool:
+    """Return True if a header timing is within tolerance."""
+    return abs(value - expected) <= HEADER_TOLERANCE * expected
+
+
+def _lsb_first(bits: list[int]) -> int:
+    """Return the integer of bits sent least significant first."""
+    return sum(bit << index for index, bit in enumerate(bits))
+
+
+def _msb_first(bits: list[int]) -> int:
+    """Return the integer of bits sent most significant first."""
+    value = 0
+    for bit in bits:
+        value = value << 1 | bit
+    return value
+
+
+def _bits_lsb(value: int, count: int) -> list[int]:
+    """Return ``count`` bits of ``value``, least significant first."""
+    return [value >> index & 1 for index in range(count)]
+
+
+def _bits_msb(value: int, count: int) -> list[int]:
+    """Return ``count`` bits of ``value``, most significant first."""
+    return [value >> index & 1 for index in reversed(range(count))]
+
+
+def _runs(levels: list[bool], unit: int) -> list[int]:
+    """Merge per-unit mark/space levels into timings starting with a mark."""
+    timings: list[int] = []
+    current = None
+    for level in levels:
+        if level == current:
+            timings[-1] += unit
+        elif timings or level:
+            timings.append(unit)
+            current = level
+    if timings and not current:
+        timings.pop()
+    return timings
+
+
+# NEC and Samsung: pulse distance, 32 bits, header 9000/4500 or 4500/4500
+
+
+def _decode_nec(frame: list[int]) -> IrProtocolCode | None:
+    """Decode an NEC (or extended NEC) or Samsung frame."""
+    if len(frame) != 67 or not _near(frame[1], 4500):
+        return None
+    if _near(frame[0], 9000):
+        protocol = "nec"
+    elif _near(frame[0], 4500):
+        protocol = "samsung"
+    else:
+        return None
+    units = _units(frame[2:], _NEC_UNIT)
+    if units is None or any(mark != 1 for mark in units[::2]):
+        return None
+    if any(space not in (1, 3) for space in units[1::2]):
+        return None
+    value = _lsb_first([space == 3 for space in units[1::2]])
+    low, high, command, inverse = (value >> shift & 0xFF for shift in (0, 8, 16, 24))
+    if command ^ inverse != 0xFF:
+        return None
+    standard = high == (low ^ 0xFF if protocol == "nec" else low)
+    return IrProtocolCode(protocol, low if standard else high << 8 | low, command)
+
+
+def _encode_nec(code: IrProtocolCode) -> list[int]:
+    """Return an NEC or Samsung frame."""
+    low = code.address & 0xFF
+    if code.address > 0xFF:
+        high = code.address >> 8
+    else:
+        high = low ^ 0xFF if code.protocol == "nec" else low
+    value = low | high << 8 | code.command << 16 | (code.command ^ 0xFF) << 24
+    timings = [9000 if code.protocol == "nec" else 4500, 4500]
+    for bit in _bits_lsb(value, 32):
+        timings += [_NEC_UNIT, 3 * _NEC_UNIT if bit else _NEC_UNIT]
+    return timings + [_NEC_UNIT]
+
+
+# Sony SIRC: pulse width, 12/15/20 bits, 7 bit command first
+
+
+def _decode_sony(frame: list[int]) -> IrProtocolCode | None:
+    """Decode a Sony SIRC frame."""
+    if not _near(frame[0], 2400) or not _near(frame[1], _SONY_UNIT):
+        return None
+    bits = (len(frame) - 1) // 2
+    if bits not in (12, 15, 20) or len(frame) != 2 * bits + 1:
+        return None
+    units = _units(frame[2:], _SONY_UNIT)
+    if units is None or any(space != 1 for space in units[1::2]):
+        return None
+    if any(mark not in (1, 2) for mark in units[::2]):
+        return None
+    value = _lsb_first([mark == 2 for mark in units[::2]])
+    return IrProtocolCode(f"sony{bits}", value >> 7, value & 0x7F)
+
+
+def _encode_sony(code: IrProtocolCode) -> list[int]:
+    """Return the three frames a Sony receiver expects."""
+    bits = int(code.protocol[4:])
+    frame = [4 * _SONY_UNIT, _SONY_UNIT]
+    for bit in _bits_lsb(code.command | code.address << 7, bits):
+        frame += [2 * _SONY_UNIT if bit else _SONY_UNIT, _SONY_UNIT]
+    frame.pop()
+    gap = _SONY_FRAME - sum(frame)
+    return frame + [gap] + frame + [gap] + frame
+
+
+# RC5: Manchester, 14 bits, a 1 is space then mark
+
+
+def _decode_rc5(frame: list[int]) -> IrProtocolCode | None:
+    """Decode a Philips RC5 (or RC5X) frame."""
+    if len(frame) > 27:
+        return None
+    units = _units(frame, _RC5_UNIT)
+    if units is None or max(units) > 2:
+        return None
+    # The start bit is a 1, whose leading space is lost in the idle line
+    levels = [False]
+    for index, n in enumerate(units):
+        levels += [index % 2 == 0] * n
+    levels += [False] * (28 - len(levels))
+    if len(levels) != 28:
+        return None
+    bits = []
+    for first, second in zip(levels[::2], levels[1::2]):
+        if first == second:
+            return None
+        bits.append(int(second))
+    # bits: start, field (inverted command bit 6), toggle, 5 address, 6 command
+    command = _msb_first(bits[8:]) | (not bits[1]) << 6
+    return IrProtocolCode("rc5", _msb_first(bits[3:8]), command)
+
+
+def _encode_rc5(code: IrProtocolCode) -> list[int]:
+    """Return an RC5 frame with the toggle bit cleared."""
+    bits = [1, int(code.command < 0x40), 0]
+    bits += _bits_msb(code.address, 5) + _bits_msb(code.command & 0x3F, 6)
+    levels = []
+    for bit in bits:
+        levels += [not bit, bool(bit)]
+    return _runs(levels, _RC5_UNIT)
+
+
+# RC6 mode 0: leader 6t/2t, Manchester, a 1 is mark then space, double width toggle
+
+
+def _decode_rc6(frame: list[int]) -> IrProtocolCode | None:
+    """Decode a Philips RC6 mode 0 frame."""
+    if not _near(frame[0], 6 * _RC6_UNIT) or not _near(frame[1], 2 * _RC6_UNIT):
+        return None
+    if len(frame) > 46:
+        return None
+    units = _units(frame[2:], _RC6_UNIT)
+    if units is None or max(units) > 3:
+        return None
+    levels = []
+    for index, n in enumerate(units):
+        levels += [index % 2 == 0] * n
+    levels += [False] * (44 - len(levels))
+    if len(levels) != 44:
+        return None
+    # Start bit and mode 000: units 0-7; toggle: units 8-11, two units per half
+    header = levels[:8]
+    if header != [True, False, False, True, False, True, False, True]:
+        return None
+    if levels[8] != levels[9] or levels[10] != levels[11] or levels[9] == levels[10]:
+        return None
+    bits = []
+    for first, second in zip(levels[12::2], levels[13::2]):
+        if first == second:
+            return None
+        bits.append(int(first))
+    return IrProtocolCode("rc6", _msb_first(bits[:8]), _msb_first(bits[8:]))
+
+
+def _encode_rc6(code: IrProtocolCode) -> list[int]:
+    """Return an RC6 mode 0 frame with the toggle bit cleared."""
+    levels = [True] * 6 + [False] * 2
+    for bit in [1, 0, 0, 0]:
+        levels += [bool(bit), not bit]
+    levels += [False, False, True, True]
+    for bit in _bits_msb(code.address, 8) + _bits_msb(code.command, 8):
+        levels += [bool(bit), not bit]
+    return _runs(levels, _RC6_UNIT)
+
+
+_DECODERS = (_decode_nec, _decode_sony, _decode_rc6, _decode_rc5)
@@ -0,0 +1,178 @@
+"""Authenticated proxy from Home Assistant to the Haptique IR/RF hub API."""
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components.http import KEY_HASS_USER, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, Unauthorized
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DOMAIN, PRIORITY_USER
+
+# Reads answered from coordinator data: endpoint -> (section, wrapped in "commands")
+CACHED_READS = {
+    "/api/status": ("status", False),
+    "/api/rf/status": ("rf_status", False),
+    "/api/rf/saved": ("rf_saved", True),
+    "/api/ir/saved": ("ir_saved", True),
+}
+
+# Mutations and the coordinator section they make stale
+MUTATIONS = {
+    "/api/ir/save": "ir_saved",
+    "/api/ir/delete": "ir_saved",
+    "/api/rf/save": "rf_saved",
+    "/api/rf/delete": "rf_saved",
+    "/api/hostname": "status",
+    "/api/wifi/save": "status",
+    "/api/wifi/forget": "status",
+}
+
+# Mutations whose body names a saved command
+NAMED = frozenset({"/api/ir/save", "/api/ir/delete", "/api/rf/save", "/api/rf/delete"})
+
+# Transmits, queued with the integration's own sends
+TRANSMITS = ("/api/ir/send", "/api/ir/send/name", "/api/rf/send", "/api/rf/send/name")
+
+# GETs any logged-in user may make
+READS = frozenset(
+    {
+        *CACHED_READS,
+        "/api/ir/last",
+        "/api/rf/last",
+        "/api/hostname",
+        "/api/wifi/status",
+        "/api/ota/status",
+    }
+)
+
+# Every endpoint the web UI uses; all but the reads above need an admin
+ALLOWED = frozenset(
+    {
+        *READS,
+        *MUTATIONS,
+        *TRANSMITS,
+        "/api/ir/test",
+        "/api/wifi/scan",
+        "/api/ota/check",
+    }
+)
+
+
+@callback
+def async_setup_proxy(hass: HomeAssistant) -> None:
+    """Register the proxy view."""
+    hass.http.register_view(HaptiqueProxyView(hass))
+
+
+class HaptiqueProxyView(HomeAssistantView):
+    """Proxy ``/api/haptique_ir_rf_hub/proxy/<host>/api/...`` to a configured hub.
+
+    Status and saved-list reads are served from the coordinator, so the web
+    UI adds no load on the hub. A mutation marks the section it affects as
+    stale; the next read of that section goes to the hub and updates the
+    coordinator for every entity. Everything else is forwarded over the
+    integration's session with its stored token.
+
+    Only the endpoints the web UI uses are proxied, and only admins may do
+    more than read status, captures and saved lists.
+    """
+
+    url = f"/api/{DOMAIN}/proxy/{{host}}/{{endpoint:api/.+}}"
+    name = f"api:{DOMAIN}:proxy"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, host: str, endpoint: str) -> web.Response:
+        """Serve a read."""
+        return await self._handle(request, host, f"/{endpoint}")
+
+    async def post(self, request: web.Request, host: str, endpoint: str) -> web.Response:
+        """Forward a POST."""
+        return await self._handle(request, host, f"/{endpoint}")
+
+    async def delete(self, request: web.Request, host: str, endpoint: str) -> web.Response:
+        """Forward a DELETE."""
+        return await self._handle(request, host, f"/{endpoint}")
+
+    async def _handle(self, request: web.Request, host: str, endpoint: str) -> web.Response:
+        """Answer one proxied request."""
+        if endpoint not in ALLOWED:
+            return self.json({"error": f"{endpoint} is not proxied"}, HTTPStatus.NOT_FOUND)
+        if not (request.method == "GET" and endpoint in READS):
+            if not request[KEY_HASS_USER].is_admin:
+                raise Unauthorized()
+
+        hub = next(
+            (
+                data
+                for data in self.hass.data.get(DOMAIN, {}).values()
+                if data["api"].host == host
+            ),
+            None,
+        )
+        if hub is None:
+            return self.json({"error": f"No hub configured for {host}"}, HTTPStatus.NOT_FOUND)
+
+        try:
+            payload = await request.json() if request.can_read_body else None
+        except ValueError:
+            return self.json({"error": "Invalid JSON"}, HTTPStatus.BAD_REQUEST)
+        if endpoint in NAMED and not (
+            isinstance(payload, dict) and isinstance(payload.get("name"), str) and payload["name"]
+        ):
+            return self.json_message(
+                f"{endpoint} needs a non-empty command name", HTTPStatus.BAD_REQUEST
+            )
+
+        try:
+            result = await self._async_call(hub, request.method, endpoint, payload, request.query)
+        except HomeAssistantError as err:
+            return self.json({"error": str(err)}, HTTPStatus.BAD_REQUEST)
+        except UpdateFailed as err:
+            return self.json({"error": str(err)}, HTTPStatus.BAD_GATEWAY)
+        return self.json(result)
+
+    async def _async_call(
+        self,
+        hub: dict[str, Any],
+        method: str,
+        endpoint: str,
+        payload: dict | None,
+        query,
+    ) -> Any:
+        """Run the request against the coordinator or the hub."""
+        api = hub["api"]
+        coordinator = hub["coordinator"]
+
+        if method == "GET" and endpoint in CACHED_READS:
+            section, wrapped = CACHED_READS[endpoint]
+            if not coordinator.last_update_success or coordinator.is_stale(section):
+                value = await api.request("GET", endpoint)
+                if wrapped:
+                    value = value.get("commands", [])
+                coordinator.async_set_section(section, value)
+            else:
+                value = coordinator.data[section]
+            return {"commands": value} if wrapped else value
+
+        if method == "POST" and endpoint in TRANSMITS:
+            return await api.transmit(endpoint, payload or {}, PRIORITY_USER)
+
+        if endpoint == "/api/ir/save":
+            result = await api.save_ir_command(payload["name"], payload.get("frame", "B"))
+        elif endpoint == "/api/ir/delete":
+            result = await api.delete_ir_command(payload["name"])
+        elif endpoint == "/api/rf/delete":
+            result = await api.delete_rf_command(payload["name"])
+        else:
+            result = await api.request(method, endpoint, payload, query)
+
+        if (section := MUTATIONS.get(endpoint)) is not None:
+            coordinator.async_invalidate(section)
+            coordinator.async_boost()
+            self.hass.async_create_task(coordinator.async_request_refresh())
+        return result
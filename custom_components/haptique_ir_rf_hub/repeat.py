@@ -0,0 +1,123 @@
+"""Hold-to-repeat transmit sessions for Haptique IR/RF hub."""
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HaptiqueRepeatSession:
+    """Repeat one prepared transmit job at a fixed cadence until stopped.
+
+    Repetitions are timed against absolute deadlines on the loop clock, so
+    a slow send delays the next one without shifting the rest; slots missed
+    entirely are skipped rather than sent in a burst. The session ends after
+    ``max_count`` sends, on the first failed send, or when cancelled.
+    """
+
+    __slots__ = (
+        "kind",
+        "name",
+        "interval",
+        "max_count",
+        "sent",
+        "skipped",
+        "reason",
+        "on_done",
+        "_send",
+        "_started",
+        "_task",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        send: Callable[[], Awaitable[Any]],
+        interval: float,
+        max_count: int,
+    ) -> None:
+        """Initialize the session."""
+        self.kind = kind
+        self.name = name
+        self.interval = interval
+        self.max_count = max_count
+        self.sent = 0
+        self.skipped = 0
+        self.reason: str | None = None
+        # Called with the session once it has ended for any reason
+        self.on_done: Callable[["HaptiqueRepeatSession"], None] | None = None
+        self._send = send
+        self._started = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def async_start(self) -> None:
+        """Send the first repetition, then keep repeating in the background.
+
+        Raises if the first send fails, so a bad command or unreachable hub
+        is reported to the caller instead of ending the session silently.
+        """
+        loop = asyncio.get_running_loop()
+        self._started = loop.time()
+        try:
+            await self._send()
+        except (UpdateFailed, asyncio.CancelledError):
+            self._finish("error")
+            raise
+        self.sent = 1
+        if self.reason is not None:
+            return  # stopped while the first send was in flight
+        if self.sent >= self.max_count:
+            self._finish("max_count")
+            return
+        self._task = loop.create_task(self._run())
+
+    def async_cancel(self, reason: str = "stopped") -> dict[str, Any]:
+        """Stop repeating and return the session report."""
+        if self._task is not None:
+            self._task.cancel()
+        self._finish(reason)
+        return self.as_dict()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session state."""
+        return {
+            "type": self.kind,
+            "name": self.name,
+            "interval_ms": round(self.interval * 1000),
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "reason": self.reason,
+        }
+
+    async def _run(self) -> None:
+        """Send the remaining repetitions on schedule."""
+        loop = asyncio.get_running_loop()
+        next_at = self._started
+        while self.sent < self.max_count:
+            next_at += self.interval
+            # A send late by less than an interval goes out straight away
+            missed = int((loop.time() - next_at) // self.interval)
+            if missed > 0:
+                self.skipped += missed
+                next_at += missed * self.interval
+            await asyncio.sleep(next_at - loop.time())
+            try:
+                await self._send()
+            except UpdateFailed as err:
+                _LOGGER.warning("Repeating %s '%s' stopped: %s", self.kind, self.name, err)
+                self._finish("error")
+                return
+            self.sent += 1
+        self._finish("max_count")
+
+    def _finish(self, reason: str) -> None:
+        """Record why the session ended and report it once."""
+        if self.reason is not None:
+            return
+        self.reason = reason
+        if self.on_done is not None:
+            self.on_done(self)
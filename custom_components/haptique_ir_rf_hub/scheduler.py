@@ -0,0 +1,140 @@
+"""Per-hub transmit scheduler for Haptique IR/RF hub."""
+import asyncio
+from contextvars import ContextVar
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import async_timeout
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DEFAULT_QUEUE_DEPTH, PRIORITY_NORMAL
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest sample in the average queue wait
+_WAIT_SMOOTHING = 0.2
+
+# Seconds the running job waited in the queue, for request tracing; None
+# outside scheduled jobs
+queue_wait: ContextVar[float | None] = ContextVar("queue_wait", default=None)
+
+
+class HaptiqueCommandScheduler:
+    """Run transmit operations against one hub one at a time.
+
+    Jobs are executed in priority order (lower value first), FIFO within a
+    priority. The queue is bounded: once ``max_depth`` jobs are waiting,
+    callers block until a slot frees up and fail after ``enqueue_timeout``.
+    """
+
+    def __init__(
+        self, max_depth: int = DEFAULT_QUEUE_DEPTH, enqueue_timeout: float = 5.0
+    ) -> None:
+        """Initialize the scheduler."""
+        self.max_depth = max_depth
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=max_depth)
+        self._seq = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._busy = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.last_wait = 0.0
+        self.avg_wait = 0.0
+        # Called whenever a job is queued or finishes
+        self.on_change: Callable[[], None] | None = None
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued and running jobs."""
+        return self._queue.qsize() + (1 if self._busy else 0)
+
+    async def async_submit(
+        self, job: Callable[[], Awaitable[Any]], priority: int = PRIORITY_NORMAL
+    ) -> Any:
+        """Queue ``job`` and return its result once it has run."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        item = (priority, next(self._seq), time.monotonic(), future, job)
+        self._idle.clear()
+        try:
+            async with async_timeout.timeout(self.enqueue_timeout):
+                await self._queue.put(item)
+        except asyncio.TimeoutError as err:
+            self._update_idle()
+            raise UpdateFailed(
+                f"Transmit queue full ({self.max_depth} commands waiting)"
+            ) from err
+
+        self._notify()
+        return await future
+
+    async def async_wait_idle(self) -> None:
+        """Wait until no transmit job is queued or running."""
+        await self._idle.wait()
+
+    async def async_shutdown(self) -> None:
+        """Stop the worker and fail any queued jobs."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while not self._queue.empty():
+            future = self._queue.get_nowait()[3]
+            if not future.done():
+                future.set_exception(UpdateFailed("Transmit queue shut down"))
+        self._busy = False
+        self._idle.set()
+        self._notify()
+
+    def _notify(self) -> None:
+        """Report a change of queue depth or wait."""
+        if self.on_change is not None:
+            self.on_change()
+
+    def _update_idle(self) -> None:
+        """Set the idle flag when nothing is queued or running."""
+        if not self._busy and self._queue.empty():
+            self._idle.set()
+
+    async def _run(self) -> None:
+        """Execute queued jobs one after another."""
+        while True:
+            _, _, enqueued_at, future, job = await self._queue.get()
+            if future.done():
+                self._update_idle()
+                continue
+
+            wait = time.monotonic() - enqueued_at
+            self.last_wait = wait
+            self.avg_wait += _WAIT_SMOOTHING * (wait - self.avg_wait)
+            if wait > 1:
+                _LOGGER.debug("Transmit job waited %.2fs in queue", wait)
+
+            self._busy = True
+            queue_wait.set(wait)
+            try:
+                result = await job()
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(UpdateFailed("Transmit queue shut down"))
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._busy = False
+                self._update_idle()
+                self._notify()
@@ -1,14 +1,24 @@
 """Sensor platform for Haptique IR/RF hub."""
 import logging
+import time
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.event import async_call_later
 
-from .const import DOMAIN, MANUFACTURER, MODEL
+from .const import (
+    DOMAIN,
+    MANUFACTURER,
+    MODEL,
+    QUEUE_SENSOR_THROTTLE,
+    SIGNAL_QUEUE_UPDATED,
+)
+from .entity import HaptiqueEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +31,7 @@ async def async_setup_entry(
     """Set up Haptique IR/RF hub sensors."""
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
+    api = data["api"]
     
     sensors = [
         HaptiqueWifiStatusSensor(coordinator, entry),
@@ -28,17 +39,24 @@ async def async_setup_entry(
         HaptiqueVersionSensor(coordinator, entry),
         HaptiqueHostnameSensor(coordinator, entry),
         HaptiqueIpAddressSensor(coordinator, entry),
+        HaptiqueTransmitQueueSensor(coordinator, entry, api),
+        HaptiqueLastRttSensor(coordinator, entry, api),
+        HaptiqueRequestLatencySensor(coordinator, entry, api),
+        HaptiqueRequestErrorsSensor(coordinator, entry, api),
     ]
     
     async_add_entities(sensors)
 
 
-class HaptiqueBaseSensor(CoordinatorEntity, SensorEntity):
+class HaptiqueBaseSensor(HaptiqueEntity, SensorEntity):
     """Base class for Haptique sensors."""
 
+    # Coordinator data sections this sensor reads, also its listener context
+    _sections = frozenset({"status"})
+
     def __init__(self, coordinator, entry):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._sections)
         self._entry = entry
         
         # Get version from coordinator data
@@ -99,7 +117,7 @@ class HaptiqueWifiStatusSensor(HaptiqueBaseSensor):
     def extra_state_attributes(self):
         """Return additional attributes."""
         status = self.coordinator.data.get("status", {})
-        attrs = {}
+        attrs = super().extra_state_attributes
         
         # Try both field name variations
         if "sta_ssid" in status:
@@ -121,6 +139,8 @@ class HaptiqueWifiStatusSensor(HaptiqueBaseSensor):
 class HaptiqueRfCountSensor(HaptiqueBaseSensor):
     """RF receive count sensor."""
 
+    _sections = frozenset({"rf_status", "status"})
+
     def __init__(self, coordinator, entry):
         """Initialize the sensor."""
         super().__init__(coordinator, entry)
@@ -149,6 +169,7 @@ class HaptiqueRfCountSensor(HaptiqueBaseSensor):
         rf_status = self.coordinator.data.get("rf_status", {})
         if rf_status:
             return {
+                **super().extra_state_attributes,
                 "last_code": rf_status.get("last_code", 0),
                 "last_bits": rf_status.get("last_bits", 0),
                 "last_protocol": rf_status.get("last_protocol", 0),
@@ -160,6 +181,7 @@ class HaptiqueRfCountSensor(HaptiqueBaseSensor):
         status = self.coordinator.data.get("status", {})
         rf_data = status.get("rf", {})
         return {
+            **super().extra_state_attributes,
             "last_code": rf_data.get("last_code", 0),
             "last_bits": rf_data.get("last_bits", 0),
             "rf_rx_pin": status.get("rf_rx", 0),
@@ -224,6 +246,177 @@ class HaptiqueIpAddressSensor(HaptiqueBaseSensor):
         """Return additional attributes."""
         status = self.coordinator.data.get("status", {})
         return {
+            **super().extra_state_attributes,
             "mac": status.get("mac", "N/A"),
             "gateway": status.get("gateway", "N/A"),
         }
+
+
+class HaptiqueTransmitQueueSensor(HaptiqueBaseSensor):
+    """Transmit queue depth sensor.
+
+    Polls wait for the queue to drain, so the state is pushed by the
+    scheduler instead: at most once per ``QUEUE_SENSOR_THROTTLE`` seconds,
+    with a trailing update so the final depth is always written.
+    """
+
+    # Only follows availability; the scheduler pushes queue changes
+    _sections = frozenset()
+
+    def __init__(self, coordinator, entry, api):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry)
+        self._scheduler = api.scheduler
+        self._attr_name = "Transmit Queue"
+        self._attr_unique_id = f"{entry.entry_id}_transmit_queue"
+        self._attr_icon = "mdi:tray-full"
+        self._attr_native_unit_of_measurement = "commands"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._last_write = 0.0
+        self._cancel_write = None
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the scheduler's queue changes."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_QUEUE_UPDATED.format(self._entry.entry_id),
+                self._async_queue_changed,
+            )
+        )
+        self.async_on_remove(self._async_cancel_write)
+
+    @callback
+    def _async_queue_changed(self) -> None:
+        """Write the state now, or once the throttle window has passed."""
+        if self._cancel_write is not None:
+            return
+        delay = self._last_write + QUEUE_SENSOR_THROTTLE - time.monotonic()
+        if delay <= 0:
+            self._async_write_queue_state()
+        else:
+            self._cancel_write = async_call_later(
+                self.hass, delay, self._async_write_queue_state
+            )
+
+    @callback
+    def _async_write_queue_state(self, _now=None) -> None:
+        """Write the current queue state."""
+        self._cancel_write = None
+        self._last_write = time.monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        """Drop a pending trailing update."""
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    @property
+    def native_value(self):
+        """Return the number of queued and running transmits."""
+        return self._scheduler.depth
+
+    @property
+    def extra_state_attributes(self):
+        """Return queue wait statistics."""
+        return {
+            **super().extra_state_attributes,
+            "max_depth": self._scheduler.max_depth,
+            "last_wait_ms": round(self._scheduler.last_wait * 1000, 1),
+            "avg_wait_ms": round(self._scheduler.avg_wait * 1000, 1),
+        }
+
+
+class HaptiqueMetricsSensor(HaptiqueBaseSensor):
+    """Base class for request metric sensors."""
+
+    # Metrics live on the API, so refresh on every coordinator update
+    _sections = None
+    _unrecorded_attributes = frozenset({"endpoints"})
+
+    def __init__(self, coordinator, entry, api):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry)
+        self._metrics = api.metrics
+        self._breaker = api.breaker
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+
+class HaptiqueLastRttSensor(HaptiqueMetricsSensor):
+    """Round-trip time of the most recent successful request."""
+
+    def __init__(self, coordinator, entry, api):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, api)
+        self._attr_name = "Last RTT"
+        self._attr_unique_id = f"{entry.entry_id}_last_rtt"
+        self._attr_icon = "mdi:timer-outline"
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Return the last round-trip time in milliseconds."""
+        last_rtt = self._metrics.total.last_rtt
+        return round(last_rtt * 1000, 1) if last_rtt is not None else None
+
+
+class HaptiqueRequestLatencySensor(HaptiqueMetricsSensor):
+    """95th percentile request latency with per-endpoint breakdown."""
+
+    def __init__(self, coordinator, entry, api):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, api)
+        self._attr_name = "Request Latency p95"
+        self._attr_unique_id = f"{entry.entry_id}_request_latency"
+        self._attr_icon = "mdi:chart-bell-curve"
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Return the p95 latency of recent requests."""
+        return self._metrics.total.as_dict()["p95"]
+
+    @property
+    def extra_state_attributes(self):
+        """Return overall percentiles and per-endpoint stats."""
+        summary = self._metrics.summary()
+        return {
+            **super().extra_state_attributes,
+            "p50": summary["p50"],
+            "p99": summary["p99"],
+            "endpoints": summary["endpoints"],
+        }
+
+
+class HaptiqueRequestErrorsSensor(HaptiqueMetricsSensor):
+    """Failed request counter."""
+
+    def __init__(self, coordinator, entry, api):
+        """Initialize the sensor."""
+        super().__init__(coordinator, entry, api)
+        self._attr_name = "Request Errors"
+        self._attr_unique_id = f"{entry.entry_id}_request_errors"
+        self._attr_icon = "mdi:alert-circle-outline"
+        self._attr_native_unit_of_measurement = "requests"
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self):
+        """Return the number of failed requests since setup."""
+        return self._metrics.total.errors + self._metrics.total.timeouts
+
+    @property
+    def extra_state_attributes(self):
+        """Return request, error and timeout totals."""
+        return {
+            **super().extra_state_attributes,
+            "requests": self._metrics.total.requests,
+            "errors": self._metrics.total.errors,
+            "timeouts": self._metrics.total.timeouts,
+            "circuit": self._breaker.state,
+        }
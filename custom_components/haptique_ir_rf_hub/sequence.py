@@ -0,0 +1,71 @@
+"""Command sequences (macros) for Haptique IR/RF hub."""
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SIGNAL_MACROS_UPDATED
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+SEQUENCE_STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required("type"): vol.In(["ir", "rf"]),
+        vol.Required("name"): cv.string,
+        vol.Optional("repeat", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+        vol.Optional("delay_ms", default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=60000)
+        ),
+    }
+)
+
+SEQUENCE_STEPS_SCHEMA = vol.All(cv.ensure_list, [SEQUENCE_STEP_SCHEMA], vol.Length(min=1))
+
+
+class HaptiqueMacroStore:
+    """Named command sequences for one hub, persisted in HA storage."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.macros")
+        self.macros: dict[str, list[dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        """Load saved macros."""
+        data = await self._store.async_load()
+        self.macros = (data or {}).get("macros", {})
+
+    async def async_save_macro(self, name: str, steps: list[dict[str, Any]]) -> None:
+        """Create or replace a macro."""
+        self.macros[name] = steps
+        await self._async_persist()
+
+    async def async_save_macros(self, macros: dict[str, list[dict[str, Any]]]) -> None:
+        """Create or replace several macros with one write."""
+        self.macros.update(macros)
+        await self._async_persist()
+
+    async def async_delete_macro(self, name: str) -> bool:
+        """Delete a macro, returning False if it did not exist."""
+        if self.macros.pop(name, None) is None:
+            return False
+        await self._async_persist()
+        return True
+
+    async def _async_persist(self) -> None:
+        """Write macros to disk and tell the button platform."""
+        await self._store.async_save({"macros": self.macros})
+        async_dispatcher_send(
+            self._hass, SIGNAL_MACROS_UPDATED.format(self._entry_id)
+        )
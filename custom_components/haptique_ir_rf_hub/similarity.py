@@ -0,0 +1,252 @@
+"""Duplicate detection across the saved commands of all Haptique hubs."""
+from array import array
+from bisect import bisect_left, bisect_right, insort
+import logging
+from operator import itemgetter, sub
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_SIMILARITY_INDEX, SIMILARITY_THRESHOLD
+from .protocols import first_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+# (entry_id, kind, name)
+Item = tuple[str, str, str]
+
+
+class _Feature:
+    """What a command is compared on."""
+
+    __slots__ = ("bucket", "frame", "total", "source")
+
+    def __init__(
+        self, bucket: tuple, frame: array | None = None, source: object = None
+    ) -> None:
+        """Initialize the feature."""
+        self.bucket = bucket
+        self.frame = frame
+        self.total = sum(frame) if frame is not None else 0
+        # The catalog object it was computed from, to skip unchanged commands
+        self.source = source
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if the command did not change."""
+        return self is other or (
+            isinstance(other, _Feature)
+            and self.bucket == other.bucket
+            and self.frame == other.frame
+        )
+
+
+def _ir_feature(command: Any, known: _Feature | None) -> _Feature | None:
+    """Return the feature of an IR command, or None without timings."""
+    if command.protocol is not None:
+        if known is not None and known.source is command.protocol:
+            return known
+        return _Feature(("ir", str(command.protocol)), source=command.protocol)
+    if known is not None and known.source is command.timings:
+        return known
+    if command.timings is None:
+        return None
+    frame = array("I", first_frame(command.timings))
+    if not frame:
+        return None
+    # Which timings are long (at least twice the shortest); jitter does not
+    # change this for real protocols, whose timings are 1:3 or further apart
+    shortest = min(frame)
+    shape = bytes(t >= 2 * shortest for t in frame)
+    return _Feature(("ir", shape), frame, command.timings)
+
+
+def _distance(a: _Feature, b: _Feature, threshold: float) -> float | None:
+    """Return the normalized timing distance of two commands, or None if too far.
+
+    The distance is the summed absolute difference of the timings divided
+    by the longer total duration, so 0.05 means 5% of the signal differs.
+    """
+    if a.frame is None:
+        return 0.0
+    total = max(a.total, b.total)
+    limit = threshold * total
+    # The totals bound the distance from below, which rejects most pairs
+    if abs(a.total - b.total) > limit:
+        return None
+    diff = sum(map(abs, map(sub, a.frame, b.frame)))
+    if diff > limit:
+        return None
+    return diff / total if total else 0.0
+
+
+class HaptiqueSimilarityIndex:
+    """Clusters of identical or near-identical saved commands on all hubs.
+
+    IR commands decoded to a protocol code match when the codes are equal;
+    other IR commands are compared on the first frame of their captured
+    timings, only against commands with the same pattern of short and long
+    timings whose total duration is within the threshold (found by
+    bisection). RF commands
+    match on code and bit count. IR commands learned outside Home Assistant
+    have no timings and are skipped.
+
+    Catalogs report changes through ``async_mark_dirty``; the next lookup
+    re-indexes only the commands of those hubs that were added, changed or
+    removed, and clusters are cached until then.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD) -> None:
+        """Initialize the index."""
+        self.threshold = threshold
+        self._catalogs: dict[str, Any] = {}
+        self._features: dict[str, dict[Item, _Feature]] = {}
+        self._items: dict[Item, _Feature] = {}
+        # Commands of each bucket sorted by total duration
+        self._buckets: dict[tuple, list[tuple[int, Item]]] = {}
+        self._edges: dict[Item, dict[Item, float]] = {}
+        self._dirty: set[str] = set()
+        self._skipped: dict[str, int] = {}
+        self._clusters: list[dict[str, Any]] | None = None
+
+    @callback
+    def async_track(self, entry_id: str, catalog: Any) -> CALLBACK_TYPE:
+        """Index a hub's catalog, returning a callback that drops it."""
+        self._catalogs[entry_id] = catalog
+        self.async_mark_dirty(entry_id)
+
+        @callback
+        def untrack() -> None:
+            self._catalogs.pop(entry_id, None)
+            self.async_mark_dirty(entry_id)
+
+        return untrack
+
+    @callback
+    def async_mark_dirty(self, entry_id: str) -> None:
+        """Re-index a hub's commands on the next lookup."""
+        self._dirty.add(entry_id)
+        self._clusters = None
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed commands."""
+        self._async_update()
+        return sum(len(features) for features in self._features.values())
+
+    @property
+    def skipped(self) -> int:
+        """Return the number of IR commands without timings."""
+        self._async_update()
+        return sum(self._skipped.values())
+
+    def clusters(self) -> list[dict[str, Any]]:
+        """Return the groups of duplicate commands, largest first.
+
+        Each cluster has ``kind``, ``distance`` (the largest distance
+        between two linked members) and ``commands``, a list of
+        (entry_id, name) pairs.
+        """
+        self._async_update()
+        if self._clusters is None:
+            self._clusters = self._build_clusters()
+        return self._clusters
+
+    def _async_update(self) -> None:
+        """Apply the changes of dirty catalogs."""
+        for entry_id in self._dirty:
+            old = self._features.pop(entry_id, {})
+            new = self._catalog_features(entry_id, old)
+            for item, feature in old.items():
+                if new.get(item) != feature:
+                    self._remove(item, feature)
+            for item, feature in new.items():
+                if old.get(item) != feature:
+                    self._add(item, feature)
+            if new:
+                self._features[entry_id] = new
+        self._dirty.clear()
+
+    def _catalog_features(
+        self, entry_id: str, known: dict[Item, _Feature]
+    ) -> dict[Item, _Feature]:
+        """Return the features of every comparable command of a hub."""
+        catalog = self._catalogs.get(entry_id)
+        if catalog is None:
+            self._skipped.pop(entry_id, None)
+            return {}
+        features = {}
+        skipped = 0
+        for name, command in catalog.ir.items():
+            feature = _ir_feature(command, known.get((entry_id, "ir", name)))
+            if feature is None:
+                skipped += 1
+            else:
+                features[(entry_id, "ir", name)] = feature
+        for name, command in catalog.rf.items():
+            features[(entry_id, "rf", name)] = _Feature(("rf", command.code, command.bits))
+        self._skipped[entry_id] = skipped
+        return features
+
+    def _add(self, item: Item, feature: _Feature) -> None:
+        """Index a command and link it to its near duplicates."""
+        bucket = self._buckets.setdefault(feature.bucket, [])
+        low = bisect_left(bucket, feature.total * (1 - self.threshold), key=itemgetter(0))
+        high = bisect_right(bucket, feature.total / (1 - self.threshold), key=itemgetter(0))
+        for _, other in bucket[low:high]:
+            distance = _distance(feature, self._items[other], self.threshold)
+            if distance is not None:
+                self._edges.setdefault(item, {})[other] = distance
+                self._edges.setdefault(other, {})[item] = distance
+        insort(bucket, (feature.total, item))
+        self._items[item] = feature
+
+    def _remove(self, item: Item, feature: _Feature) -> None:
+        """Drop a command and its links."""
+        self._items.pop(item, None)
+        bucket = self._buckets.get(feature.bucket)
+        if bucket is not None:
+            bucket.remove((feature.total, item))
+            if not bucket:
+                del self._buckets[feature.bucket]
+        for other in self._edges.pop(item, {}):
+            links = self._edges.get(other)
+            if links is not None:
+                links.pop(item, None)
+                if not links:
+                    del self._edges[other]
+
+    def _build_clusters(self) -> list[dict[str, Any]]:
+        """Group linked commands into connected components."""
+        seen: set[Item] = set()
+        clusters = []
+        for start in self._edges:
+            if start in seen:
+                continue
+            members, distance, stack = [], 0.0, [start]
+            seen.add(start)
+            while stack:
+                item = stack.pop()
+                members.append(item)
+                for other, edge in self._edges[item].items():
+                    distance = max(distance, edge)
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            clusters.append(
+                {
+                    "kind": start[1],
+                    "distance": round(distance, 4),
+                    "commands": sorted((entry_id, name) for entry_id, _, name in members),
+                }
+            )
+        clusters.sort(key=lambda cluster: (-len(cluster["commands"]), cluster["commands"]))
+        _LOGGER.debug("Found %d duplicate command clusters", len(clusters))
+        return clusters
+
+
+@callback
+def async_get_similarity_index(hass: HomeAssistant) -> HaptiqueSimilarityIndex:
+    """Return the similarity index shared by all config entries."""
+    if DATA_SIMILARITY_INDEX not in hass.data:
+        hass.data[DATA_SIMILARITY_INDEX] = HaptiqueSimilarityIndex()
+    return hass.data[DATA_SIMILARITY_INDEX]
@@ -0,0 +1,154 @@
+"""Static web UI assets for Haptique IR/RF hub."""
+from collections.abc import Callable
+import gzip
+from hashlib import sha256
+from http import HTTPStatus
+import logging
+import mimetypes
+from pathlib import Path
+import re
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_LOGGER = logging.getLogger(__name__)
+
+SOURCE_DIR = Path(__file__).parent / "www"
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+# Hashed names look like hub.0123456789ab.html
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.")
+
+
+def _compressors() -> list[tuple[str, str, Callable[[bytes], bytes]]]:
+    """Return (encoding, file suffix, compress) in order of preference."""
+    compressors = []
+    if brotli is not None:
+        compressors.append(("br", ".br", lambda data: brotli.compress(data, quality=11)))
+    compressors.append(("gzip", ".gz", lambda data: gzip.compress(data, 9, mtime=0)))
+    return compressors
+
+
+class StaticAsset:
+    """One web UI file with its precompressed bodies."""
+
+    __slots__ = ("hashed_name", "etag", "content_type", "bodies")
+
+    def __init__(self, hashed_name: str, etag: str, content_type: str, bodies: dict[str, bytes]):
+        """Initialize the asset."""
+        self.hashed_name = hashed_name
+        self.etag = etag
+        self.content_type = content_type
+        # Encoding ("identity", "br", "gzip") -> body
+        self.bodies = bodies
+
+
+def _build_assets(cache_dir: Path) -> dict[str, StaticAsset]:
+    """Load the web UI files and their compressed variants.
+
+    Compressed files are cached in ``cache_dir`` under the content-hashed
+    name, so they are only rebuilt when a source file changes. Runs in the
+    executor.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    assets = {}
+    for source in sorted(SOURCE_DIR.iterdir()):
+        if not source.is_file():
+            continue
+        data = source.read_bytes()
+        digest = sha256(data).hexdigest()[:12]
+        hashed_name = f"{source.stem}.{digest}{source.suffix}"
+        bodies = {"identity": data}
+
+        for encoding, suffix, compress in _compressors():
+            cached = cache_dir / f"{hashed_name}{suffix}"
+            if cached.is_file():
+                body = cached.read_bytes()
+            else:
+                body = compress(data)
+                cached.write_bytes(body)
+                _LOGGER.debug("Built %s", cached)
+            if len(body) < len(data):
+                bodies[encoding] = body
+
+        content_type = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+        assets[source.name] = StaticAsset(hashed_name, f'"{digest}"', content_type, bodies)
+
+    # Drop variants of previous versions
+    keep = {
+        f"{asset.hashed_name}{suffix}"
+        for asset in assets.values()
+        for _, suffix, _ in _compressors()
+    }
+    for cached in cache_dir.iterdir():
+        if _HASHED_NAME.search(cached.name) and cached.name not in keep:
+            cached.unlink()
+    return assets
+
+
+class HaptiqueStaticView(HomeAssistantView):
+    """Serve the web UI from memory.
+
+    ``/haptique_ir_rf_hub/<name>`` is revalidated on every load (a 304 when
+    unchanged); ``/haptique_ir_rf_hub/<stem>.<hash>.<ext>`` is cached forever.
+    """
+
+    url = f"/{DOMAIN}/{{filename}}"
+    name = f"{DOMAIN}:static"
+    # Opened directly by the browser, as the previous static path was
+    requires_auth = False
+
+    def __init__(self, assets: dict[str, StaticAsset]) -> None:
+        """Initialize the view."""
+        self._assets = assets
+        self._hashed = {asset.hashed_name: asset for asset in assets.values()}
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        """Return an asset in the best encoding the client accepts."""
+        if (asset := self._hashed.get(filename)) is not None:
+            cache_control = CACHE_IMMUTABLE
+        elif (asset := self._assets.get(filename)) is not None:
+            cache_control = CACHE_REVALIDATE
+        else:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        headers = {
+            "Cache-Control": cache_control,
+            "ETag": asset.etag,
+            "Vary": "Accept-Encoding",
+        }
+        if asset.etag in request.headers.get("If-None-Match", ""):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        accepted = {
+            part.split(";")[0].strip()
+            for part in request.headers.get("Accept-Encoding", "").split(",")
+        }
+        encoding = next(
+            (enc for enc in asset.bodies if enc != "identity" and enc in accepted),
+            "identity",
+        )
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return web.Response(
+            body=asset.bodies[encoding], content_type=asset.content_type, headers=headers
+        )
+
+
+async def async_setup_static(hass: HomeAssistant) -> None:
+    """Build the web UI assets and register the view."""
+    cache_dir = Path(hass.config.path("www", "community", DOMAIN))
+    assets = await hass.async_add_executor_job(_build_assets, cache_dir)
+    hass.http.register_view(HaptiqueStaticView(assets))
+    for name, asset in assets.items():
+        _LOGGER.debug("Serving %s at /%s/%s", name, DOMAIN, asset.hashed_name)
@@ -6,9 +6,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, MANUFACTURER, MODEL
+from .entity import HaptiqueEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,12 +30,14 @@ async def async_setup_entry(
     async_add_entities(switches)
 
 
-class HaptiqueAPSwitch(CoordinatorEntity, SwitchEntity):
+class HaptiqueAPSwitch(HaptiqueEntity, SwitchEntity):
     """Access Point on/off switch."""
 
+    _sections = frozenset({"status"})
+
     def __init__(self, coordinator, api, entry):
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=self._sections)
         self._api = api
         self._attr_name = "Access Point"
         self._attr_unique_id = f"{entry.entry_id}_ap_switch"
@@ -0,0 +1,51 @@
+"""Websocket API for Haptique IR/RF hub."""
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_rf)
+
+
+def _async_get_entry_data(hass: HomeAssistant, msg: dict[str, Any]) -> dict | None:
+    """Return the hub data matching ``entry_id`` or ``host`` in a message."""
+    entries = hass.data.get(DOMAIN, {})
+    if "entry_id" in msg:
+        return entries.get(msg["entry_id"])
+    for data in entries.values():
+        if "host" not in msg or data["api"].host == msg["host"]:
+            return data
+    return None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/rf/subscribe",
+        vol.Optional("entry_id"): str,
+        vol.Optional("host"): str,
+    }
+)
+@callback
+def ws_subscribe_rf(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stream RF captures of one hub to the client."""
+    data = _async_get_entry_data(hass, msg)
+    if data is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "No matching hub")
+        return
+
+    @callback
+    def forward(capture: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], capture))
+
+    connection.send_result(msg["id"])
+    connection.subscriptions[msg["id"]] = data["rf_monitor"].async_subscribe(forward)
@@ -0,0 +1 @@
+"""Benchmarks for Haptique IR/RF Hub."""
@@ -0,0 +1,88 @@
+"""Fixtures and reporting for Haptique IR/RF Hub benchmarks.
+
+Results are printed at the end of the run. ``--benchmark-json PATH`` saves
+them together with the current commit, and ``--benchmark-compare PATH``
+prints the change against a saved run, flagging regressions above
+``REGRESSION_THRESHOLD``.
+"""
+import json
+from pathlib import Path
+import platform
+import subprocess
+
+import pytest
+
+REGRESSION_THRESHOLD = 0.10
+
+RESULTS_KEY = pytest.StashKey[dict]()
+
+
+class BenchmarkResults:
+    """Collects benchmark results for the session."""
+
+    def __init__(self, results: dict) -> None:
+        """Initialize the collector."""
+        self._results = results
+
+    def record(self, name: str, value: float, unit: str, better: str = "lower") -> None:
+        """Record one result; ``better`` is ``lower`` or ``higher``."""
+        self._results[name] = {"value": round(value, 3), "unit": unit, "better": better}
+
+
+def _commit() -> str | None:
+    """Return the current git commit, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Create the session's result store."""
+    config.stash[RESULTS_KEY] = {}
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    """Print, save and compare the benchmark results."""
+    results = config.stash.get(RESULTS_KEY, {})
+    if not results:
+        return
+
+    baseline = {}
+    if compare_path := config.getoption("--benchmark-compare"):
+        baseline = json.loads(Path(compare_path).read_text())["results"]
+
+    terminalreporter.section("haptique benchmarks")
+    for name, result in sorted(results.items()):
+        line = f"{name:<40} {result['value']:>12.3f} {result['unit']}"
+        if (old := baseline.get(name)) and old["value"]:
+            change = (result["value"] - old["value"]) / old["value"]
+            worse = change if result["better"] == "lower" else -change
+            line += f"  {change:+.1%}"
+            if worse > REGRESSION_THRESHOLD:
+                line += "  REGRESSION"
+        terminalreporter.write_line(line)
+
+    if json_path := config.getoption("--benchmark-json"):
+        Path(json_path).write_text(
+            json.dumps(
+                {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                indent=2,
+                sort_keys=True,
+            )
+        )
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> BenchmarkResults:
+    """Return the result collector."""
+    return BenchmarkResults(request.config.stash[RESULTS_KEY])
@@ -0,0 +1,165 @@
+"""Benchmarks for the Haptique IR/RF Hub hot paths.
+
+Run with ``pytest tests/benchmarks --benchmark``. Every benchmark talks to
+an in-process fake hub over real HTTP, so results include aiohttp and
+JSON costs but no network noise.
+"""
+import asyncio
+import gc
+from statistics import median, quantiles
+import time
+import tracemalloc
+
+import aiohttp
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.haptique_ir_rf_hub import (
+    HaptiqueDataUpdateCoordinator,
+    HaptiqueGatewayAPI,
+)
+from custom_components.haptique_ir_rf_hub.catalog import HaptiqueCommandCatalog
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+from custom_components.haptique_ir_rf_hub.protocols import (
+    PROTOCOLS,
+    IrProtocolCode,
+    decode_protocol,
+    encode_protocol,
+)
+
+from tests.fake_hub import NEC_TIMINGS
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.benchmark]
+
+# Simulated hub response time; ESP32 firmware typically answers in 5-20 ms
+LATENCY = 0.005
+ROUNDS = 20
+
+
+@pytest.mark.parametrize("library_size", [100, 1000])
+async def test_coordinator_refresh(
+    hass: HomeAssistant, setup_hubs, bench, library_size: int
+) -> None:
+    """Measure refresh wall time with and without the saved-command lists."""
+    (hub,), _ = await setup_hubs(
+        setup=False, ir_count=library_size, rf_count=library_size, latency=LATENCY
+    )
+
+    async with aiohttp.ClientSession() as session:
+        catalog = HaptiqueCommandCatalog(hass, "bench")
+        api = HaptiqueGatewayAPI(hub.host, "bench", session, catalog)
+        coordinator = HaptiqueDataUpdateCoordinator(hass, api)
+
+        full, status_only = [], []
+        for _ in range(ROUNDS):
+            # Every round must reach the hub, not the read freshness cache
+            api._recent.clear()
+            coordinator.async_invalidate_catalogs()
+            started = time.perf_counter()
+            coordinator.data = await coordinator._async_update_data()
+            full.append(time.perf_counter() - started)
+
+            api._recent.clear()
+            started = time.perf_counter()
+            coordinator.data = await coordinator._async_update_data()
+            status_only.append(time.perf_counter() - started)
+        await api.scheduler.async_shutdown()
+
+    assert len(coordinator.data["ir_saved"]) == library_size
+    assert hub.requests["GET /api/status"] == 2 * ROUNDS
+    bench.record(f"refresh_full[{library_size}]", median(full) * 1000, "ms")
+    bench.record(f"refresh_status[{library_size}]", median(status_only) * 1000, "ms")
+
+
+async def test_send_throughput(
+    hass: HomeAssistant, setup_hubs, bench
+) -> None:
+    """Measure send_ir_saved service calls per second under concurrent load."""
+    (hub,), _ = await setup_hubs(ir_count=100, rf_count=100, latency=LATENCY)
+    calls = 200
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            hass.services.async_call(
+                DOMAIN, "send_ir_saved", {"name": f"ir_{index % 100}"}, blocking=True
+            )
+            for index in range(calls)
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    assert hub.requests["POST /api/ir/send/name"] == calls
+    bench.record("send_throughput", calls / elapsed, "calls/s", better="higher")
+
+
+async def test_button_press_latency(
+    hass: HomeAssistant, setup_hubs, bench
+) -> None:
+    """Measure button press latency from service call to hub response."""
+    _, (entry,) = await setup_hubs(ir_count=100, rf_count=100, latency=LATENCY)
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "button", DOMAIN, f"{entry.entry_id}_ir_ir_1"
+    )
+    assert entity_id
+
+    latencies = []
+    for _ in range(ROUNDS * 2):
+        started = time.perf_counter()
+        await hass.services.async_call(
+            "button", "press", {"entity_id": entity_id}, blocking=True
+        )
+        latencies.append(time.perf_counter() - started)
+
+    cuts = quantiles(latencies, n=20)
+    bench.record("button_press_p50", median(latencies) * 1000, "ms")
+    bench.record("button_press_p95", cuts[18] * 1000, "ms")
+
+
+async def test_library_memory(hass: HomeAssistant, setup_hubs, bench) -> None:
+    """Measure memory held for a 2000 + 2000 command library."""
+    (hub,), _ = await setup_hubs(setup=False, ir_count=2000, rf_count=2000)
+
+    async with aiohttp.ClientSession() as session:
+        catalog = HaptiqueCommandCatalog(hass, "bench")
+        api = HaptiqueGatewayAPI(hub.host, "bench", session, catalog)
+        coordinator = HaptiqueDataUpdateCoordinator(hass, api)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            coordinator.data = await coordinator._async_update_data()
+            gc.collect()
+            after_refresh = tracemalloc.get_traced_memory()[0]
+
+            for command in hub.ir_saved[:1000]:
+                catalog.async_record_ir(command["name"], 38000, 33, NEC_TIMINGS)
+            gc.collect()
+            after_timings = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        await api.scheduler.async_shutdown()
+
+    assert len(catalog.ir) == 2000
+    bench.record("memory_library[4000]", (after_refresh - before) / 1024, "KiB")
+    bench.record("memory_ir_timings[1000]", (after_timings - after_refresh) / 1024, "KiB")
+
+
+async def test_protocol_decode(bench) -> None:
+    """Measure decoding a 1000 command library, half of it unrecognized."""
+    library = []
+    for index in range(500):
+        protocol = list(PROTOCOLS)[index % len(PROTOCOLS)]
+        library.append(encode_protocol(IrProtocolCode(protocol, index % 0x1F, index % 0x7F))[1])
+        library.append([9000, 4500] + [560 + index % 7 * 150, 1100] * 40 + [560])
+
+    runs = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        decoded = [decode_protocol(timings) for timings in library]
+        runs.append(time.perf_counter() - started)
+
+    assert sum(code is not None for code in decoded) == 500
+    bench.record("protocol_decode[1000]", median(runs) * 1000, "ms")
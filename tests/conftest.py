@@ -1,18 +1,109 @@
 """Common fixtures for Haptique IR/RF Hub tests."""
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
 import pytest
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.haptique_ir_rf_hub.const import DOMAIN
 
+from tests.fake_hub import FakeHub
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("haptique benchmarks")
+    group.addoption(
+        "--benchmark", action="store_true", help="Run the benchmarks in tests/benchmarks"
+    )
+    group.addoption(
+        "--benchmark-json", metavar="PATH", help="Write benchmark results to PATH"
+    )
+    group.addoption(
+        "--benchmark-compare",
+        metavar="PATH",
+        help="Compare benchmark results with an earlier --benchmark-json file",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list) -> None:
+    """Skip benchmarks unless --benchmark is given."""
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components in every test."""
+
+
+SetupHubs = Callable[..., Awaitable[tuple[list[FakeHub], list[MockConfigEntry]]]]
+
+
+@pytest.fixture
+async def setup_hubs(
+    hass: HomeAssistant, socket_enabled: None
+) -> AsyncGenerator[SetupHubs, None]:
+    """Return a factory that starts fake hubs and sets up an entry for each.
+
+    ``await setup_hubs(count, setup=True, **options)`` passes ``options`` to
+    every ``FakeHub`` and returns the new hubs and their entries (none with
+    ``setup=False``). Entries are titled ``Hub 0``, ``Hub 1``, ... in the
+    order they were created. Everything is unloaded and stopped afterwards.
+    """
+    fakes: list[FakeHub] = []
+    entries: list[MockConfigEntry] = []
+
+    async def start(
+        count: int = 1, *, setup: bool = True, **options
+    ) -> tuple[list[FakeHub], list[MockConfigEntry]]:
+        new_fakes, new_entries = [], []
+        for _ in range(count):
+            fake = FakeHub(**options)
+            await fake.start()
+            fakes.append(fake)
+            new_fakes.append(fake)
+            if not setup:
+                continue
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                title=f"Hub {len(entries)}",
+                data={"host": fake.host, "token": fake.token or ""},
+                unique_id=fake.host,
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            entries.append(entry)
+            new_entries.append(entry)
+        return new_fakes, new_entries
+
+    yield start
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    for fake in fakes:
+        await fake.stop()
+
+
+@pytest.fixture
+async def fake_hub(setup_hubs: SetupHubs) -> FakeHub:
+    """Return a running fake hub that expects the mock entry's token."""
+    (hub,), _ = await setup_hubs(setup=False, token="test_token_123")
+    return hub
+
 
 @pytest.fixture
-def mock_config_entry() -> MockConfigEntry:
-    """Return a mock config entry."""
+def mock_config_entry(fake_hub: FakeHub) -> MockConfigEntry:
+    """Return a mock config entry pointing at the fake hub."""
     return MockConfigEntry(
         domain=DOMAIN,
         data={
-            "host": "192.168.1.100",
+            "host": fake_hub.host,
             "token": "test_token_123",
         },
         unique_id="test_unique_id",
@@ -0,0 +1,180 @@
+"""In-process fake of the Haptique IR/RF hub REST API."""
+import asyncio
+from collections import Counter
+
+from aiohttp import web
+
+NEC_TIMINGS = [9000, 4500] + [560, 560, 560, 1690] * 16 + [560, 40000]
+
+# /api/ir/save frame values and the /api/ir/last keys they save
+SAVE_FRAMES = {"A": "a", "B": "b", "combined": "combined"}
+
+
+class FakeHub:
+    """Serve the hub API on localhost with a configurable library and latency.
+
+    ``latency`` (seconds) is added to every response. With ``token`` set,
+    requests without the matching bearer token get a 401. ``requests``
+    counts calls per ``METHOD path``. Saves store the last capture under
+    the given name, as the firmware does; deletes remove it.
+    ``capture_ir`` / ``capture_rf`` simulate a remote being pressed. With
+    ``garbled`` set, every response body is invalid JSON.
+    """
+
+    def __init__(
+        self,
+        ir_count: int = 10,
+        rf_count: int = 10,
+        latency: float = 0.0,
+        mac: str = "AA:BB:CC:DD:EE:FF",
+        hostname: str = "haptique-fake",
+        token: str | None = None,
+    ):
+        """Initialize the fake hub."""
+        self.latency = latency
+        self.mac = mac
+        self.hostname = hostname
+        self.token = token
+        self.garbled = False
+        self.requests: Counter[str] = Counter()
+        self.rx_count = 0
+        self.ir_saved = [
+            {"name": f"ir_{index}", "freq_hz": 38000, "duty": 33, "count": len(NEC_TIMINGS)}
+            for index in range(ir_count)
+        ]
+        self.rf_saved = [
+            {"name": f"rf_{index}", "code": 0x500000 + index, "bits": 24, "protocol": 1}
+            for index in range(rf_count)
+        ]
+        self.ir_last = {"freq_khz": 38, "a": NEC_TIMINGS, "b": NEC_TIMINGS, "combined": NEC_TIMINGS}
+        self.rf_last = {"code": 0x500001, "bits": 24, "protocol": 1}
+        self.host: str | None = None
+        self._runner: web.AppRunner | None = None
+
+    def capture_ir(self, timings: list[int], freq_khz: int = 38) -> None:
+        """Make ``timings`` the last received IR signal."""
+        self.ir_last = {"freq_khz": freq_khz, "a": timings, "b": timings, "combined": timings}
+
+    def capture_rf(self, code: int, bits: int = 24, protocol: int = 1) -> None:
+        """Make ``code`` the last received RF signal."""
+        self.rx_count += 1
+        self.rf_last = {"code": code, "bits": bits, "protocol": protocol}
+
+    async def start(self) -> str:
+        """Start serving and return the ``host:port`` to configure."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/status", self._status)
+        app.router.add_get("/api/rf/status", self._rf_status)
+        app.router.add_get("/api/ir/saved", self._ir_saved)
+        app.router.add_get("/api/rf/saved", self._rf_saved)
+        app.router.add_get("/api/ir/last", self._ir_last)
+        app.router.add_get("/api/rf/last", self._rf_last)
+        for path in (
+            "/api/ir/send",
+            "/api/ir/send/name",
+            "/api/rf/send",
+            "/api/rf/send/name",
+            "/api/ap/disable",
+        ):
+            app.router.add_post(path, self._ok)
+        app.router.add_post("/api/ir/save", self._ir_save)
+        app.router.add_post("/api/rf/save", self._rf_save)
+        app.router.add_delete("/api/ir/delete", self._ir_delete)
+        app.router.add_delete("/api/rf/delete", self._rf_delete)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.host = f"127.0.0.1:{port}"
+        return self.host
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count the request and apply the configured latency."""
+        self.requests[f"{request.method} {request.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.token and request.headers.get("Authorization") != f"Bearer {self.token}":
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if self.garbled:
+            return web.Response(text="{garbled", content_type="application/json")
+        return await handler(request)
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "fw_ver": "1.0.0",
+                "hostname": self.hostname,
+                "sta_ok": True,
+                "sta_ssid": "bench",
+                "sta_ip": "127.0.0.1",
+                "rssi": -50,
+                "mac": self.mac,
+            }
+        )
+
+    async def _rf_status(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"rx_count": self.rx_count, "last_code": 0, "last_bits": 0, "last_protocol": 0}
+        )
+
+    async def _ir_saved(self, request: web.Request) -> web.Response:
+        return web.json_response({"commands": self.ir_saved})
+
+    async def _rf_saved(self, request: web.Request) -> web.Response:
+        return web.json_response({"commands": self.rf_saved})
+
+    async def _ir_last(self, request: web.Request) -> web.Response:
+        return web.json_response(self.ir_last)
+
+    async def _rf_last(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.rf_last, "rx_count": self.rx_count})
+
+    async def _ir_save(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        key = SAVE_FRAMES.get(body.get("frame", "B"))
+        if key is None:
+            return web.json_response({"error": "invalid frame"}, status=400)
+        raw = self.ir_last[key]
+        self._store(
+            self.ir_saved,
+            {
+                "name": body["name"],
+                "freq_hz": self.ir_last["freq_khz"] * 1000,
+                "duty": 33,
+                "count": len(raw),
+            },
+        )
+        return web.json_response({"ok": True})
+
+    async def _rf_save(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self._store(self.rf_saved, {**self.rf_last, "name": body["name"]})
+        return web.json_response({"ok": True})
+
+    async def _ir_delete(self, request: web.Request) -> web.Response:
+        name = (await request.json())["name"]
+        self.ir_saved = [item for item in self.ir_saved if item["name"] != name]
+        return web.json_response({"ok": True})
+
+    async def _rf_delete(self, request: web.Request) -> web.Response:
+        name = (await request.json())["name"]
+        self.rf_saved = [item for item in self.rf_saved if item["name"] != name]
+        return web.json_response({"ok": True})
+
+    @staticmethod
+    def _store(saved: list[dict], command: dict) -> None:
+        """Add a command, replacing one with the same name."""
+        saved[:] = [item for item in saved if item["name"] != command["name"]]
+        saved.append(command)
+
+    async def _ok(self, request: web.Request) -> web.Response:
+        return web.json_response({"ok": True})
@@ -0,0 +1,66 @@
+"""Test the Haptique IR/RF Hub API client."""
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.haptique_ir_rf_hub import HaptiqueGatewayAPI
+from custom_components.haptique_ir_rf_hub.const import READ_FRESHNESS
+
+from tests.fake_hub import FakeHub
+
+
+@pytest.fixture
+async def hub(setup_hubs) -> FakeHub:
+    """Return a fake hub that answers after 50 ms."""
+    (hub,), _ = await setup_hubs(setup=False, latency=0.05)
+    return hub
+
+
+@pytest.fixture
+async def api(hub: FakeHub):
+    """Return an API client for the fake hub."""
+    async with aiohttp.ClientSession() as session:
+        client = HaptiqueGatewayAPI(hub.host, "", session)
+        yield client
+        await client.scheduler.async_shutdown()
+
+
+async def test_reads_are_coalesced(api: HaptiqueGatewayAPI, hub: FakeHub) -> None:
+    """Test concurrent and recent reads share one request."""
+    results = await asyncio.gather(*(api.get_status() for _ in range(5)))
+    assert all(result is results[0] for result in results)
+    await api.get_status()
+    assert hub.requests["GET /api/status"] == 1
+
+    await asyncio.sleep(READ_FRESHNESS)
+    await api.get_status()
+    assert hub.requests["GET /api/status"] == 2
+
+
+async def test_writes_invalidate_reads(api: HaptiqueGatewayAPI, hub: FakeHub) -> None:
+    """Test reads after a write never reuse data from before it."""
+    await api.get_ir_saved()
+    await api.delete_ir_command("ir_0")
+    names = [command["name"] for command in await api.get_ir_saved()]
+    assert "ir_0" not in names
+    assert hub.requests["GET /api/ir/saved"] == 2
+
+    # A read still in flight when the write starts is not shared either
+    await asyncio.sleep(READ_FRESHNESS)
+    stale = asyncio.create_task(api.get_ir_saved())
+    await asyncio.sleep(0.01)
+    await api.delete_ir_command("ir_1")
+    names = [command["name"] for command in await api.get_ir_saved()]
+    assert "ir_1" not in names
+    assert hub.requests["GET /api/ir/saved"] == 4
+    await stale
+
+
+async def test_sends_keep_reads(api: HaptiqueGatewayAPI, hub: FakeHub) -> None:
+    """Test a send does not discard a recent read."""
+    await api.get_status()
+    await api.send_ir_saved("ir_0")
+    await api.get_status()
+    assert hub.requests["POST /api/ir/send/name"] == 1
+    assert hub.requests["GET /api/status"] == 1
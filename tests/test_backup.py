@@ -0,0 +1,122 @@
+"""Test the Haptique IR/RF Hub library backup, restore and clone services."""
+import json
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+
+from tests.fake_hub import NEC_TIMINGS
+
+
+@pytest.fixture
+async def hubs(hass: HomeAssistant, setup_hubs, tmp_path):
+    """Set up a hub with a library (two IR commands learned in HA) and two empty hubs."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    fakes, entries = await setup_hubs(ir_count=3, rf_count=3)
+    empty_fakes, empty_entries = await setup_hubs(2, ir_count=0, rf_count=0)
+
+    data = hass.data[DOMAIN][entries[0].entry_id]
+    data["api"].catalog.async_record_ir("ir_0", 38000, 33, NEC_TIMINGS)
+    data["api"].catalog.async_record_ir("ir_1", 38000, 33, NEC_TIMINGS)
+    await data["macros"].async_save_macro("movie", [{"type": "ir", "name": "ir_0"}])
+    return fakes + empty_fakes, entries + empty_entries
+
+
+async def _backup(hass: HomeAssistant, entry: MockConfigEntry, path: str) -> dict:
+    """Back up a hub to ``path``."""
+    return await hass.services.async_call(
+        DOMAIN,
+        "backup_library",
+        {"entry_id": entry.entry_id, "filename": path},
+        blocking=True,
+        return_response=True,
+    )
+
+
+async def test_backup(hass: HomeAssistant, hubs, tmp_path) -> None:
+    """Test a hub's commands and sequences are written to a backup file."""
+    _, entries = hubs
+    path = str(tmp_path / "library.jsonl")
+
+    backup = await _backup(hass, entries[0], path)
+    assert backup == {
+        "path": path,
+        "ir": 3,
+        "rf": 3,
+        "sequence": 1,
+        "missing_timings": 1,
+    }
+    header, *records = (tmp_path / "library.jsonl").read_text().splitlines()
+    assert json.loads(header)["format"] == "haptique-library"
+    records = [json.loads(line) for line in records]
+    assert [record["kind"] for record in records] == ["ir"] * 3 + ["rf"] * 3 + ["sequence"]
+    assert records[0]["code"].startswith("ir1:")
+    assert records[2]["code"] is None
+
+
+async def test_restore(hass: HomeAssistant, hubs, tmp_path) -> None:
+    """Test a backup restores to an empty hub and a second run resumes."""
+    fakes, entries = hubs
+    path = str(tmp_path / "library.jsonl")
+    await _backup(hass, entries[0], path)
+
+    events = []
+    hass.bus.async_listen(f"{DOMAIN}_library_progress", events.append)
+    target = entries[1].entry_id
+    result = await hass.services.async_call(
+        DOMAIN,
+        "restore_library",
+        {"entry_id": target, "filename": path},
+        blocking=True,
+        return_response=True,
+    )
+    assert result["results"][target]["result"] == {
+        "restored": 6,
+        "skipped": 0,
+        "missing_timings": 1,
+        "failed": [],
+    }
+    await hass.async_block_till_done()
+    assert events[-1].data["finished"]
+
+    # Restored commands are sent as codes; the hub itself stores nothing
+    hub = hass.data[DOMAIN][target]
+    assert hub["macros"].macros["movie"]
+    await hub["api"].send_ir_saved("ir_0")
+    await hub["api"].send_rf_saved("rf_1")
+    assert fakes[1].requests["POST /api/ir/send"] == 1
+    assert fakes[1].requests["POST /api/rf/send"] == 1
+    assert fakes[1].ir_saved == fakes[1].rf_saved == []
+
+    result = await hass.services.async_call(
+        DOMAIN,
+        "restore_library",
+        {"entry_id": target, "filename": path},
+        blocking=True,
+        return_response=True,
+    )
+    assert result["results"][target]["result"]["restored"] == 0
+    assert result["results"][target]["result"]["skipped"] == 6
+
+
+async def test_clone(hass: HomeAssistant, hubs) -> None:
+    """Test one hub's library is cloned to several hubs at once."""
+    _, entries = hubs
+    result = await hass.services.async_call(
+        DOMAIN,
+        "clone_library",
+        {
+            "source_entry_id": entries[0].entry_id,
+            "entry_id": [entry.entry_id for entry in entries],
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert set(result["results"]) == {entries[1].entry_id, entries[2].entry_id}
+    for entry in entries[1:]:
+        assert result["results"][entry.entry_id]["result"]["restored"] == 6
+        catalog = hass.data[DOMAIN][entry.entry_id]["api"].catalog
+        assert set(catalog.local_ir) == {"ir_0", "ir_1"}
+        assert set(catalog.local_rf) == {"rf_0", "rf_1", "rf_2"}
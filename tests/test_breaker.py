@@ -0,0 +1,118 @@
+"""Test the Haptique IR/RF Hub circuit breaker."""
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    HaptiqueCircuitBreaker,
+)
+from custom_components.haptique_ir_rf_hub.const import DOMAIN, READ_FRESHNESS
+
+from tests.fake_hub import FakeHub
+
+
+async def test_open_half_open_close() -> None:
+    """Test the breaker opens, lets one probe through and closes on success."""
+    breaker = HaptiqueCircuitBreaker(threshold=2, cooldown=0.05)
+    changes = []
+    breaker.on_change = changes.append
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert changes == [False]
+    with pytest.raises(UpdateFailed, match="retrying"):
+        breaker.before_request()
+
+    # A failed probe opens the breaker for another cooldown
+    await asyncio.sleep(0.05)
+    breaker.before_request()
+    assert breaker.state == STATE_HALF_OPEN
+    with pytest.raises(UpdateFailed, match="in progress"):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(UpdateFailed, match="retrying"):
+        breaker.check()
+
+    # A cancelled probe re-opens without counting a failure
+    await asyncio.sleep(0.05)
+    failures = breaker.failures
+    breaker.before_request()
+    breaker.abort_probe()
+    assert breaker.state == STATE_OPEN
+    assert breaker.failures == failures
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+    assert changes == [False, True]
+    breaker.check()
+
+
+async def test_cancelled_probe_ends(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test a probe that never finishes does not block later probes."""
+    api = hass.data[DOMAIN][init_integration.entry_id]["api"]
+    api.breaker.cooldown = 0
+    api.breaker.state = STATE_OPEN
+
+    await asyncio.sleep(READ_FRESHNESS)
+    fake_hub.latency = 0.3
+    probe = asyncio.create_task(api.request("GET", "/api/status"))
+    await asyncio.sleep(0.05)
+    with pytest.raises(UpdateFailed, match="in progress"):
+        api.breaker.check()
+    api._inflight["/api/status"].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert api.breaker.state == STATE_OPEN
+
+    fake_hub.latency = 0
+    await api.request("GET", "/api/status")
+    assert api.breaker.state == STATE_CLOSED
+    # Let the hub finish answering the abandoned probe
+    await asyncio.sleep(0.3)
+    await hass.async_block_till_done()
+
+
+async def test_cancelled_request_is_not_a_failure(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test a request cancelled while the breaker is closed counts for nothing."""
+    api = hass.data[DOMAIN][init_integration.entry_id]["api"]
+    await asyncio.sleep(READ_FRESHNESS)
+    fake_hub.latency = 0.2
+    task = asyncio.create_task(api.request("GET", "/api/status"))
+    await asyncio.sleep(0.05)
+    api._inflight["/api/status"].cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert api.breaker.state == STATE_CLOSED
+    assert api.breaker.failures == 0
+    await asyncio.sleep(0.2)
+    await hass.async_block_till_done()
+
+
+async def test_invalid_json(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test a response that is not JSON fails the request, not the hub."""
+    api = hass.data[DOMAIN][init_integration.entry_id]["api"]
+    api.breaker.failures = 1
+    await asyncio.sleep(READ_FRESHNESS)
+    fake_hub.garbled = True
+    with pytest.raises(UpdateFailed, match="Invalid response"):
+        await api.request("GET", "/api/status")
+    assert api.breaker.state == STATE_CLOSED
+    assert api.breaker.failures == 0
@@ -0,0 +1,62 @@
+"""Test the Haptique IR/RF Hub command and sequence buttons."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN, READ_FRESHNESS
+
+from tests.fake_hub import NEC_TIMINGS, FakeHub
+
+
+async def test_buttons_follow_saved_commands(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test buttons are added and removed as the hub's saved lists change."""
+    registry = er.async_get(hass)
+    assert hass.states.get("button.ir_ir_0") is not None
+    assert hass.states.get("button.rf_rf_9") is not None
+
+    fake_hub.ir_saved = [item for item in fake_hub.ir_saved if item["name"] != "ir_0"]
+    fake_hub.ir_saved.append(
+        {"name": "tv_power", "freq_hz": 38000, "duty": 33, "count": len(NEC_TIMINGS)}
+    )
+    # The lists changed behind the API's back, so let the setup reads expire
+    await asyncio.sleep(READ_FRESHNESS)
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]["coordinator"]
+    coordinator.async_invalidate_catalogs()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("button.ir_ir_0") is None
+    assert registry.async_get("button.ir_ir_0") is None
+    assert hass.states.get("button.ir_tv_power") is not None
+    assert hass.states.get("button.ir_ir_1") is not None
+
+    await hass.services.async_call(
+        "button", "press", {"entity_id": "button.ir_tv_power"}, blocking=True
+    )
+    assert fake_hub.requests["POST /api/ir/send/name"] == 1
+
+
+async def test_buttons_follow_sequences(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Test saving and deleting a sequence adds and removes its button."""
+    await hass.services.async_call(
+        DOMAIN,
+        "save_sequence",
+        {"name": "movie", "steps": [{"type": "ir", "name": "ir_0"}]},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "button", DOMAIN, f"{init_integration.entry_id}_sequence_movie"
+    )
+    assert entity_id is not None
+    assert hass.states.get(entity_id) is not None
+
+    await hass.services.async_call(DOMAIN, "delete_sequence", {"name": "movie"}, blocking=True)
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id) is None
@@ -0,0 +1,63 @@
+"""Test the Haptique IR/RF Hub IR timing codec."""
+import pytest
+
+from custom_components.haptique_ir_rf_hub.codec import (
+    IrCodecError,
+    decode_compact,
+    decode_ir,
+    encode_compact,
+    from_pronto,
+    to_pronto,
+)
+
+NEC_TIMINGS = [
+    9000, 4500, 560, 560, 560, 560, 560, 560, 560, 1690, 560, 1690,
+    560, 1690, 560, 560, 560, 560, 560, 1690, 560, 40000,
+]
+
+
+def test_compact_round_trip() -> None:
+    """Test compact codes decode to the original timings within half a period."""
+    code = encode_compact(NEC_TIMINGS, 38000)
+    assert code.startswith("ir1:38000:")
+    assert len(code) < len(str(NEC_TIMINGS))
+
+    freq, timings = decode_compact(code)
+    assert freq == 38000
+    assert len(timings) == len(NEC_TIMINGS)
+    assert all(abs(a - b) <= 14 for a, b in zip(timings, NEC_TIMINGS))
+
+
+def test_compact_odd_length_and_runs() -> None:
+    """Test run-length pairs and a trailing unpaired timing survive."""
+    timings = [560, 560] * 10 + [9000]
+    _, decoded = decode_compact(encode_compact(timings, 38000))
+    assert len(decoded) == len(timings)
+    assert decoded[-1] == pytest.approx(9000, abs=14)
+
+
+def test_pronto_round_trip() -> None:
+    """Test Pronto export and import."""
+    pronto = to_pronto(NEC_TIMINGS, 38000)
+    assert pronto.startswith("0000 006D 000B 0000")
+
+    freq, timings = from_pronto(pronto)
+    assert freq == pytest.approx(38000, rel=0.01)
+    assert all(abs(a - b) <= 30 for a, b in zip(timings, NEC_TIMINGS))
+
+
+def test_decode_ir_forms() -> None:
+    """Test every accepted service input form."""
+    assert decode_ir([1, 2, 3]) == (None, [1, 2, 3])
+    assert decode_ir("100, 200 300") == (None, [100, 200, 300])
+    assert decode_ir(encode_compact([560, 1690], 38000))[0] == 38000
+    assert decode_ir(to_pronto([560, 1690], 38000))[1]
+
+
+@pytest.mark.parametrize(
+    "code", ["ir1:38000:", "ir1:x:AAAA", "0000 006D 0005 0000 0001", "1, two"]
+)
+def test_decode_invalid(code: str) -> None:
+    """Test malformed codes raise IrCodecError."""
+    with pytest.raises(IrCodecError):
+        decode_ir(code)
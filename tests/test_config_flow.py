@@ -1,14 +1,19 @@
 """Test the Haptique IR/RF Hub config flow."""
-from unittest.mock import AsyncMock, patch
+from ipaddress import ip_address
+from unittest.mock import patch
 
 import pytest
 from homeassistant import config_entries
+from homeassistant.components.zeroconf import ZeroconfServiceInfo
 from homeassistant.const import CONF_HOST, CONF_TOKEN
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from custom_components.haptique_ir_rf_hub.config_flow import ConfigFlow
 from custom_components.haptique_ir_rf_hub.const import DOMAIN
 
+from tests.fake_hub import FakeHub
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -21,8 +26,8 @@ async def test_user_flow_success(hass: HomeAssistant) -> None:
     assert result["step_id"] == "user"
 
     with patch(
-        "custom_components.haptique_ir_rf_hub.config_flow.HaptiqueHub.test_connection",
-        return_value=True,
+        "custom_components.haptique_ir_rf_hub.config_flow.validate_input",
+        return_value={"title": "Haptique IR/RF Hub"},
     ):
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
@@ -47,7 +52,7 @@ async def test_user_flow_cannot_connect(hass: HomeAssistant) -> None:
     )
 
     with patch(
-        "custom_components.haptique_ir_rf_hub.config_flow.HaptiqueHub.test_connection",
+        "custom_components.haptique_ir_rf_hub.config_flow.validate_input",
         side_effect=Exception("Connection failed"),
     ):
         result2 = await hass.config_entries.flow.async_configure(
@@ -60,3 +65,81 @@ async def test_user_flow_cannot_connect(hass: HomeAssistant) -> None:
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "cannot_connect"}
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_scan_flow(hass: HomeAssistant) -> None:
+    """Test an empty host scans the network and offers the hubs found."""
+    hub = FakeHub(hostname="living-room")
+    host = await hub.start()
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    try:
+        with patch.object(ConfigFlow, "_async_scan_hosts", return_value=[host]):
+            result2 = await hass.config_entries.flow.async_configure(
+                result["flow_id"], {CONF_HOST: "", CONF_TOKEN: ""}
+            )
+            assert result2["type"] == FlowResultType.FORM
+            assert result2["step_id"] == "pick"
+
+            result3 = await hass.config_entries.flow.async_configure(
+                result["flow_id"], {CONF_HOST: host, CONF_TOKEN: ""}
+            )
+    finally:
+        await hub.stop()
+
+    assert result3["type"] == FlowResultType.CREATE_ENTRY
+    assert result3["title"] == "living-room"
+    assert result3["data"] == {CONF_HOST: host, CONF_TOKEN: ""}
+
+
+async def test_scan_flow_no_devices(hass: HomeAssistant) -> None:
+    """Test the user form is shown again when the scan finds nothing."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    with patch.object(ConfigFlow, "_async_scan_hosts", return_value=[]):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: "", CONF_TOKEN: "", "scan": True}
+        )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["step_id"] == "user"
+    assert result2["errors"] == {"base": "no_devices_found"}
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_zeroconf_flow(hass: HomeAssistant) -> None:
+    """Test a hub announced over mDNS is confirmed with its token."""
+    hub = FakeHub(hostname="bedroom", token="secret")
+    host = await hub.start()
+    port = int(host.rsplit(":", 1)[1])
+
+    try:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_ZEROCONF},
+            data=ZeroconfServiceInfo(
+                ip_address=ip_address("127.0.0.1"),
+                ip_addresses=[ip_address("127.0.0.1")],
+                port=port,
+                hostname="haptique-bedroom.local.",
+                type="_http._tcp.local.",
+                name="haptique-bedroom._http._tcp.local.",
+                properties={},
+            ),
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "zeroconf_confirm"
+
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_TOKEN: "secret"}
+        )
+    finally:
+        await hub.stop()
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert result2["title"] == "bedroom"
+    assert result2["data"] == {CONF_HOST: host, CONF_TOKEN: "secret"}
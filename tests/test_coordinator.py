@@ -0,0 +1,48 @@
+"""Test the Haptique IR/RF Hub data update coordinator."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN, READ_FRESHNESS
+
+from tests.fake_hub import FakeHub
+
+
+async def test_listeners_follow_their_sections(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test listeners are only notified when a section they read changes."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]["coordinator"]
+    calls = {"status": 0, "ir_saved": 0, "all": 0}
+
+    def listener(name):
+        def update() -> None:
+            calls[name] += 1
+
+        return update
+
+    unsubs = [
+        coordinator.async_add_listener(listener("status"), frozenset({"status"})),
+        coordinator.async_add_listener(listener("ir_saved"), frozenset({"ir_saved"})),
+        coordinator.async_add_listener(listener("all")),
+    ]
+
+    async def refresh() -> None:
+        await asyncio.sleep(READ_FRESHNESS)
+        await coordinator.async_refresh()
+
+    await refresh()
+    assert calls == {"status": 0, "ir_saved": 0, "all": 1}
+
+    fake_hub.hostname = "renamed"
+    await refresh()
+    assert calls == {"status": 1, "ir_saved": 0, "all": 2}
+
+    # Losing the hub changes availability, which everyone shows
+    await fake_hub.stop()
+    await refresh()
+    assert calls == {"status": 2, "ir_saved": 1, "all": 3}
+
+    for unsub in unsubs:
+        unsub()
@@ -0,0 +1,67 @@
+"""Test the Haptique IR/RF Hub diagnostics and profiling."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+from custom_components.haptique_ir_rf_hub.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from tests.fake_hub import FakeHub
+
+
+async def test_diagnostics(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test diagnostics are redacted and trace requests and refreshes."""
+    await hass.services.async_call(DOMAIN, "send_ir_saved", {"name": "ir_0"}, blocking=True)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, init_integration)
+
+    assert diagnostics["entry"]["data"]["token"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["host"] == fake_hub.host
+    assert diagnostics["status"]["mac"] == "**REDACTED**"
+    assert diagnostics["saved"] == {
+        "ir": 10,
+        "rf": 10,
+        "sequences": 0,
+        "catalog_synced": True,
+    }
+
+    refresh = diagnostics["coordinator"]["refreshes"][0]
+    assert set(refresh["sections"]) == {"status", "rf_status", "rf_saved", "ir_saved"}
+    assert refresh["duration_ms"] >= max(refresh["sections"].values())
+
+    read, *_ = diagnostics["requests"]
+    assert read["method"] == "GET"
+    assert read["status"] == 200
+    assert read["bytes"] > 0
+    assert read["queue_wait_ms"] is None
+    send = diagnostics["requests"][-1]
+    assert send["endpoint"] == "/api/ir/send/name"
+    assert send["queue_wait_ms"] is not None
+
+
+async def test_profile(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test the profile only reports integration code."""
+    fake_hub.latency = 0.5
+
+    async def send() -> None:
+        await asyncio.sleep(0.05)
+        await hass.services.async_call(
+            DOMAIN, "send_ir_saved", {"name": "ir_0"}, blocking=True
+        )
+
+    sending = hass.async_create_task(send())
+    result = await hass.services.async_call(
+        DOMAIN, "profile", {"seconds": 0.3}, blocking=True, return_response=True
+    )
+    await sending
+
+    assert result["functions"]
+    assert all(".py:" in item["function"] for item in result["functions"])
+    assert any("_fetch" in item["awaiting_in"] for item in result["tasks"])
@@ -0,0 +1,68 @@
+"""Test the Haptique IR/RF Hub LAN discovery."""
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from custom_components.haptique_ir_rf_hub.discovery import async_scan, subnet_hosts
+
+from tests.fake_hub import FakeHub
+
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+async def test_scan_dedupes_and_skips_other_servers() -> None:
+    """Test hubs are found once per device and other servers are ignored."""
+    hubs = [
+        FakeHub(mac="AA:00:00:00:00:01", hostname="living-room"),
+        FakeHub(mac="aa:00:00:00:00:01", hostname="living-room"),
+        FakeHub(mac="AA:00:00:00:00:02", hostname="bedroom"),
+        FakeHub(mac="AA:00:00:00:00:03", token="secret"),
+    ]
+    hosts = [await hub.start() for hub in hubs]
+
+    other = web.AppRunner(web.Application())
+    await other.setup()
+    site = web.TCPSite(other, "127.0.0.1", 0)
+    await site.start()
+    hosts.append(f"127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            found = await async_scan(session, hosts)
+    finally:
+        for hub in hubs:
+            await hub.stop()
+        await other.cleanup()
+
+    assert sorted(hub.hostname or "" for hub in found) == ["", "bedroom", "living-room"]
+    locked = next(hub for hub in found if hub.auth_required)
+    assert locked.host == hosts[3]
+    assert "token required" in locked.label
+
+
+async def test_scan_is_concurrent() -> None:
+    """Test a sweep of slow hosts takes about one timeout, not one per host."""
+    hubs = [FakeHub(mac=f"AA:00:00:00:01:{index:02X}", latency=0.3) for index in range(20)]
+    hosts = [await hub.start() for hub in hubs]
+
+    started = time.monotonic()
+    try:
+        async with aiohttp.ClientSession() as session:
+            found = await async_scan(session, hosts, concurrency=32)
+    finally:
+        for hub in hubs:
+            await hub.stop()
+
+    assert len(found) == 20
+    assert time.monotonic() - started < 2
+
+
+def test_subnet_hosts() -> None:
+    """Test the sweep covers the /24 around an address, excluding itself."""
+    hosts = subnet_hosts("192.168.1.20", 16)
+    assert len(hosts) == 253
+    assert "192.168.1.20" not in hosts
+    assert hosts[0] == "192.168.1.1" and hosts[-1] == "192.168.1.254"
+    assert len(subnet_hosts("10.0.0.5", 30)) == 1
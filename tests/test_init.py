@@ -6,6 +6,8 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.haptique_ir_rf_hub.const import DOMAIN
 
+from tests.fake_hub import FakeHub
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -22,3 +24,63 @@ async def test_unload_entry(
     assert await hass.config_entries.async_unload(init_integration.entry_id)
     await hass.async_block_till_done()
     assert init_integration.state == ConfigEntryState.NOT_LOADED
+
+
+async def test_restored_entities_are_stale(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    fake_hub: FakeHub,
+    hass_storage: dict,
+) -> None:
+    """Test entities restored from the snapshot are stale until refreshed."""
+    key = f"{DOMAIN}.{mock_config_entry.entry_id}.snapshot"
+    hass_storage[key] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": key,
+        "data": {
+            "data": {
+                "status": {"hostname": "restored", "ap_enabled": True},
+                "rf_status": {},
+                "rf_saved": [],
+                "ir_saved": [{"name": "ir_0"}],
+            }
+        },
+    }
+    fake_hub.latency = 0.2
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    entity_ids = ("sensor.hostname", "switch.access_point", "button.ir_ir_0")
+    assert hass.states.get("sensor.hostname").state == "restored"
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id).attributes["stale"], entity_id
+
+    # Joins the background refresh, whose reads are still in flight
+    await hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"].async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.hostname").state == fake_hub.hostname
+    for entity_id in entity_ids:
+        assert not hass.states.get(entity_id).attributes["stale"], entity_id
+
+
+async def test_remove_entry(
+    hass: HomeAssistant, init_integration: MockConfigEntry, hass_storage: dict
+) -> None:
+    """Test removing an entry deletes everything stored for it."""
+    await hass.services.async_call(
+        DOMAIN,
+        "save_sequence",
+        {"name": "movie", "steps": [{"type": "ir", "name": "ir_0"}]},
+        blocking=True,
+    )
+    assert await hass.config_entries.async_unload(init_integration.entry_id)
+    keys = [
+        f"{DOMAIN}.{init_integration.entry_id}.{name}"
+        for name in ("snapshot", "catalog", "macros")
+    ]
+    assert all(key in hass_storage for key in keys)
+
+    await hass.config_entries.async_remove(init_integration.entry_id)
+    await hass.async_block_till_done()
+    assert not any(key in hass_storage for key in keys)
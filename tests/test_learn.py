@@ -0,0 +1,102 @@
+"""Test the Haptique IR/RF Hub learn services."""
+import asyncio
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+from custom_components.haptique_ir_rf_hub.protocols import encode_protocol, parse_protocol
+
+from tests.fake_hub import NEC_TIMINGS, FakeHub
+
+
+async def _press(action) -> None:
+    """Run ``action`` once the learn service is waiting."""
+    await asyncio.sleep(0.3)
+    action()
+
+
+async def test_learn_ir_batch(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test each name waits for its own press and the best frame is saved."""
+    codes = ["nec:0x04:0x08", "nec:0x04:0x02"]
+
+    async def press_all() -> None:
+        for code in codes:
+            saved = len(fake_hub.ir_saved)
+            timings = encode_protocol(parse_protocol(code))[1]
+            await _press(lambda timings=timings: fake_hub.capture_ir(timings))
+            # Press the next button only once this one is saved
+            while len(fake_hub.ir_saved) == saved:
+                await asyncio.sleep(0.05)
+
+    presses = hass.async_create_task(press_all())
+    response = await hass.services.async_call(
+        DOMAIN,
+        "learn_ir",
+        {"name": ["power", "volume_up"], "timeout": 5},
+        blocking=True,
+        return_response=True,
+    )
+    await presses
+
+    assert [item["protocol"] for item in response["learned"]] == codes
+    assert response["learned"][0]["frame"] == "B"
+    assert {"power", "volume_up"} <= {item["name"] for item in fake_hub.ir_saved}
+    catalog = hass.data[DOMAIN][init_integration.entry_id]["api"].catalog
+    assert str(catalog.ir["power"].protocol) == codes[0]
+
+
+async def test_learn_ir_combined_frame(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test an explicit frame is saved under the firmware's frame name."""
+    combined = NEC_TIMINGS * 2
+
+    def capture() -> None:
+        fake_hub.capture_ir(NEC_TIMINGS)
+        fake_hub.ir_last["combined"] = combined
+
+    presses = hass.async_create_task(_press(capture))
+    response = await hass.services.async_call(
+        DOMAIN,
+        "learn_ir",
+        {"name": "power", "frame": "combined", "timeout": 5},
+        blocking=True,
+        return_response=True,
+    )
+    await presses
+
+    assert response["learned"][0]["frame"] == "COMBINED"
+    assert fake_hub.ir_saved[-1]["count"] == len(combined)
+
+
+async def test_learn_rf_timeout(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test a stale capture is not saved and a new one is."""
+    with pytest.raises(HomeAssistantError, match="No new RF signal"):
+        await hass.services.async_call(
+            DOMAIN, "learn_rf", {"name": "gate", "timeout": 1}, blocking=True
+        )
+    assert "gate" not in {item["name"] for item in fake_hub.rf_saved}
+
+    press = hass.async_create_task(_press(lambda: fake_hub.capture_rf(0x123456)))
+    response = await hass.services.async_call(
+        DOMAIN,
+        "learn_rf",
+        {"name": ["gate", "garage"], "timeout": 1},
+        blocking=True,
+        return_response=True,
+    )
+    await press
+
+    assert response["learned"] == [
+        {"name": "gate", "code": 0x123456, "bits": 24, "protocol": 1}
+    ]
+    assert response["timed_out"] == "garage"
+    saved = {item["name"]: item for item in fake_hub.rf_saved}
+    assert saved["gate"]["code"] == 0x123456
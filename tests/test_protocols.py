@@ -0,0 +1,81 @@
+"""Test the Haptique IR/RF Hub IR protocol decoder."""
+import random
+
+import pytest
+
+from custom_components.haptique_ir_rf_hub.codec import IrCodecError, decode_ir
+from custom_components.haptique_ir_rf_hub.protocols import (
+    IrProtocolCode,
+    decode_protocol,
+    encode_protocol,
+    parse_protocol,
+)
+
+CODES = [
+    "nec:0x04:0x08",
+    "nec:0x7F00:0x4C",
+    "samsung:0x07:0x02",
+    "sony12:0x01:0x15",
+    "sony15:0x97:0x21",
+    "sony20:0x123A:0x7F",
+    "rc5:0x00:0x0C",
+    "rc5:0x1F:0x7F",
+    "rc6:0x00:0x0C",
+    "rc6:0xFF:0x00",
+]
+
+
+def _as_captured(timings: list[int], seed: int) -> list[int]:
+    """Distort timings like a receiver: longer marks, shorter spaces, jitter."""
+    rng = random.Random(seed)
+    return [
+        t + (90 if index % 2 == 0 else -90) + rng.randint(-60, 60)
+        for index, t in enumerate(timings)
+    ]
+
+
+@pytest.mark.parametrize("text", CODES)
+def test_round_trip(text: str) -> None:
+    """Test regenerated timings decode to the same code, also when distorted."""
+    code = parse_protocol(text)
+    assert str(code) == text
+
+    _, timings = encode_protocol(code)
+    assert decode_protocol(timings) == code
+    assert decode_protocol(_as_captured(timings, len(text))) == code
+
+
+def test_decode_ignores_repeats_and_gap() -> None:
+    """Test only the first frame of a capture is decoded."""
+    freq, timings = encode_protocol(parse_protocol("nec:0x04:0x08"))
+    assert freq == 38000
+    capture = timings + [40000, 9000, 2250, 560, 96000, 9000, 2250, 560]
+    assert str(decode_protocol(capture)) == "nec:0x04:0x08"
+
+
+def test_decode_no_match() -> None:
+    """Test captures of unknown protocols fall back to None."""
+    _, timings = encode_protocol(parse_protocol("nec:0x04:0x08"))
+    broken = list(timings)
+    broken[20] = 1100
+    assert decode_protocol(broken) is None
+    assert decode_protocol([3500, 1750] + [430, 430] * 48 + [430]) is None
+    assert decode_protocol([]) is None
+
+
+@pytest.mark.parametrize(
+    "text", ["nec:0x04", "nec:0x10000:0x01", "rc5:0x20:0x01", "jvc:0x01:0x01"]
+)
+def test_parse_invalid(text: str) -> None:
+    """Test malformed and out-of-range codes are rejected."""
+    with pytest.raises(ValueError):
+        parse_protocol(text)
+
+
+def test_decode_ir_protocol_code() -> None:
+    """Test protocol codes are accepted wherever IR timings are."""
+    freq, timings = decode_ir("sony12:0x01:0x15")
+    assert freq == 40000
+    assert decode_protocol(timings) == IrProtocolCode("sony12", 0x01, 0x15)
+    with pytest.raises(IrCodecError):
+        decode_ir("rc6:0x100:0x00")
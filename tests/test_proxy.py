@@ -0,0 +1,143 @@
+"""Test the Haptique IR/RF Hub web UI proxy."""
+from http import HTTPStatus
+import json
+
+import pytest
+from homeassistant.components.http import KEY_HASS_USER
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import Unauthorized
+from pytest_homeassistant_custom_component.common import MockConfigEntry, MockUser
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+from custom_components.haptique_ir_rf_hub.proxy import HaptiqueProxyView
+
+from tests.fake_hub import NEC_TIMINGS, FakeHub
+
+
+class ProxyRequest(dict):
+    """The parts of an authenticated aiohttp request the view reads."""
+
+    def __init__(self, method: str, user: MockUser, body: dict | None = None) -> None:
+        """Initialize the request."""
+        super().__init__({KEY_HASS_USER: user})
+        self.method = method
+        self.query = {}
+        self.can_read_body = body is not None
+        self._body = body
+
+    async def json(self) -> dict | None:
+        """Return the request body."""
+        return self._body
+
+
+async def call(
+    hass: HomeAssistant,
+    fake_hub: FakeHub,
+    user: MockUser,
+    method: str,
+    endpoint: str,
+    body: dict | None = None,
+) -> tuple[int, dict]:
+    """Make one proxied request and return the status and JSON body."""
+    view = HaptiqueProxyView(hass)
+    response = await getattr(view, method.lower())(
+        ProxyRequest(method, user, body), fake_hub.host, endpoint.lstrip("/")
+    )
+    return response.status, json.loads(response.body)
+
+
+async def test_reads_come_from_the_coordinator(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_hub: FakeHub,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test cached reads skip the hub until a mutation makes them stale."""
+    fetched = fake_hub.requests["GET /api/ir/saved"]
+
+    status, body = await call(hass, fake_hub, hass_admin_user, "GET", "/api/ir/saved")
+    assert status == HTTPStatus.OK
+    assert len(body["commands"]) == 10
+    assert fake_hub.requests["GET /api/ir/saved"] == fetched
+
+    status, _ = await call(
+        hass, fake_hub, hass_admin_user, "DELETE", "/api/ir/delete", {"name": "ir_0"}
+    )
+    assert status == HTTPStatus.OK
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]["coordinator"]
+    assert coordinator.is_stale("ir_saved")
+
+    _, body = await call(hass, fake_hub, hass_admin_user, "GET", "/api/ir/saved")
+    assert "ir_0" not in [command["name"] for command in body["commands"]]
+    assert fake_hub.requests["GET /api/ir/saved"] == fetched + 1
+    await hass.async_block_till_done()
+
+
+async def test_save_defaults_to_frame_b(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_hub: FakeHub,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test a save without a frame uses the same frame as the services."""
+    fake_hub.ir_last = {**fake_hub.ir_last, "a": NEC_TIMINGS[:4], "combined": NEC_TIMINGS[:4]}
+    status, _ = await call(
+        hass, fake_hub, hass_admin_user, "POST", "/api/ir/save", {"name": "tv"}
+    )
+    assert status == HTTPStatus.OK
+    assert fake_hub.ir_saved[-1]["count"] == len(NEC_TIMINGS)
+    await hass.async_block_till_done()
+
+
+async def test_mutations_need_a_name(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_hub: FakeHub,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test saves and deletes without a command name are rejected."""
+    for payload in ({}, {"name": ""}, {"name": 5}):
+        status, body = await call(
+            hass, fake_hub, hass_admin_user, "POST", "/api/ir/save", payload
+        )
+        assert status == HTTPStatus.BAD_REQUEST
+        assert "name" in body["message"]
+    status, _ = await call(hass, fake_hub, hass_admin_user, "DELETE", "/api/rf/delete")
+    assert status == HTTPStatus.BAD_REQUEST
+    assert fake_hub.requests["POST /api/ir/save"] == 0
+    assert fake_hub.requests["DELETE /api/rf/delete"] == 0
+
+
+async def test_access_control(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    fake_hub: FakeHub,
+    hass_admin_user: MockUser,
+    hass_read_only_user: MockUser,
+) -> None:
+    """Test non-admins may only read and unknown endpoints are not proxied."""
+    status, _ = await call(hass, fake_hub, hass_read_only_user, "GET", "/api/status")
+    assert status == HTTPStatus.OK
+
+    for method, endpoint in (
+        ("POST", "/api/ir/send/name"),
+        ("DELETE", "/api/ir/delete"),
+        ("POST", "/api/wifi/forget"),
+        ("GET", "/api/wifi/scan"),
+    ):
+        with pytest.raises(Unauthorized):
+            await call(
+                hass, fake_hub, hass_read_only_user, method, endpoint, {"name": "ir_0"}
+            )
+    assert fake_hub.requests["POST /api/ir/send/name"] == 0
+
+    for user in (hass_admin_user, hass_read_only_user):
+        status, _ = await call(hass, fake_hub, user, "GET", "/api/token")
+        assert status == HTTPStatus.NOT_FOUND
+    assert fake_hub.requests["GET /api/token"] == 0
+
+    status, _ = await call(
+        hass, fake_hub, hass_admin_user, "POST", "/api/ir/send/name", {"name": "ir_0"}
+    )
+    assert status == HTTPStatus.OK
+    assert fake_hub.requests["POST /api/ir/send/name"] == 1
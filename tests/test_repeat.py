@@ -0,0 +1,101 @@
+"""Test the Haptique IR/RF Hub hold-to-repeat services."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+
+from tests.fake_hub import FakeHub
+
+SENT = "POST /api/ir/send/name"
+
+
+async def test_repeat_until_max_count(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test a session sends max_count times at the given cadence and ends."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await hass.services.async_call(
+        DOMAIN,
+        "start_repeat",
+        {"type": "ir", "name": "ir_0", "interval_ms": 40, "max_count": 4},
+        blocking=True,
+        return_response=True,
+    )
+    assert result["results"][init_integration.entry_id]["result"]["sent"] == 1
+
+    while fake_hub.requests[SENT] < 4:
+        await asyncio.sleep(0.01)
+    assert loop.time() - started >= 0.12
+    await asyncio.sleep(0.1)
+    assert fake_hub.requests[SENT] == 4
+
+    result = await hass.services.async_call(
+        DOMAIN, "stop_repeat", {}, blocking=True, return_response=True
+    )
+    assert result["results"][init_integration.entry_id]["result"] == {"stopped": []}
+
+
+async def test_slow_sends_are_not_skipped(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test sends slightly slower than the interval go out back to back."""
+    api = hass.data[DOMAIN][init_integration.entry_id]["api"]
+    fake_hub.latency = 0.11
+    await api.start_repeat("ir", "ir_0", 0.1, 4)
+    session = api._repeats[("ir", "ir_0")]
+
+    while session.reason is None:
+        await asyncio.sleep(0.01)
+    assert session.reason == "max_count"
+    assert session.sent == 4
+    assert session.skipped == 0
+    assert fake_hub.requests[SENT] == 4
+
+
+async def test_stop_repeat(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test stop_repeat ends a session and reports how often it was sent."""
+    await hass.services.async_call(
+        DOMAIN,
+        "start_repeat",
+        {"type": "ir", "name": "ir_1", "interval_ms": 50},
+        blocking=True,
+    )
+    await asyncio.sleep(0.22)
+    result = await hass.services.async_call(
+        DOMAIN,
+        "stop_repeat",
+        {"type": "ir", "name": "ir_1"},
+        blocking=True,
+        return_response=True,
+    )
+    (report,) = result["results"][init_integration.entry_id]["result"]["stopped"]
+    assert report["reason"] == "stopped"
+    assert 3 <= report["sent"] <= 6
+
+    await asyncio.sleep(0.05)  # a send already in flight may still arrive
+    sent = fake_hub.requests[SENT]
+    await asyncio.sleep(0.15)
+    assert fake_hub.requests[SENT] == sent
+
+
+async def test_repeat_cancelled_when_unreachable(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test an open circuit breaker ends all sessions of the hub."""
+    api = hass.data[DOMAIN][init_integration.entry_id]["api"]
+    await api.start_repeat("ir", "ir_0", 0.05, 100)
+    await api.start_repeat("ir", "ir_1", 0.05, 100)
+
+    for _ in range(api.breaker.threshold):
+        api.breaker.record_failure()
+    assert api.stop_repeat() == []
+
+    await asyncio.sleep(0.05)  # a send already in flight may still arrive
+    sent = fake_hub.requests[SENT]
+    await asyncio.sleep(0.15)
+    assert fake_hub.requests[SENT] == sent
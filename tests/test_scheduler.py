@@ -0,0 +1,96 @@
+"""Test the Haptique IR/RF Hub transmit scheduler."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.haptique_ir_rf_hub.const import (
+    DOMAIN,
+    PRIORITY_BACKGROUND,
+    PRIORITY_NORMAL,
+    PRIORITY_USER,
+)
+from custom_components.haptique_ir_rf_hub.scheduler import HaptiqueCommandScheduler
+
+from tests.fake_hub import FakeHub
+
+
+async def test_priority_order() -> None:
+    """Test queued jobs run by priority, FIFO within a priority."""
+    scheduler = HaptiqueCommandScheduler()
+    release = asyncio.Event()
+    order = []
+
+    def job(name):
+        async def run():
+            if name == "blocker":
+                await release.wait()
+            order.append(name)
+
+        return run
+
+    tasks = [asyncio.create_task(scheduler.async_submit(job("blocker")))]
+    await asyncio.sleep(0)
+    for name, priority in (
+        ("background", PRIORITY_BACKGROUND),
+        ("normal_1", PRIORITY_NORMAL),
+        ("user", PRIORITY_USER),
+        ("normal_2", PRIORITY_NORMAL),
+    ):
+        tasks.append(asyncio.create_task(scheduler.async_submit(job(name), priority)))
+    await asyncio.sleep(0)
+    assert scheduler.depth == 5
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["blocker", "user", "normal_1", "normal_2", "background"]
+    assert scheduler.depth == 0
+    await scheduler.async_shutdown()
+
+
+async def test_full_queue_times_out() -> None:
+    """Test a submit fails once the queue stays full for enqueue_timeout."""
+    scheduler = HaptiqueCommandScheduler(max_depth=1, enqueue_timeout=0.05)
+    release = asyncio.Event()
+    changes = []
+    scheduler.on_change = lambda: changes.append(scheduler.depth)
+
+    running = asyncio.create_task(scheduler.async_submit(release.wait))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(scheduler.async_submit(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(UpdateFailed, match="queue full"):
+        await scheduler.async_submit(release.wait)
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert changes[-1] == 0
+    await scheduler.async_shutdown()
+
+
+async def test_queue_sensor_follows_the_scheduler(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test the transmit queue sensor is pushed while sends are in flight."""
+    entity_id = "sensor.transmit_queue"
+    assert hass.states.get(entity_id).state == "0"
+
+    fake_hub.latency = 0.3
+    sending = hass.async_create_task(
+        hass.services.async_call(DOMAIN, "send_ir_saved", {"name": "ir_0"}, blocking=True)
+    )
+    await asyncio.sleep(0.1)
+    assert hass.states.get(entity_id).state == "1"
+
+    await sending
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state == "0"
@@ -0,0 +1,62 @@
+"""Test the Haptique IR/RF Hub command sequences."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+
+from tests.fake_hub import FakeHub
+
+
+async def test_pause_releases_the_queue(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test other sends go out while a sequence waits between steps."""
+    sequence = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            "send_sequence",
+            {
+                "steps": [
+                    {"type": "ir", "name": "ir_0", "repeat": 2},
+                    {"type": "ir", "name": "ir_1", "delay_ms": 600},
+                    {"type": "rf", "name": "rf_0"},
+                ]
+            },
+            blocking=True,
+            return_response=True,
+        )
+    )
+    await asyncio.sleep(0.2)
+    assert not sequence.done()
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await hass.services.async_call(DOMAIN, "send_rf_saved", {"name": "rf_1"}, blocking=True)
+    assert loop.time() - started < 0.3
+
+    result = await sequence
+    report = result["results"][init_integration.entry_id]["result"]
+    assert report["completed"]
+    assert [step["index"] for step in report["steps"]] == [0, 1, 2]
+    assert report["steps"][2]["offset_ms"] >= 600
+    assert fake_hub.requests["POST /api/ir/send/name"] == 3
+
+
+async def test_sequence_stops_at_failing_step(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_hub: FakeHub
+) -> None:
+    """Test a failed step ends the sequence and is reported."""
+    await fake_hub.stop()
+    result = await hass.services.async_call(
+        DOMAIN,
+        "send_sequence",
+        {"steps": [{"type": "ir", "name": "ir_0"}, {"type": "ir", "name": "ir_1"}]},
+        blocking=True,
+        return_response=True,
+    )
+    report = result["results"][init_integration.entry_id]["result"]
+    assert not report["completed"]
+    assert len(report["steps"]) == 1
+    assert "error" in report["steps"][0]
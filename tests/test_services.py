@@ -0,0 +1,106 @@
+"""Test how the Haptique IR/RF Hub services route calls to hubs."""
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from custom_components.haptique_ir_rf_hub.const import DOMAIN
+
+from tests.fake_hub import NEC_TIMINGS
+
+IR_SENT = "POST /api/ir/send/name"
+
+
+@pytest.fixture
+async def hubs(setup_hubs):
+    """Set up two hubs; only the second has ir_3."""
+    fakes, entries = await setup_hubs(ir_count=2)
+    more_fakes, more_entries = await setup_hubs(ir_count=4)
+    return fakes + more_fakes, entries + more_entries
+
+
+async def test_send_services(hass: HomeAssistant, hubs) -> None:
+    """Test every send service reaches the hub picked by entry_id."""
+    fakes, entries = hubs
+    target = {"entry_id": entries[1].entry_id}
+    for service, data in (
+        ("send_ir_saved", {"name": "ir_0"}),
+        ("send_rf_saved", {"name": "rf_0"}),
+        ("send_ir_code", {"raw_data": NEC_TIMINGS}),
+        ("send_rf_code", {"code": 0x123456}),
+    ):
+        result = await hass.services.async_call(
+            DOMAIN, service, {**data, **target}, blocking=True, return_response=True
+        )
+        assert list(result["results"]) == [entries[1].entry_id]
+        assert result["results"][entries[1].entry_id]["success"]
+
+    assert fakes[1].requests[IR_SENT] == 1
+    assert fakes[1].requests["POST /api/ir/send"] == 1
+    assert fakes[1].requests["POST /api/rf/send"] == 2
+    assert not any(key.startswith("POST") for key in fakes[0].requests)
+
+
+async def test_broadcast(hass: HomeAssistant, hubs) -> None:
+    """Test broadcast runs on every hub and reports each one."""
+    fakes, entries = hubs
+    await fakes[0].stop()
+    result = await hass.services.async_call(
+        DOMAIN,
+        "send_ir_saved",
+        {"name": "ir_1", "broadcast": True},
+        blocking=True,
+        return_response=True,
+    )
+    results = result["results"]
+    assert not results[entries[0].entry_id]["success"]
+    assert "error" in results[entries[0].entry_id]
+    assert results[entries[1].entry_id]["success"]
+    assert fakes[1].requests[IR_SENT] == 1
+
+
+async def test_untargeted_calls(hass: HomeAssistant, hubs) -> None:
+    """Test a saved command name picks its hub and ambiguous calls fail."""
+    fakes, _ = hubs
+    await hass.services.async_call(DOMAIN, "send_ir_saved", {"name": "ir_3"}, blocking=True)
+    assert fakes[1].requests[IR_SENT] == 1
+
+    with pytest.raises(HomeAssistantError, match="Several hubs"):
+        await hass.services.async_call(
+            DOMAIN, "send_ir_saved", {"name": "ir_0"}, blocking=True
+        )
+
+
+async def test_device_area_and_entity_targets(hass: HomeAssistant, hubs) -> None:
+    """Test device, area and entity targets resolve to their hubs."""
+    fakes, entries = hubs
+    device_registry = dr.async_get(hass)
+    devices = [
+        device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+        for entry in entries
+    ]
+    area = ar.async_get(hass).async_create("Living room")
+    device_registry.async_update_device(devices[0].id, area_id=area.id)
+    entity_id = er.async_entries_for_config_entry(
+        er.async_get(hass), entries[1].entry_id
+    )[0].entity_id
+
+    for target, hub in (
+        ({"device_id": devices[1].id}, 1),
+        ({"area_id": area.id}, 0),
+        ({"entity_id": entity_id}, 1),
+    ):
+        sent = fakes[hub].requests[IR_SENT]
+        await hass.services.async_call(
+            DOMAIN, "send_ir_saved", {"name": "ir_0", **target}, blocking=True
+        )
+        assert fakes[hub].requests[IR_SENT] == sent + 1, target
+
+    empty = ar.async_get(hass).async_create("Garage")
+    with pytest.raises(HomeAssistantError, match="does not include"):
+        await hass.services.async_call(
+            DOMAIN, "send_ir_saved", {"name": "ir_0", "area_id": empty.id}, blocking=True
+        )
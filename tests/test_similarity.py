@@ -0,0 +1,78 @@
+"""Test the Haptique IR/RF Hub duplicate command index."""
+from array import array
+from types import SimpleNamespace
+
+from custom_components.haptique_ir_rf_hub.catalog import IrCommand, RfCommand
+from custom_components.haptique_ir_rf_hub.protocols import parse_protocol
+from custom_components.haptique_ir_rf_hub.similarity import HaptiqueSimilarityIndex
+
+from tests.fake_hub import NEC_TIMINGS
+
+
+def _ir(name: str, timings: list[int], protocol: str | None = None) -> IrCommand:
+    return IrCommand(
+        name, 38000, 33, array("I", timings), parse_protocol(protocol) if protocol else None
+    )
+
+
+def _catalog(*ir: IrCommand, rf: tuple[RfCommand, ...] = ()) -> SimpleNamespace:
+    return SimpleNamespace(
+        ir={command.name: command for command in ir},
+        rf={command.name: command for command in rf},
+    )
+
+
+def test_clusters_across_hubs() -> None:
+    """Test exact, near and protocol duplicates are grouped across hubs."""
+    jittered = [t + (40 if index % 3 else -30) for index, t in enumerate(NEC_TIMINGS)]
+    other = [t * 2 for t in NEC_TIMINGS]
+    living = _catalog(
+        _ir("power", NEC_TIMINGS),
+        _ir("power_copy", jittered),
+        _ir("volume", other),
+        _ir("tv_on", [1], "nec:0x04:0x08"),
+        rf=(RfCommand("gate", 0x500001, 24, 1, None),),
+    )
+    bedroom = _catalog(
+        _ir("tv_power", [1], "nec:0x04:0x08"),
+        IrCommand("no_timings", 38000, 33),
+        rf=(RfCommand("gate_open", 0x500001, 24, 2, 350),),
+    )
+
+    index = HaptiqueSimilarityIndex()
+    index.async_track("living", living)
+    index.async_track("bedroom", bedroom)
+
+    clusters = {tuple(cluster["commands"]): cluster for cluster in index.clusters()}
+    assert set(clusters) == {
+        (("living", "power"), ("living", "power_copy")),
+        (("bedroom", "tv_power"), ("living", "tv_on")),
+        (("bedroom", "gate_open"), ("living", "gate")),
+    }
+    assert 0 < clusters[(("living", "power"), ("living", "power_copy"))]["distance"] < 0.08
+    assert index.size == 7
+    assert index.skipped == 1
+
+
+def test_incremental_update() -> None:
+    """Test clusters follow added and removed commands of a dirty hub."""
+    catalog = _catalog(_ir("power", NEC_TIMINGS))
+    index = HaptiqueSimilarityIndex()
+    untrack = index.async_track("hub", catalog)
+    assert index.clusters() == []
+
+    catalog.ir["power_2"] = _ir("power_2", NEC_TIMINGS)
+    assert index.clusters() == []  # not marked dirty yet, cached result
+    index.async_mark_dirty("hub")
+    assert index.clusters()[0]["commands"] == [("hub", "power"), ("hub", "power_2")]
+
+    del catalog.ir["power"]
+    index.async_mark_dirty("hub")
+    assert index.clusters() == []
+
+    catalog.ir["power"] = _ir("power", NEC_TIMINGS)
+    index.async_mark_dirty("hub")
+    assert len(index.clusters()) == 1
+    untrack()
+    assert index.clusters() == []
+    assert index.size == 0